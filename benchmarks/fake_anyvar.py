@@ -0,0 +1,138 @@
+"""Provide an in-process stand-in for AnyVar, for ingestion benchmarks"""
+
+import base64
+import hashlib
+import time
+from collections.abc import Iterable, Sequence
+
+from anyvar.core.objects import SupportedVrsVariation
+from anyvar.mapping.liftover import ReferenceAssembly
+from ga4gh.vrs.models import (
+    Allele,
+    LiteralSequenceExpression,
+    SequenceLocation,
+    SequenceReference,
+)
+
+from anyvlm.anyvar.base_client import BaseAnyVarClient
+
+
+class FakeAnyVarClient(BaseAnyVarClient):
+    """Register expressions by hashing them, without translation or persistent storage
+
+    VRS IDs are deterministic, so repeated runs store the same rows. Registered
+    expressions are kept in memory (and so count toward the benchmark's peak RSS), and
+    looked up as stand-in alleles built from their VCF-style fields. Optional
+    simulated latency models a remote or heavily loaded AnyVar instance.
+    """
+
+    def __init__(
+        self, request_latency: float = 0.0, expression_latency: float = 0.0
+    ) -> None:
+        """Initialize fake client
+
+        :param request_latency: seconds to wait per registration request
+        :param expression_latency: additional seconds to wait per expression registered
+        """
+        self.request_latency = request_latency
+        self.expression_latency = expression_latency
+        # VRS ID -> (expression, assembly) of each registered expression
+        self._registry: dict[str, tuple[str, ReferenceAssembly]] = {}
+
+    @staticmethod
+    def _digest(value: str) -> str:
+        return base64.urlsafe_b64encode(
+            hashlib.sha512(value.encode()).digest()[:24]
+        ).decode()
+
+    def _vrs_id(self, expression: str, assembly: ReferenceAssembly) -> str:
+        return "ga4gh:VA." + self._digest(f"{assembly.value}:{expression}")
+
+    def _allele(
+        self, vrs_id: str, expression: str, assembly: ReferenceAssembly
+    ) -> Allele:
+        """Build a stand-in allele for a registered ``chrom-pos-ref-alt`` expression
+
+        :param vrs_id: ID the expression was registered under
+        :param expression: registered expression
+        :param assembly: reference assembly used in expression
+        :return: allele with a fake sequence reference for the chromosome
+        """
+        chrom, pos, ref, alt = expression.split("-")
+        start = int(pos) - 1
+        return Allele(
+            id=vrs_id,
+            location=SequenceLocation(
+                sequenceReference=SequenceReference(
+                    refgetAccession="SQ." + self._digest(f"{assembly.value}:{chrom}")
+                ),
+                start=start,
+                end=start + len(ref),
+            ),
+            state=LiteralSequenceExpression(sequence=alt),
+        )
+
+    def retrieve_allele_by_id(self, vrs_id: str) -> SupportedVrsVariation | None:
+        """Get the stand-in allele for a registered expression
+
+        :param vrs_id: ID returned on registration
+        :return: the allele, or ``None`` if nothing was registered under ``vrs_id``
+        """
+        registered = self._registry.get(vrs_id)
+        if registered is None:
+            return None
+        return self._allele(vrs_id, *registered)
+
+    def retrieve_allele_by_expression(
+        self, expression: str, assembly: ReferenceAssembly = ReferenceAssembly.GRCH38
+    ) -> Allele | None:
+        """Get the stand-in allele for an expression, if it was registered
+
+        :param expression: variation expression to look up
+        :param assembly: reference assembly used in expression
+        :return: the allele, or ``None`` if the expression wasn't registered
+        """
+        vrs_id = self._vrs_id(expression, assembly)
+        if vrs_id not in self._registry:
+            return None
+        return self._allele(vrs_id, expression, assembly)
+
+    def put_allele_expressions(
+        self,
+        expressions: Iterable[str],
+        assembly: ReferenceAssembly = ReferenceAssembly.GRCH38,
+    ) -> Sequence[str | None]:
+        """Generate a VRS-like ID for each expression, and keep it in the registry
+
+        :param expressions: variation expressions to register
+        :param assembly: reference assembly used in expressions
+        :return: list where the i'th item is the ID for the i'th expression
+        """
+        expressions = list(expressions)
+        delay = self.request_latency + self.expression_latency * len(expressions)
+        if delay:
+            time.sleep(delay)
+        vrs_ids = [self._vrs_id(expression, assembly) for expression in expressions]
+        self._registry.update(
+            (vrs_id, (expression, assembly))
+            for vrs_id, expression in zip(vrs_ids, expressions, strict=True)
+        )
+        return vrs_ids
+
+    def get_liftover_variation_id(
+        self,
+        vrs_id: str,  # noqa: ARG002
+        starting_assembly: ReferenceAssembly,  # noqa: ARG002
+    ) -> str | None:
+        """Report that no liftover exists, after any simulated per-request latency
+
+        :param vrs_id: The VRS ID of the variation to lift over
+        :param starting_assembly: The assembly to liftover FROM
+        :return: always ``None``
+        """
+        if self.request_latency:
+            time.sleep(self.request_latency)
+        return None
+
+    def close(self) -> None:
+        """Nothing to clean up"""
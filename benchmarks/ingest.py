@@ -0,0 +1,142 @@
+"""Benchmark VCF ingestion throughput against a fake AnyVar and a local PostgreSQL
+
+Run from the repository root, e.g.:
+
+    $ python benchmarks/ingest.py --storage-uri postgresql://postgres@localhost:5432/anyvlm_bench --records 100000
+
+The storage database is wiped before and after each run, so don't point this at a
+database holding data you want to keep.
+"""
+
+import json
+import resource
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import click
+from fake_anyvar import FakeAnyVarClient
+from synthetic_vcf import write_synthetic_vcf
+
+from anyvlm.functions.ingest_vcf import ingest_vcf
+from anyvlm.storage.postgres import PostgresObjectStore
+
+
+def _peak_rss_mib() -> float:
+    """Get this process's peak resident set size
+
+    :return: peak RSS, in MiB
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # reported in bytes on macOS, and in KiB elsewhere
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+@click.command()
+@click.option(
+    "--storage-uri",
+    envvar="ANYVLM_BENCHMARK_STORAGE_URI",
+    required=True,
+    help="AnyVLM storage URI to benchmark against. WILL BE WIPED.",
+)
+@click.option(
+    "--vcf",
+    "vcf_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Ingest this VCF instead of generating one",
+)
+@click.option("--records", default=100_000, show_default=True)
+@click.option("--multiallelic-rate", default=0.1, show_default=True)
+@click.option("--extra-info-fields", default=0, show_default=True)
+@click.option("--info-value-length", default=20, show_default=True)
+@click.option("--seed", default=0, show_default=True)
+@click.option(
+    "--batch-size",
+    type=int,
+    help="Fixed registration batch size. Sized adaptively if not given.",
+)
+@click.option("--max-in-flight-batches", type=int)
+@click.option(
+    "--request-latency",
+    default=0.0,
+    show_default=True,
+    help="Simulated AnyVar latency per registration request, in seconds",
+)
+@click.option(
+    "--expression-latency",
+    default=0.0,
+    show_default=True,
+    help="Simulated AnyVar latency per registered expression, in seconds",
+)
+@click.option(
+    "--resumable/--no-resumable",
+    default=True,
+    show_default=True,
+    help="Checkpoint progress, as the server does",
+)
+@click.option("--json", "as_json", is_flag=True, help="Print results as JSON")
+def benchmark_ingest(
+    storage_uri: str,
+    vcf_path: Path | None,
+    records: int,
+    multiallelic_rate: float,
+    extra_info_fields: int,
+    info_value_length: int,
+    seed: int,
+    batch_size: int | None,
+    max_in_flight_batches: int | None,
+    request_latency: float,
+    expression_latency: float,
+    resumable: bool,
+    as_json: bool,
+) -> None:
+    """Measure throughput, per-stage time, and peak memory of VCF ingestion."""
+    storage = PostgresObjectStore(storage_uri)
+    storage.wipe_db()
+    av = FakeAnyVarClient(request_latency, expression_latency)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if vcf_path is None:
+            vcf_path = write_synthetic_vcf(
+                Path(tmpdir) / "synthetic.vcf.gz",
+                records,
+                multiallelic_rate=multiallelic_rate,
+                extra_info_fields=extra_info_fields,
+                info_value_length=info_value_length,
+                seed=seed,
+            )
+        try:
+            start = time.perf_counter()
+            stats = ingest_vcf(
+                vcf_path,
+                av,
+                storage,
+                batch_size=batch_size,
+                max_in_flight_batches=max_in_flight_batches,
+                resumable=resumable,
+            )
+            elapsed = time.perf_counter() - start
+        finally:
+            storage.wipe_db()
+            storage.close()
+
+    results = {
+        **asdict(stats),
+        "elapsed_seconds": elapsed,
+        "records_per_second": stats.records_processed / elapsed,
+        "peak_rss_mib": _peak_rss_mib(),
+    }
+    if as_json:
+        click.echo(json.dumps(results, indent=2))
+        return
+    for name, value in results.items():
+        click.echo(
+            f"{name:<20} {value:,.2f}"
+            if isinstance(value, float)
+            else f"{name:<20} {value}"
+        )
+
+
+if __name__ == "__main__":
+    benchmark_ingest()
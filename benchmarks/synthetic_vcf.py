@@ -0,0 +1,107 @@
+"""Generate synthetic VCFs for ingestion benchmarks"""
+
+import random
+from pathlib import Path
+from typing import TextIO
+
+import pysam
+
+BASES = "ACGT"
+CONTIG_LENGTH = 100_000_000
+REQUIRED_INFO_HEADERS = (
+    '##INFO=<ID=AC,Number=A,Type=Integer,Description="Allele count">',
+    '##INFO=<ID=AN,Number=1,Type=Integer,Description="Total number of alleles">',
+    '##INFO=<ID=AC_Het,Number=A,Type=Integer,Description="Heterozygous allele count">',
+    '##INFO=<ID=AC_Hom,Number=A,Type=Integer,Description="Homozygous allele count">',
+    '##INFO=<ID=AC_Hemi,Number=A,Type=Integer,Description="Hemizygous allele count">',
+)
+
+
+def _write_header(vcf: TextIO, contigs: list[str], extra_info_fields: int) -> None:
+    vcf.write("##fileformat=VCFv4.2\n")
+    vcf.write('##FILTER=<ID=PASS,Description="All filters passed">\n')
+    vcf.write('##FILTER=<ID=LowQual,Description="Low quality">\n')
+    vcf.writelines(
+        f"##contig=<ID={contig},length={CONTIG_LENGTH}>\n" for contig in contigs
+    )
+    vcf.writelines(header + "\n" for header in REQUIRED_INFO_HEADERS)
+    vcf.writelines(
+        f'##INFO=<ID=EXTRA{i},Number=1,Type=String,Description="Padding field {i}">\n'
+        for i in range(extra_info_fields)
+    )
+    # sites-only, like the aggregate VCFs that AnyVLM ingests
+    vcf.write("#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\n")
+
+
+def _info(
+    rng: random.Random,
+    alt_count: int,
+    extra_info_fields: int,
+    info_value_length: int,
+) -> str:
+    an = rng.randint(1000, 10000)
+    ac_het = [rng.randint(0, 50) for _ in range(alt_count)]
+    ac_hom = [rng.randint(0, 10) for _ in range(alt_count)]
+    ac = [het + 2 * hom for het, hom in zip(ac_het, ac_hom, strict=True)]
+    fields = [
+        f"AC={','.join(map(str, ac))}",
+        f"AN={an}",
+        f"AC_Het={','.join(map(str, ac_het))}",
+        f"AC_Hom={','.join(map(str, ac_hom))}",
+        f"AC_Hemi={','.join('0' * alt_count)}",
+    ]
+    padding = "x" * info_value_length
+    fields.extend(f"EXTRA{i}={padding}" for i in range(extra_info_fields))
+    return ";".join(fields)
+
+
+def write_synthetic_vcf(
+    path: Path,
+    records: int,
+    multiallelic_rate: float = 0.1,
+    extra_info_fields: int = 0,
+    info_value_length: int = 20,
+    contigs: int = 1,
+    seed: int = 0,
+) -> Path:
+    """Write a BGZF-compressed, sites-only VCF of random SNVs
+
+    Records are spread evenly over ``contigs`` contigs, in sorted order, so the file
+    can be indexed for sharded ingestion.
+
+    :param path: location to write the VCF to. Should end in ``.vcf.gz``.
+    :param records: number of VCF records (rows) to write
+    :param multiallelic_rate: fraction of records with 2 or 3 alternate alleles
+    :param extra_info_fields: number of INFO fields to add besides those required
+        for ingestion, to simulate annotated VCFs
+    :param info_value_length: length of each extra INFO field's value
+    :param contigs: number of contigs to spread records over
+    :param seed: random seed, so that runs with the same parameters are comparable
+    :return: ``path``
+    """
+    rng = random.Random(seed)  # noqa: S311
+    contig_names = [f"chr{i + 1}" for i in range(contigs)]
+    records_per_contig = -(-records // contigs)
+    step = max(1, CONTIG_LENGTH // (records_per_contig + 1))
+    plain_path = path.with_suffix("")
+
+    with plain_path.open("w") as vcf:
+        _write_header(vcf, contig_names, extra_info_fields)
+        written = 0
+        for contig in contig_names:
+            for pos in range(step, CONTIG_LENGTH, step):
+                if written == records:
+                    break
+                ref = rng.choice(BASES)
+                alt_count = rng.randint(2, 3) if rng.random() < multiallelic_rate else 1
+                alts = rng.sample([base for base in BASES if base != ref], alt_count)
+                filters = "LowQual" if rng.random() < 0.05 else "PASS"  # noqa: PLR2004
+                info = _info(rng, alt_count, extra_info_fields, info_value_length)
+                vcf.write(
+                    f"{contig}\t{pos}\t.\t{ref}\t{','.join(alts)}\t.\t{filters}\t{info}\n"
+                )
+                written += 1
+
+    pysam.tabix_compress(str(plain_path), str(path), force=True)
+    plain_path.unlink()
+    return path
@@ -3,6 +3,7 @@
 import abc
 from collections.abc import Iterable, Sequence
 
+import anyio.to_thread
 from anyvar.core.objects import SupportedVrsVariation
 from anyvar.mapping.liftover import ReferenceAssembly
 from ga4gh.vrs.models import Allele
@@ -20,7 +21,12 @@ class AnyVarClientConnectionError(AnyVarClientError):
 
 
 class BaseAnyVarClient(abc.ABC):
-    """Interface elements for an AnyVar client"""
+    """Interface elements for an AnyVar client
+
+    Lookup methods also have async variants, for use from the server event loop. By
+    default these run the synchronous method in a worker thread; implementations
+    that can do I/O natively on the event loop should override them.
+    """
 
     @abc.abstractmethod
     def retrieve_allele_by_id(self, vrs_id: str) -> SupportedVrsVariation | None:
@@ -45,6 +51,26 @@ class BaseAnyVarClient(abc.ABC):
         :return: VRS Allele if translation succeeds, else `None`
         """
 
+    def retrieve_alleles_by_expression(
+        self,
+        expressions: Iterable[str],
+        assembly: ReferenceAssembly = ReferenceAssembly.GRCH38,
+    ) -> list[Allele | None]:
+        """Retrieve VRS Alleles for many allele expressions
+
+        By default, looks up each expression in turn. Clients that can make lookups
+        concurrently or in bulk should override this.
+
+        :param expressions: variation expressions to get VRS Alleles for
+        :param assembly: reference assembly used in expressions
+        :return: list where the i'th item is the VRS Allele for the i'th expression if
+            translation succeeds, else `None`
+        """
+        return [
+            self.retrieve_allele_by_expression(expression, assembly)
+            for expression in expressions
+        ]
+
     @abc.abstractmethod
     def put_allele_expressions(
         self,
@@ -74,6 +100,100 @@ class BaseAnyVarClient(abc.ABC):
         :return: The VRS ID of the lifted-over variation, or `None` if liftover is unsuccessful
         """
 
+    def get_liftover_variation_ids(
+        self, vrs_ids: Iterable[str], starting_assembly: ReferenceAssembly
+    ) -> list[str | None]:
+        """Get the VRS IDs for the lifted-over equivalents of many variations.
+
+        By default, looks up each variation in turn. Clients that can make lookups
+        concurrently should override this.
+
+        :param vrs_ids: The VRS IDs of the variations to lift over
+        :param starting_assembly: The assembly to liftover FROM (i.e., the assembly of the starting variants)
+        :return: list where the i'th item is the VRS ID of the i'th variation's
+            lifted-over equivalent, or `None` if liftover is unsuccessful
+        :raise AnyVarClientError: if a lookup fails
+        """
+        return [
+            self.get_liftover_variation_id(vrs_id, starting_assembly)
+            for vrs_id in vrs_ids
+        ]
+
     @abc.abstractmethod
     def close(self) -> None:
         """Clean up AnyVar connection."""
+
+    async def retrieve_allele_by_id_async(
+        self, vrs_id: str
+    ) -> SupportedVrsVariation | None:
+        """Retrieve VRS Allele for given VRS ID, without blocking the event loop
+
+        :param vrs_id: The ID to dereference
+        :return: The VRS Allele, or `None` if unable to retrieve the Allele.
+        """
+        return await anyio.to_thread.run_sync(self.retrieve_allele_by_id, vrs_id)
+
+    async def retrieve_allele_by_expression_async(
+        self, expression: str, assembly: ReferenceAssembly = ReferenceAssembly.GRCH38
+    ) -> Allele | None:
+        """Retrieve VRS Allele for given allele expression, without blocking the event
+        loop
+
+        :param expression: variation expression to get VRS Allele for
+        :param assembly: reference assembly used in expression
+        :return: VRS Allele if translation succeeds, else `None`
+        """
+        return await anyio.to_thread.run_sync(
+            self.retrieve_allele_by_expression, expression, assembly
+        )
+
+    async def retrieve_alleles_by_expression_async(
+        self,
+        expressions: Iterable[str],
+        assembly: ReferenceAssembly = ReferenceAssembly.GRCH38,
+    ) -> list[Allele | None]:
+        """Retrieve VRS Alleles for many allele expressions, without blocking the
+        event loop
+
+        :param expressions: variation expressions to get VRS Alleles for
+        :param assembly: reference assembly used in expressions
+        :return: list where the i'th item is the VRS Allele for the i'th expression if
+            translation succeeds, else `None`
+        """
+        return await anyio.to_thread.run_sync(
+            self.retrieve_alleles_by_expression, list(expressions), assembly
+        )
+
+    async def get_liftover_variation_id_async(
+        self, vrs_id: str, starting_assembly: ReferenceAssembly
+    ) -> str | None:
+        """Get the VRS ID for the lifted-over equivalent of a variation, without
+        blocking the event loop
+
+        :param vrs_id: The VRS ID of the variation to lift over
+        :param starting_assembly: The assembly to liftover FROM (i.e., the assembly of the starting variant)
+        :return: The VRS ID of the lifted-over variation, or `None` if liftover is unsuccessful
+        """
+        return await anyio.to_thread.run_sync(
+            self.get_liftover_variation_id, vrs_id, starting_assembly
+        )
+
+    async def get_liftover_variation_ids_async(
+        self, vrs_ids: Iterable[str], starting_assembly: ReferenceAssembly
+    ) -> list[str | None]:
+        """Get the VRS IDs for the lifted-over equivalents of many variations, without
+        blocking the event loop
+
+        :param vrs_ids: The VRS IDs of the variations to lift over
+        :param starting_assembly: The assembly to liftover FROM (i.e., the assembly of the starting variants)
+        :return: list where the i'th item is the VRS ID of the i'th variation's
+            lifted-over equivalent, or `None` if liftover is unsuccessful
+        :raise AnyVarClientError: if a lookup fails
+        """
+        return await anyio.to_thread.run_sync(
+            self.get_liftover_variation_ids, list(vrs_ids), starting_assembly
+        )
+
+    async def close_async(self) -> None:
+        """Clean up AnyVar connection, including any resources used by async methods."""
+        await anyio.to_thread.run_sync(self.close)
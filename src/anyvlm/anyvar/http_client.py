@@ -1,10 +1,17 @@
 """Provide abstraction for a VLM-to-AnyVar connection."""
 
+import asyncio
+import contextlib
 import logging
-from collections.abc import Iterable, Sequence
+import random
+import threading
+from collections.abc import Awaitable, Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from http import HTTPMethod, HTTPStatus
-from typing import Literal
+from itertools import chain
+from typing import Literal, TypeVar
 
+import httpx
 import requests
 from anyvar.core.metadata import VariationMapping
 from anyvar.mapping.liftover import ReferenceAssembly
@@ -14,7 +21,9 @@ from anyvar.restapi.schema import (
     RegisterVariationResponse,
 )
 from ga4gh.vrs import VrsType, models
+from requests.adapters import HTTPAdapter
 from requests.models import Response
+from urllib3.util import Retry
 
 from anyvlm.anyvar.base_client import (
     AnyVarClientConnectionError,
@@ -26,21 +35,112 @@ from anyvlm.utils.functions import validate_allele
 
 _logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# responses that indicate a transient failure of the AnyVar service or a proxy in front of it
+RETRY_STATUSES = (
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+)
+
 
 class HttpAnyVarClient(BaseAnyVarClient):
     """AnyVar HTTP-based client"""
 
     def __init__(
-        self, hostname: str = "http://localhost:8000", request_timeout: int = 30
+        self,
+        hostname: str = "http://localhost:8000",
+        request_timeout: int = 30,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        backoff_jitter: float = 0.5,
+        sub_batch_size: int = 500,
+        max_concurrent_requests: int = 4,
     ) -> None:
         """Initialize client instance
 
+        Connections are kept alive and reused across requests. Requests that fail to
+        connect, time out, or receive a transient error status are retried with
+        jittered exponential backoff; every request this client makes is idempotent.
+
         :param hostname: service API root
         :param request_timeout: timeout value, in seconds, for HTTP requests
+        :param pool_connections: number of per-host connection pools to keep
+        :param pool_maxsize: maximum number of connections to keep open to a host
+        :param pool_block: whether to wait for a free connection when ``pool_maxsize``
+            connections to a host are in use, rather than opening a connection that
+            isn't returned to the pool
+        :param max_retries: maximum number of times to retry a failed request
+        :param backoff_factor: base of the exponential backoff between retries, in
+            seconds
+        :param backoff_jitter: maximum random delay, in seconds, added to each backoff
+        :param sub_batch_size: maximum number of expressions to register per request.
+            Larger inputs to :py:meth:`put_allele_expressions` are split into
+            sub-batches of this size.
+        :param max_concurrent_requests: maximum number of threaded sub-batch
+            registration and bulk liftover requests to have outstanding at once. The
+            worker threads making them are shared by the whole client, so concurrent
+            calls don't multiply this limit. Async bulk lookups are limited to this
+            many outstanding requests per call.
+        :raise ValueError: if ``sub_batch_size`` or ``max_concurrent_requests`` isn't
+            positive
         """
+        if sub_batch_size < 1 or max_concurrent_requests < 1:
+            msg = "Sub-batch size and maximum concurrent requests must be positive"
+            raise ValueError(msg)
         _logger.info("Initializing HTTP-based AnyVar client with hostname %s", hostname)
         self.hostname = hostname
         self.request_timeout = request_timeout
+        retry = Retry(
+            total=max_retries,
+            # AnyVar's POST /variation is a read-only search, so is safe to retry
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {HTTPMethod.POST},
+            status_forcelist=RETRY_STATUSES,
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_jitter,
+            # let the final response through, so callers can handle its status
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=retry,
+        )
+        self._session = requests.Session()
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self.sub_batch_size = sub_batch_size
+        self.max_concurrent_requests = max_concurrent_requests
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_jitter = backoff_jitter
+        self._async_limits = httpx.Limits(
+            max_connections=pool_maxsize if pool_block else None,
+            max_keepalive_connections=pool_maxsize,
+        )
+        self._async_client: httpx.AsyncClient | None = None
+        self._async_client_loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the executor for concurrent sub-batch requests, starting it on first use
+
+        :return: executor with ``max_concurrent_requests`` worker threads
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrent_requests,
+                    thread_name_prefix="anyvlm-anyvar-http",
+                )
+            return self._executor
 
     def _make_http_request(
         self,
@@ -56,11 +156,12 @@ class HttpAnyVarClient(BaseAnyVarClient):
         :param url: target URL
         :param payload: request data to provide as JSON
         :return: literal response object
-        :raise AnyVarClientConnectionError: if server fails to respond
+        :raise AnyVarClientConnectionError: if server fails to respond, or doesn't
+            respond within the request timeout
         :raise requests.HTTPError: if response status code != 200 OK
         """
         try:
-            response = requests.request(
+            response = self._session.request(
                 method=method, url=url, json=payload, timeout=self.request_timeout
             )
         except requests.ConnectionError as e:
@@ -69,9 +170,19 @@ class HttpAnyVarClient(BaseAnyVarClient):
                 self.hostname,
             )
             raise AnyVarClientConnectionError from e
+        except requests.Timeout as e:
+            _logger.exception(
+                "Timed out after %ss waiting for AnyVar configured at %s",
+                self.request_timeout,
+                self.hostname,
+            )
+            raise AnyVarClientConnectionError from e
         try:
             response.raise_for_status()
         except requests.HTTPError:
+            if response.status_code == HTTPStatus.NOT_FOUND:
+                # expected for lookups of unregistered variants
+                raise
             # log it, then let callers handle specific failures their own way
             _logger.exception(
                 "Encountered HTTP exception submitting payload %s to %s",
@@ -81,6 +192,94 @@ class HttpAnyVarClient(BaseAnyVarClient):
             raise
         return response
 
+    async def _get_async_client(self) -> httpx.AsyncClient:
+        """Get the connection pool for async requests, creating it on first use
+
+        Pooled connections belong to the event loop they were opened on, so a new
+        pool is created if the client is used from a different event loop (e.g. by
+        repeated calls to :py:func:`anyio.run`), and the previous pool is closed.
+
+        :return: async HTTP client, shared by all requests on the current event loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            previous_client = self._async_client
+            self._async_client = httpx.AsyncClient(
+                timeout=self.request_timeout, limits=self._async_limits
+            )
+            self._async_client_loop = loop
+            if previous_client is not None:
+                # the previous loop is usually closed already, so its connections
+                # can be released but not shut down cleanly
+                with contextlib.suppress(RuntimeError):
+                    await previous_client.aclose()
+        return self._async_client
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Compute jittered exponential backoff before retrying a request
+
+        Matches the backoff used by urllib3 for synchronous requests.
+
+        :param attempt: number of the retry about to be made, starting from 1
+        :return: seconds to wait
+        """
+        delay = 0.0 if attempt < 2 else self.backoff_factor * 2 ** (attempt - 1)  # noqa: PLR2004
+        return delay + random.uniform(0, self.backoff_jitter)  # noqa: S311
+
+    async def _make_http_request_async(
+        self,
+        method: Literal[HTTPMethod.POST]
+        | Literal[HTTPMethod.PUT]
+        | Literal[HTTPMethod.GET],
+        url: str,
+        payload: dict | list | None = None,
+    ) -> httpx.Response:
+        """Issue an HTTP request to an AnyVar server on the event loop.
+
+        Requests that fail to connect, time out, or receive a transient error status
+        are retried like synchronous requests.
+
+        :param method: type of request to make
+        :param url: target URL
+        :param payload: request data to provide as JSON
+        :return: literal response object
+        :raise AnyVarClientConnectionError: if server fails to respond, or doesn't
+            respond within the request timeout
+        :raise httpx.HTTPStatusError: if response status code != 200 OK
+        """
+        attempt = 0
+        while True:
+            try:
+                client = await self._get_async_client()
+                response = await client.request(method, url, json=payload)
+            except (httpx.ConnectError, httpx.TimeoutException) as e:
+                if attempt < self.max_retries:
+                    attempt += 1
+                    await asyncio.sleep(self._retry_delay(attempt))
+                    continue
+                _logger.exception(
+                    "Unable to get response from AnyVar configured at %s",
+                    self.hostname,
+                )
+                raise AnyVarClientConnectionError from e
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                attempt += 1
+                await asyncio.sleep(self._retry_delay(attempt))
+                continue
+            break
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError:
+            if response.status_code == HTTPStatus.NOT_FOUND:
+                raise
+            _logger.exception(
+                "Encountered HTTP exception submitting payload %s to %s",
+                payload,
+                url,
+            )
+            raise
+        return response
+
     def retrieve_allele_by_id(self, vrs_id: str) -> models.Allele | None:
         """Retrieve VRS Allele for given VRS ID
 
@@ -92,6 +291,17 @@ class HttpAnyVarClient(BaseAnyVarClient):
         validated_response: GetObjectResponse = GetObjectResponse(**response.json())
         return validate_allele(allele=validated_response.data)
 
+    async def retrieve_allele_by_id_async(self, vrs_id: str) -> models.Allele | None:
+        """Retrieve VRS Allele for given VRS ID, without blocking the event loop
+
+        :param vrs_id: The ID to dereference
+        :return: The VRS Allele, or `None` if unable to retrieve the Allele.
+        """
+        url = f"{self.hostname}/object/{vrs_id}"
+        response = await self._make_http_request_async(HTTPMethod.GET, url)
+        validated_response = GetObjectResponse(**response.json())
+        return validate_allele(allele=validated_response.data)
+
     def retrieve_allele_by_expression(
         self, expression: str, assembly: ReferenceAssembly = ReferenceAssembly.GRCH38
     ) -> models.Allele | None:
@@ -101,9 +311,15 @@ class HttpAnyVarClient(BaseAnyVarClient):
         This could change depending on the AnyVar implementation, though, and probably
         can't be validated on the AnyVLM side.
 
+        Uses AnyVar's search endpoint, so unregistered variants aren't registered as a
+        side effect.
+
         :param expression: variation expression to get VRS Allele for
         :param assembly: reference assembly used in expression
-        :return: VRS Allele if translation succeeds, else `None`
+        :return: VRS Allele if translation succeeds and the variant is registered,
+            else `None`
+        :raise AnyVarClientError: if AnyVar responds with an error other than the
+            variant not being registered or not translating
         """
         url = f"{self.hostname}/variation"
         payload = {
@@ -112,16 +328,83 @@ class HttpAnyVarClient(BaseAnyVarClient):
             "input_type": VrsType.ALLELE.value,
         }
         try:
-            response: Response = self._make_http_request(HTTPMethod.PUT, url, payload)
+            response: Response = self._make_http_request(HTTPMethod.POST, url, payload)
         except requests.HTTPError as e:
+            if e.response.status_code == HTTPStatus.NOT_FOUND:
+                _logger.debug("Variant expression '%s' is not registered", expression)
+                return None
             if e.response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY:
                 _logger.debug(
                     "Translation failed for variant expression '%s'", expression
                 )
-            return None
+                return None
+            msg = f"Lookup failed for variant expression '{expression}'"
+            raise AnyVarClientError(msg) from e
+
+        validated_response = GetObjectResponse(**response.json())
+        return validate_allele(allele=validated_response.data)
+
+    async def retrieve_allele_by_expression_async(
+        self, expression: str, assembly: ReferenceAssembly = ReferenceAssembly.GRCH38
+    ) -> models.Allele | None:
+        """Retrieve VRS Allele for given allele expression, without blocking the event
+        loop
+
+        Uses AnyVar's search endpoint, so unregistered variants aren't registered as a
+        side effect.
+
+        :param expression: variation expression to get VRS Allele for
+        :param assembly: reference assembly used in expression
+        :return: VRS Allele if translation succeeds and the variant is registered,
+            else `None`
+        :raise AnyVarClientError: if AnyVar responds with an error other than the
+            variant not being registered or not translating
+        """
+        url = f"{self.hostname}/variation"
+        payload = {
+            "definition": expression,
+            "assembly_name": assembly.value,
+            "input_type": VrsType.ALLELE.value,
+        }
+        try:
+            response = await self._make_http_request_async(
+                HTTPMethod.POST, url, payload
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == HTTPStatus.NOT_FOUND:
+                _logger.debug("Variant expression '%s' is not registered", expression)
+                return None
+            if e.response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY:
+                _logger.debug(
+                    "Translation failed for variant expression '%s'", expression
+                )
+                return None
+            msg = f"Lookup failed for variant expression '{expression}'"
+            raise AnyVarClientError(msg) from e
+
+        validated_response = GetObjectResponse(**response.json())
+        return validate_allele(allele=validated_response.data)
+
+    async def retrieve_alleles_by_expression_async(
+        self,
+        expressions: Iterable[str],
+        assembly: ReferenceAssembly = ReferenceAssembly.GRCH38,
+    ) -> list[models.Allele | None]:
+        """Retrieve VRS Alleles for many allele expressions, without blocking the
+        event loop
 
-        validated_response = RegisterVariationResponse(**response.json())
-        return validated_response.object
+        Lookups are made concurrently on the event loop, up to the client's request
+        concurrency limit.
+
+        :param expressions: variation expressions to get VRS Alleles for
+        :param assembly: reference assembly used in expressions
+        :return: list where the i'th item is the VRS Allele for the i'th expression if
+            translation succeeds and the variant is registered, else `None`
+        """
+        return await self._gather_limited(
+            self.retrieve_allele_by_expression_async(expression, assembly)
+            for expression in expressions
+        )
 
     def put_allele_expressions(
         self,
@@ -134,12 +417,43 @@ class HttpAnyVarClient(BaseAnyVarClient):
         This could change depending on the AnyVar implementation, though, and probably
         can't be validated on the AnyVLM side.
 
+        Inputs larger than the client's sub-batch size are split into sub-batches,
+        which are registered concurrently.
+
         :param expressions: variation expressions to register
         :param assembly: reference assembly used in expressions
         :return: list where the i'th item is either the VRS ID if translation succeeds,
             else `None`, for the i'th expression
         :raise AnyVarClientError: for unexpected errors relating to specifics of client interface
         """
+        expressions = list(expressions)
+        if len(expressions) <= self.sub_batch_size or self.max_concurrent_requests == 1:
+            sub_batches = [expressions]
+        else:
+            sub_batches = [
+                expressions[i : i + self.sub_batch_size]
+                for i in range(0, len(expressions), self.sub_batch_size)
+            ]
+        if len(sub_batches) == 1:
+            return self._put_allele_expressions(sub_batches[0], assembly)
+        # map() yields results in submission order, so IDs line up with the input
+        results = self._get_executor().map(
+            lambda sub_batch: self._put_allele_expressions(sub_batch, assembly),
+            sub_batches,
+        )
+        return list(chain.from_iterable(results))
+
+    def _put_allele_expressions(
+        self, expressions: list[str], assembly: ReferenceAssembly
+    ) -> list[str | None]:
+        """Register allele expressions with a single request
+
+        :param expressions: variation expressions to register
+        :param assembly: reference assembly used in expressions
+        :return: list where the i'th item is either the VRS ID if translation succeeds,
+            else `None`, for the i'th expression
+        :raise AnyVarClientError: if AnyVar responds with an error status
+        """
         payload = [
             {
                 "definition": expression,
@@ -167,9 +481,110 @@ class HttpAnyVarClient(BaseAnyVarClient):
         as_source: bool = starting_assembly == ReferenceAssembly.GRCH37
         url: str = f"{self.hostname}/object/{vrs_id}/mappings/liftover_to?as_source={as_source}"
         response = self._make_http_request(HTTPMethod.GET, url)
-        validated_response: GetMappingResponse = GetMappingResponse(**response.json())
+        return self._get_liftover_id(response.json(), as_source)
+
+    def get_liftover_variation_ids(
+        self, vrs_ids: Iterable[str], starting_assembly: ReferenceAssembly
+    ) -> list[str | None]:
+        """Get the VRS IDs for the lifted-over equivalents of many variations.
+
+        Lookups are made concurrently, up to the client's request concurrency limit.
+
+        :param vrs_ids: The VRS IDs of the variations to lift over
+        :param starting_assembly: The assembly to liftover FROM (i.e., the assembly of the starting variants)
+        :return: list where the i'th item is the VRS ID of the i'th variation's
+            lifted-over equivalent, or `None` if liftover is unsuccessful
+        :raise AnyVarClientError: if a lookup fails
+        """
+
+        def _lookup(vrs_id: str) -> str | None:
+            try:
+                return self.get_liftover_variation_id(vrs_id, starting_assembly)
+            except requests.HTTPError as e:
+                msg = f"Liftover lookup failed for {vrs_id}"
+                raise AnyVarClientError(msg) from e
+
+        vrs_ids = list(vrs_ids)
+        if len(vrs_ids) <= 1 or self.max_concurrent_requests == 1:
+            return [_lookup(vrs_id) for vrs_id in vrs_ids]
+        return list(self._get_executor().map(_lookup, vrs_ids))
+
+    async def get_liftover_variation_id_async(
+        self, vrs_id: str, starting_assembly: ReferenceAssembly
+    ) -> str | None:
+        """Get the VRS ID for the lifted-over equivalent of a variation, without
+        blocking the event loop
+
+        :param vrs_id: The VRS ID of the variation to lift over
+        :param starting_assembly: The assembly to liftover FROM (i.e., the assembly of the starting variant)
+        :return: The VRS ID of the lifted-over variation, or `None` if liftover is unsuccessful
+        :raise AnyVarClientError: if AnyVar responds with an error
+        """
+        as_source: bool = starting_assembly == ReferenceAssembly.GRCH37
+        url: str = f"{self.hostname}/object/{vrs_id}/mappings/liftover_to?as_source={as_source}"
+        try:
+            response = await self._make_http_request_async(HTTPMethod.GET, url)
+        except httpx.HTTPStatusError as e:
+            msg = f"Liftover lookup failed for {vrs_id}"
+            raise AnyVarClientError(msg) from e
+        return self._get_liftover_id(response.json(), as_source)
+
+    async def get_liftover_variation_ids_async(
+        self, vrs_ids: Iterable[str], starting_assembly: ReferenceAssembly
+    ) -> list[str | None]:
+        """Get the VRS IDs for the lifted-over equivalents of many variations, without
+        blocking the event loop
+
+        Lookups are made concurrently on the event loop, up to the client's request
+        concurrency limit.
+
+        :param vrs_ids: The VRS IDs of the variations to lift over
+        :param starting_assembly: The assembly to liftover FROM (i.e., the assembly of the starting variants)
+        :return: list where the i'th item is the VRS ID of the i'th variation's
+            lifted-over equivalent, or `None` if liftover is unsuccessful
+        :raise AnyVarClientError: if a lookup fails
+        """
+        return await self._gather_limited(
+            self.get_liftover_variation_id_async(vrs_id, starting_assembly)
+            for vrs_id in vrs_ids
+        )
+
+    async def _gather_limited(self, coroutines: Iterable[Awaitable[T]]) -> list[T]:
+        """Await many requests, with at most ``max_concurrent_requests`` outstanding
+
+        :param coroutines: requests to make
+        :return: result of each request, in input order
+        :raise Exception: the first exception raised by a request, once the others
+            are cancelled
+        """
+        limiter = asyncio.Semaphore(self.max_concurrent_requests)
+
+        async def _limited(coroutine: Awaitable[T]) -> T:
+            async with limiter:
+                return await coroutine
+
+        tasks = [asyncio.ensure_future(_limited(c)) for c in coroutines]
+        try:
+            return list(await asyncio.gather(*tasks))
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def _get_liftover_id(mapping_response: dict, as_source: bool) -> str | None:
+        """Extract the lifted-over variation ID from an AnyVar mapping response
+
+        :param mapping_response: JSON body of a liftover mappings response
+        :param as_source: whether the original variation is the source of the mapping
+        :return: The VRS ID of the lifted-over variation, or `None` if there's no
+            liftover mapping
+        :raise LiftoverError: if more than one liftover mapping is found
+        """
+        validated_response: GetMappingResponse = GetMappingResponse(**mapping_response)
 
         variation_mappings: list[VariationMapping] = list(validated_response.mappings)
+        if not variation_mappings:
+            return None
         if len(variation_mappings) > 1:
             error_message: str = "Multiple liftover mappings found"
             raise LiftoverError(error_message)
@@ -178,10 +593,18 @@ class HttpAnyVarClient(BaseAnyVarClient):
         return mapping_result.dest_id if as_source else mapping_result.source_id
 
     def close(self) -> None:
-        """Clean up AnyVar connection.
+        """Clean up AnyVar connection by closing pooled connections."""
+        _logger.info("Closing HTTP-based AnyVar client.")
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+        self._session.close()
 
-        This is a no-op for this class.
-        """
-        _logger.info(
-            "Closing HTTP-based AnyVar client class. This requires no further action."
-        )
+    async def close_async(self) -> None:
+        """Clean up AnyVar connection, including connections pooled for async requests."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_client_loop = None
+        self.close()
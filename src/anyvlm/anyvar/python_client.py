@@ -1,9 +1,14 @@
 """Implement AnyVar client interface for direct Python-based access."""
 
 import logging
-from collections.abc import Iterable, Sequence
+import multiprocessing
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
 
 from anyvar import AnyVar
+from anyvar.anyvar import create_translator
 from anyvar.core.metadata import VariationMapping, VariationMappingType
 from anyvar.core.objects import SupportedVrsVariation
 from anyvar.mapping.liftover import ReferenceAssembly
@@ -18,16 +23,113 @@ from anyvlm.anyvar.base_client import BaseAnyVarClient
 _logger = logging.getLogger(__name__)
 
 
+def _translate_allele_expression(
+    translator: Translator, expression: str, assembly: ReferenceAssembly
+) -> Allele | None:
+    """Translate a single allele expression to a VRS Allele
+
+    :param translator: AnyVar translator instance
+    :param expression: variation expression to translate
+    :param assembly: reference assembly used in expression
+    :return: VRS Allele if translation succeeds, else `None`
+    """
+    translated_variation = None
+    try:
+        translated_variation = translator.translate_variation(
+            expression,
+            assembly=assembly.value,
+            input_type=SupportedVariationType.ALLELE,  # type: ignore
+        )
+    except DataProxyValidationError:
+        _logger.exception("Found invalid base in expression %s", expression)
+    except TranslationError:
+        _logger.exception("Failed to translate expression: %s", expression)
+    return translated_variation  # type: ignore
+
+
+# Translator held by each translation worker process, created once at worker startup
+_worker_translator: Translator | None = None
+
+
+def _init_translation_worker(translator_factory: Callable[[], Translator]) -> None:
+    """Create the translator used by a translation worker process
+
+    :param translator_factory: callable returning a new translator. Must be picklable
+        (e.g. a module-level function).
+    """
+    global _worker_translator  # noqa: PLW0603
+    _worker_translator = translator_factory()
+
+
+def _translate_in_worker(
+    expressions: list[str], assembly: ReferenceAssembly
+) -> list[Allele | None]:
+    """Translate a chunk of allele expressions in a translation worker process
+
+    :param expressions: variation expressions to translate
+    :param assembly: reference assembly used in expressions
+    :return: VRS Allele for each expression, or `None` where translation fails
+    """
+    if _worker_translator is None:
+        msg = "Translation worker was not initialized"
+        raise RuntimeError(msg)
+    return [
+        _translate_allele_expression(_worker_translator, expression, assembly)
+        for expression in expressions
+    ]
+
+
 class PythonAnyVarClient(BaseAnyVarClient):
     """A Python-based AnyVar client."""
 
-    def __init__(self, translator: Translator, storage: Storage) -> None:
+    def __init__(
+        self,
+        translator: Translator,
+        storage: Storage,
+        translation_processes: int = 1,
+        translator_factory: Callable[[], Translator] = create_translator,
+    ) -> None:
         """Initialize directly-connected AnyVar client
 
         :param translator: AnyVar translator instance
         :param storage: AnyVar storage instance
+        :param translation_processes: number of worker processes to translate
+            expressions with when registering them. If 1, translation happens on the
+            calling thread.
+        :param translator_factory: callable used by each worker process to create its
+            own translator. Must be picklable (e.g. a module-level function).
+        :raise ValueError: if ``translation_processes`` isn't positive
         """
+        if translation_processes < 1:
+            msg = "Number of translation processes must be positive"
+            raise ValueError(msg)
         self.av = AnyVar(translator, storage)
+        self.translation_processes = translation_processes
+        self._translator_factory = translator_factory
+        self._translation_pool: ProcessPoolExecutor | None = None
+        self._translation_pool_lock = threading.Lock()
+
+    def _get_translation_pool(self) -> ProcessPoolExecutor:
+        """Get the translation worker pool, starting it on first use
+
+        Workers are spawned rather than forked, so they don't inherit database
+        connections or locks held by other threads of this process.
+
+        :return: translation worker pool
+        """
+        with self._translation_pool_lock:
+            if self._translation_pool is None:
+                _logger.info(
+                    "Starting %s AnyVar translation worker processes",
+                    self.translation_processes,
+                )
+                self._translation_pool = ProcessPoolExecutor(
+                    max_workers=self.translation_processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_translation_worker,
+                    initargs=(self._translator_factory,),
+                )
+            return self._translation_pool
 
     def _translate_allele_expression(
         self, expression: str, assembly: ReferenceAssembly = ReferenceAssembly.GRCH38
@@ -42,18 +144,33 @@ class PythonAnyVarClient(BaseAnyVarClient):
         :param assembly: reference assembly used in expression
         :return: VRS Allele if translation succeeds, else `None`
         """
-        translated_variation = None
-        try:
-            translated_variation = self.av.translator.translate_variation(
-                expression,
-                assembly=assembly.value,
-                input_type=SupportedVariationType.ALLELE,  # type: ignore
-            )
-        except DataProxyValidationError:
-            _logger.exception("Found invalid base in expression %s", expression)
-        except TranslationError:
-            _logger.exception("Failed to translate expression: %s", expression)
-        return translated_variation  # type: ignore
+        return _translate_allele_expression(self.av.translator, expression, assembly)
+
+    def _translate_allele_expressions(
+        self, expressions: list[str], assembly: ReferenceAssembly
+    ) -> list[Allele | None]:
+        """Translate a batch of allele expressions, in parallel if configured to
+
+        :param expressions: variation expressions to translate
+        :param assembly: reference assembly used in expressions
+        :return: VRS Allele for each expression, in input order, or `None` where
+            translation fails
+        """
+        if self.translation_processes == 1 or len(expressions) <= 1:
+            return [
+                self._translate_allele_expression(expression, assembly)
+                for expression in expressions
+            ]
+        # a few chunks per worker, so that a slow chunk doesn't idle the others
+        chunk_size = -(-len(expressions) // (self.translation_processes * 4))
+        chunks = [
+            expressions[i : i + chunk_size]
+            for i in range(0, len(expressions), chunk_size)
+        ]
+        translated = self._get_translation_pool().map(
+            _translate_in_worker, chunks, repeat(assembly)
+        )
+        return list(chain.from_iterable(translated))
 
     def retrieve_allele_by_id(self, vrs_id: str) -> SupportedVrsVariation | None:
         """Retrieve VRS Allele for given VRS ID
@@ -87,6 +204,45 @@ class PythonAnyVarClient(BaseAnyVarClient):
                 "VRS Allele with ID %s not found", translated_variation.id
             )
 
+    def retrieve_alleles_by_expression(
+        self,
+        expressions: Iterable[str],
+        assembly: ReferenceAssembly = ReferenceAssembly.GRCH38,
+    ) -> list[Allele | None]:
+        """Retrieve VRS Alleles for many allele expressions
+
+        Expressions are translated in parallel if the client was configured with
+        multiple translation processes, then all translated alleles are looked up
+        with a single storage query.
+
+        :param expressions: variation expressions to get VRS Alleles for
+        :param assembly: reference assembly used in expressions
+        :return: list where the i'th item is the VRS Allele for the i'th expression if
+            translation succeeds and the allele is registered, else `None`
+        """
+        translated_variations = self._translate_allele_expressions(
+            list(expressions), assembly
+        )
+        vrs_ids = list(
+            dict.fromkeys(
+                variation.id for variation in translated_variations if variation
+            )
+        )
+        registered: dict[str, Allele] = (
+            {
+                allele.id: allele  # type: ignore
+                for allele in self.av.object_store.get_objects(
+                    object_type=Allele, object_ids=vrs_ids
+                )
+            }
+            if vrs_ids
+            else {}
+        )
+        return [
+            registered.get(variation.id) if variation else None  # type: ignore
+            for variation in translated_variations
+        ]
+
     def put_allele_expressions(
         self,
         expressions: Iterable[str],
@@ -98,17 +254,17 @@ class PythonAnyVarClient(BaseAnyVarClient):
         What this means could change depending on the AnyVar implementation, though, and
         probably can't be validated on the AnyVLM side given current designs.
 
+        If the client was configured with multiple translation processes, expressions
+        are translated in parallel by worker processes, then registered together.
+
         :param expressions: variation expressions to register
         :param assembly: reference assembly used in expressions
         :return: list where the i'th item is either the VRS ID if translation succeeds,
             else `None`, for the i'th expression
         """
-        translated_variations = []
-        for expression in expressions:
-            translated_variation = self._translate_allele_expression(
-                expression, assembly
-            )
-            translated_variations.append(translated_variation)
+        translated_variations = self._translate_allele_expressions(
+            list(expressions), assembly
+        )
 
         self.av.put_objects([v for v in translated_variations if v])
         results = []
@@ -143,6 +299,10 @@ class PythonAnyVarClient(BaseAnyVarClient):
         )
 
     def close(self) -> None:
-        """Clean up AnyVar instance."""
+        """Clean up AnyVar instance and stop any translation worker processes."""
         _logger.info("Closing AnyVar client.")
+        with self._translation_pool_lock:
+            if self._translation_pool is not None:
+                self._translation_pool.shutdown(cancel_futures=True)
+                self._translation_pool = None
         self.av.object_store.close()
@@ -0,0 +1,5 @@
+"""Provide tools and implementations of AnyVLM response caches."""
+
+from .base_cache import ResponseCache
+
+__all__ = ["ResponseCache"]
@@ -0,0 +1,49 @@
+"""Provide base response cache implementation."""
+
+from abc import ABC, abstractmethod
+
+from anyvar.mapping.liftover import ReferenceAssembly
+
+from anyvlm.utils.types import AlleleCoordinates
+
+
+def variant_counts_cache_key(
+    generation: int, assembly: ReferenceAssembly, coordinates: AlleleCoordinates
+) -> str:
+    """Build the cache key for a ``/variant_counts`` query
+
+    Queries are keyed on normalized parameters, so that e.g. ``hg38``/``GRCh38`` or
+    ``chr1``/``1`` share an entry, and on the dataset generation, so that entries
+    computed before a data change are never read after it.
+
+    :param generation: dataset generation the response is computed from
+    :param assembly: reference assembly of the query
+    :param coordinates: normalized coordinates of the queried allele
+    :return: cache key
+    """
+    return ":".join(
+        ("variant_counts", str(generation), assembly.value, *map(str, coordinates))
+    )
+
+
+class ResponseCache(ABC):
+    """Cache serialized API responses by key"""
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """Look up a cached response
+
+        :param key: cache key
+        :return: cached response body, or ``None`` if not cached
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes) -> None:
+        """Cache a response, possibly evicting others
+
+        :param key: cache key
+        :param value: response body
+        """
+
+    async def close_async(self) -> None:  # noqa: B027
+        """Close any connections held by the cache"""
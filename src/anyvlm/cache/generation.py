@@ -0,0 +1,63 @@
+"""Provide a dataset generation reader that avoids a storage query per request."""
+
+import asyncio
+from time import monotonic
+
+from anyvlm.storage.base_storage import Storage
+
+
+class GenerationReader:
+    """Read the dataset generation from storage at most once per refresh interval
+
+    Responses are keyed and tagged by the generation, so reading it from storage for
+    every request would add a query to every request. Instead, the last value read is
+    reused for ``refresh_interval`` seconds, and concurrent reads of an expired value
+    share a single storage query. Data written during the interval may therefore go
+    unnoticed by caches and ETags for up to ``refresh_interval`` seconds.
+
+    Must only be used from one event loop at a time.
+    """
+
+    def __init__(self, storage: Storage, refresh_interval: float = 1.0) -> None:
+        """Initialize reader
+
+        :param storage: AnyVLM storage instance to read the generation from
+        :param refresh_interval: seconds to reuse a generation read from storage. If
+            0, every read queries storage.
+        :raise ValueError: if the refresh interval is negative
+        """
+        if refresh_interval < 0:
+            msg = f"Refresh interval must not be negative, got {refresh_interval}"
+            raise ValueError(msg)
+        self.storage = storage
+        self.refresh_interval = refresh_interval
+        self._generation: int | None = None
+        self._read_at = 0.0
+        self._refresh: asyncio.Task[int] | None = None
+
+    async def get_generation_async(self) -> int:
+        """Get the current dataset generation, as of at most ``refresh_interval``
+        seconds ago
+
+        :return: dataset generation
+        """
+        if (
+            self._generation is not None
+            and monotonic() - self._read_at < self.refresh_interval
+        ):
+            return self._generation
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.get_running_loop().create_task(self._read())
+        # other callers may be waiting on the same read, so a cancelled caller mustn't
+        # cancel it
+        return await asyncio.shield(self._refresh)
+
+    async def _read(self) -> int:
+        """Read the generation from storage, and remember it
+
+        :return: dataset generation
+        """
+        read_at = monotonic()
+        generation = await self.storage.get_generation_async()
+        self._generation, self._read_at = generation, read_at
+        return generation
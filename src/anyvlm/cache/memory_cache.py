@@ -0,0 +1,47 @@
+"""Provide in-process response cache implementation."""
+
+from collections import OrderedDict
+
+from anyvlm.cache.base_cache import ResponseCache
+
+
+class LruResponseCache(ResponseCache):
+    """Cache responses in process memory, evicting the least recently used
+
+    Entries are only visible to the server process that cached them. Must only be
+    used from one event loop.
+    """
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        """Initialize cache
+
+        :param max_entries: maximum number of responses to hold
+        :raise ValueError: if ``max_entries`` isn't positive
+        """
+        if max_entries < 1:
+            msg = f"Max cache entries must be at least 1, got {max_entries}"
+            raise ValueError(msg)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+
+    async def get(self, key: str) -> bytes | None:
+        """Look up a cached response
+
+        :param key: cache key
+        :return: cached response body, or ``None`` if not cached
+        """
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        """Cache a response, evicting the least recently used if full
+
+        :param key: cache key
+        :param value: response body
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
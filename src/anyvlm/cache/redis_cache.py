@@ -0,0 +1,61 @@
+"""Provide Redis-based response cache implementation."""
+
+import logging
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from anyvlm.cache.base_cache import ResponseCache
+
+_logger = logging.getLogger(__name__)
+
+
+class RedisResponseCache(ResponseCache):
+    """Cache responses in Redis, shared by every server process using it
+
+    Size is bounded by the Redis server's ``maxmemory`` setting; configure it with an
+    LRU eviction policy (e.g. ``allkeys-lru``). Entries also expire after ``ttl``
+    seconds, so that entries for old dataset generations don't linger.
+
+    Redis errors are logged and treated as cache misses, so that an unavailable cache
+    doesn't fail requests.
+    """
+
+    def __init__(self, url: str, ttl: int | None = 86400) -> None:
+        """Initialize cache
+
+        :param url: Redis connection URL (e.g. ``redis://localhost:6379/0``)
+        :param ttl: seconds to keep each entry, or ``None`` to keep entries until
+            evicted
+        """
+        self.url = url
+        self.ttl = ttl
+        self._redis = Redis.from_url(url)
+
+    async def get(self, key: str) -> bytes | None:
+        """Look up a cached response
+
+        :param key: cache key
+        :return: cached response body, or ``None`` if not cached or Redis is
+            unavailable
+        """
+        try:
+            return await self._redis.get(key)
+        except RedisError:
+            _logger.warning("Unable to read %s from response cache", key, exc_info=True)
+            return None
+
+    async def set(self, key: str, value: bytes) -> None:
+        """Cache a response
+
+        :param key: cache key
+        :param value: response body
+        """
+        try:
+            await self._redis.set(key, value, ex=self.ttl)
+        except RedisError:
+            _logger.warning("Unable to write %s to response cache", key, exc_info=True)
+
+    async def close_async(self) -> None:
+        """Close connections to Redis"""
+        await self._redis.aclose()
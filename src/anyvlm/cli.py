@@ -1,6 +1,7 @@
 """CLI for interacting with AnyVLM instance"""
 
 import logging
+import time
 from http import HTTPStatus
 from pathlib import Path
 from timeit import default_timer as timer
@@ -14,6 +15,39 @@ from anyvlm.config import Settings, get_config
 
 _logger = logging.getLogger(__name__)
 
+JOB_POLL_INTERVAL = 5  # seconds
+
+
+def _wait_for_ingest_job(service_uri: str, job_id: str) -> dict:
+    """Poll an ingestion job until it finishes
+
+    :param service_uri: AnyVLM service root
+    :param job_id: ID of ingestion job
+    :return: final job status
+    :raise click.ClickException: if job status can't be retrieved or the job fails
+    """
+    endpoint = f"{service_uri}/ingest_jobs/{job_id}"
+    while True:
+        try:
+            response = requests.get(endpoint, timeout=60)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            _logger.exception("Unable to retrieve status of ingestion job %s", job_id)
+            raise click.ClickException(str(e)) from e
+        job = response.json()
+        if job["status"] == "failed":
+            _logger.error("Ingestion job %s failed: %s", job_id, job["error"])
+            raise click.ClickException(f"Ingestion failed: {job['error']}")
+        if job["status"] == "succeeded":
+            return job
+        _logger.info(
+            "Ingestion job %s is %s: %s records processed",
+            job_id,
+            job["status"],
+            job["records_processed"],
+        )
+        time.sleep(JOB_POLL_INTERVAL)
+
 
 @click.version_option(anyvlm.__version__)
 @click.group()
@@ -71,12 +105,20 @@ def ingest_vcf(vcf_path: Path, assembly: ReferenceAssembly) -> None:
             _logger.exception("HTTP POST request to AnyVLM '/ingest_vcf' failed")
             raise click.ClickException(str(e)) from e
 
-    if response.status_code != HTTPStatus.OK:
+    if response.status_code != HTTPStatus.ACCEPTED:
         _logger.error("Request failed with status code %s", response.status_code)
         raise click.ClickException(
             f"Request failed with status code: {response.status_code}"
         )
 
+    job_id: str = response.json()["job_id"]
+    _logger.info("Upload accepted as ingestion job %s", job_id)
+    job = _wait_for_ingest_job(config.service_uri, job_id)
+
     end: float = timer()
     duration: float = end - start
-    _logger.info("Ingestion complete in %s", f"{duration:.3f} seconds")
+    _logger.info(
+        "Ingestion of %s records complete in %s",
+        job["records_processed"],
+        f"{duration:.3f} seconds",
+    )
@@ -25,8 +25,35 @@ class Settings(BaseSettings):
     env: ServiceEnvironment = ServiceEnvironment.LOCAL
     service_uri: str = "http://localhost:8080"
     anyvar_uri: str | None = None
+    anyvar_translation_processes: int = 1
+    anyvar_request_timeout: int = 30
+    anyvar_pool_connections: int = 10
+    anyvar_pool_maxsize: int = 10
+    anyvar_pool_block: bool = False
+    anyvar_max_retries: int = 3
+    anyvar_retry_backoff_factor: float = 0.5
+    anyvar_retry_backoff_jitter: float = 0.5
+    anyvar_sub_batch_size: int = 500
+    anyvar_max_concurrent_requests: int = 4
     storage_uri: str = "postgresql://postgres@localhost:5432/anyvlm"
+    storage_batch_window: float = 0.0
+    storage_batch_max_size: int = 100
+    response_cache_uri: str | None = None
+    response_cache_max_entries: int = 10000
+    response_cache_ttl: int | None = 86400
+    variant_counts_cache_control: str | None = None
+    generation_refresh_interval: float = 1.0
+    variant_counts_max_batch_size: int = 1000
     logging_config: FilePath | None = None
+    ingest_batch_size: int = 1000
+    ingest_min_batch_size: int = 100
+    ingest_max_batch_size: int = 10000
+    ingest_target_batch_latency: float = 10.0
+    ingest_max_in_flight_batches: int = 1
+    ingest_max_concurrent_jobs: int = 1
+    ingest_job_retention: float = 86400.0
+    ingest_processes: int = 1
+    ingest_region_size: int | None = None
 
 
 @cache
@@ -0,0 +1,105 @@
+"""Size AnyVar registration batches from observed request latency"""
+
+import logging
+import threading
+
+_logger = logging.getLogger(__name__)
+
+
+class AdaptiveBatchSizer:
+    """Choose the number of variants per AnyVar registration request
+
+    After each successful request, the batch size is scaled toward the size expected
+    to take ``target_latency`` seconds, by at most a factor of ``MAX_STEP`` either way
+    so that one slow or fast request can't swing it too far. After each failed
+    request it is halved. The batch size always stays within ``[min_size, max_size]``.
+
+    Safe to share between the thread generating batches and the threads registering
+    them.
+    """
+
+    MAX_STEP = 2.0
+
+    def __init__(
+        self,
+        initial_size: int,
+        min_size: int,
+        max_size: int,
+        target_latency: float,
+    ) -> None:
+        """Initialize batch sizer
+
+        :param initial_size: batch size to start with. Clamped to the min/max bounds.
+        :param min_size: smallest batch size to use
+        :param max_size: largest batch size to use
+        :param target_latency: desired duration, in seconds, of a registration request
+        :raise ValueError: if bounds aren't positive and ordered, or target latency
+            isn't positive
+        """
+        if not 1 <= min_size <= max_size:
+            msg = f"Invalid batch size bounds: min {min_size}, max {max_size}"
+            raise ValueError(msg)
+        if target_latency <= 0:
+            msg = f"Target latency must be positive, got {target_latency}"
+            raise ValueError(msg)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_latency = target_latency
+        self._batch_size = self._clamp(initial_size)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def fixed(cls, batch_size: int) -> "AdaptiveBatchSizer":
+        """Construct a sizer that always uses the same batch size
+
+        :param batch_size: batch size to use
+        :return: sizer with equal min and max sizes
+        :raise ValueError: if ``batch_size`` isn't positive
+        """
+        return cls(batch_size, batch_size, batch_size, target_latency=1.0)
+
+    @property
+    def batch_size(self) -> int:
+        """Get the size to use for the next batch
+
+        :return: number of variants per batch
+        """
+        return self._batch_size
+
+    def _clamp(self, batch_size: float) -> int:
+        return max(self.min_size, min(self.max_size, round(batch_size)))
+
+    def record_success(self, batch_size: int, latency: float) -> None:
+        """Adjust batch size after a successful registration request
+
+        :param batch_size: size of the batch the request was made for
+        :param latency: duration of the request, in seconds
+        """
+        step = self.target_latency / latency if latency > 0 else self.MAX_STEP
+        step = max(1 / self.MAX_STEP, min(self.MAX_STEP, step))
+        with self._lock:
+            previous = self._batch_size
+            self._batch_size = self._clamp(batch_size * step)
+        if self._batch_size != previous:
+            _logger.debug(
+                "Batch of %s registered in %.2fs; batch size %s -> %s",
+                batch_size,
+                latency,
+                previous,
+                self._batch_size,
+            )
+
+    def record_failure(self, batch_size: int) -> None:
+        """Shrink batch size after a failed registration request
+
+        :param batch_size: size of the batch the request was made for
+        """
+        with self._lock:
+            previous = self._batch_size
+            self._batch_size = self._clamp(min(previous, batch_size) / 2)
+        _logger.info(
+            "Registration of batch of %s failed; batch size %s -> %s",
+            batch_size,
+            previous,
+            self._batch_size,
+        )
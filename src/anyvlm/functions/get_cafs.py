@@ -1,15 +1,29 @@
 """Perform search against variant(s) contained by an AnyVar node, and construct cohort allele frequency model(s)"""
 
+import asyncio
 import logging
+from collections import defaultdict
+from collections.abc import Sequence
 
+import anyio
+from anyvar.mapping.liftover import ReferenceAssembly
 from ga4gh.core.models import iriReference
 from ga4gh.vrs.models import Allele
 
-from anyvlm.anyvar.base_client import BaseAnyVarClient
+from anyvlm.anyvar.base_client import AnyVarClientError, BaseAnyVarClient
+from anyvlm.schemas.vlm import VariantCountsQuery
 from anyvlm.storage.base_storage import Storage
+from anyvlm.storage.batching import BatchedStorageReader
+from anyvlm.utils.exceptions import (
+    IncompleteVariantError,
+    LiftoverError,
+    UnexpectedVariantTypeError,
+    VariantLookupError,
+)
 from anyvlm.utils.functions import validate_allele
 from anyvlm.utils.types import (
     ASSEMBLY_MAP,
+    AlleleCoordinates,
     AnyVlmCohortAlleleFrequencyResult,
     ChromosomeName,
     GrcAssemblyId,
@@ -20,19 +34,15 @@ from anyvlm.utils.types import (
 _logger = logging.getLogger(__name__)
 
 
-def _retrieve_cafs_with_resolved_alleles(
-    variation: Allele, anyvlm_storage: Storage
+def _resolve_focus_alleles(
+    cafs: list[AnyVlmCohortAlleleFrequencyResult], variation: Allele
 ) -> list[AnyVlmCohortAlleleFrequencyResult]:
-    """Retrieve CAF data for a resolved allele.
+    """Replace focus allele references in CAF data with the full allele.
 
-    :param variation: The allele to retrieve CAF data for
-    :param anyvlm_storage: The storage for this AnyVLM instance
-    :return: A list of AnyVlmCohortAlleleFrequencyResult objects
+    :param cafs: CAF data for ``variation``, as retrieved from storage
+    :param variation: The allele the CAF data describes
+    :return: ``cafs``, updated in place
     """
-    cafs: list[AnyVlmCohortAlleleFrequencyResult] = (
-        anyvlm_storage.get_cafs_by_vrs_allele_id(vrs_allele_id=variation.id)  # pyright: ignore[reportArgumentType]
-    )
-
     for caf in cafs:
         if isinstance(caf.focusAllele, iriReference):
             caf.focusAllele = variation
@@ -40,6 +50,111 @@ def _retrieve_cafs_with_resolved_alleles(
     return cafs
 
 
+async def _retrieve_allele_async(
+    anyvar_client: BaseAnyVarClient, vrs_id: str
+) -> Allele:
+    """Dereference a VRS Allele ID in AnyVar
+
+    :param anyvar_client: AnyVar client (allele lookup)
+    :param vrs_id: VRS ID of the allele to retrieve
+    :raises VariantLookupError: if the allele can't be retrieved
+    :return: The full VRS Allele
+    """
+    return validate_allele(
+        allele=await anyvar_client.retrieve_allele_by_id_async(vrs_id=vrs_id)
+    )
+
+
+async def _add_unlinked_liftover_cafs_async(
+    anyvar_client: BaseAnyVarClient,
+    anyvlm_storage: Storage | BatchedStorageReader,
+    indexed: dict[str, list[AnyVlmCohortAlleleFrequencyResult]],
+    assembly: ReferenceAssembly,
+) -> dict[str, list[AnyVlmCohortAlleleFrequencyResult]]:
+    """Complete CAF data found by allele coordinates with the CAF data of lifted-over
+    equivalents that weren't linked at ingest
+
+    Coordinate lookups only include CAFs for lifted-over equivalents linked in storage.
+    Alleles are left unlinked if AnyVar lookups fail during ingest, so for those, the
+    liftover is looked up in AnyVar instead. If that lookup fails, the CAF data found
+    locally is still returned, without the liftover's.
+
+    :param anyvar_client: AnyVar client (liftover lookup)
+    :param anyvlm_storage: AnyVLM Storage (CAF storage and retrieval), or a reader
+        that batches its reads with other queries
+    :param indexed: mapping of variant expressions to the non-empty CAF data found by
+        their coordinates
+    :param assembly: reference assembly the variants are on
+    :return: mapping of each expression in ``indexed`` to its complete CAF data
+    """
+    vrs_ids: dict[str, str] = {
+        expression: cafs[0].focusAllele.root  # type: ignore
+        for expression, cafs in indexed.items()
+    }
+    linked = await anyvlm_storage.get_liftover_ids_async(vrs_ids.values())
+    unlinked = {
+        expression: vrs_id
+        for expression, vrs_id in vrs_ids.items()
+        if vrs_id not in linked
+    }
+    results = dict(indexed)
+    if not unlinked:
+        return results
+    _logger.debug("%s indexed variants have no liftover link", len(unlinked))
+
+    try:
+        liftover_ids = await anyvar_client.get_liftover_variation_ids_async(
+            unlinked.values(), assembly
+        )
+    except (AnyVarClientError, LiftoverError):
+        _logger.warning(
+            "Liftover lookup failed for %s unlinked indexed variants; returning their "
+            "CAF data without liftovers",
+            len(unlinked),
+            exc_info=True,
+        )
+        return results
+    lifted = {
+        expression: liftover_id
+        for expression, liftover_id in zip(unlinked, liftover_ids, strict=True)
+        if liftover_id
+    }
+    if lifted:
+        cafs_by_id = await anyvlm_storage.get_cafs_by_vrs_allele_ids_async(
+            lifted.values()
+        )
+        for expression, liftover_id in lifted.items():
+            # the queried allele's CAFs come first
+            results[expression] = indexed[expression] + cafs_by_id[liftover_id]
+    return results
+
+
+def _get_query_expression(
+    assembly_id: GrcAssemblyId | UcscAssemblyBuild,
+    reference_name: ChromosomeName,
+    start: int,
+    reference_base: Nucleotide,
+    alternate_base: Nucleotide,
+) -> tuple[str, ReferenceAssembly]:
+    """Build the allele expression to look up for a variant query
+
+    :param assembly_id: The reference assembly to utilize
+    :param reference_name: The chromosome to search on, with an optional "chr" prefix
+    :param start: start of range search. Uses residue coordinates (1-based)
+    :param reference_base: Single genomic base (A/G/C/T)
+    :param alternate_base: Single genomic base (A/G/C/T)
+    :raises ValueError: if unsupported assembly ID is provided
+    :return: gnomAD-style VCF expression, and the assembly it's on
+    """
+    gnomad_vcf: str = f"{reference_name}-{start}-{reference_base}-{alternate_base}"
+    try:
+        assembly = ASSEMBLY_MAP[assembly_id]
+    except KeyError as e:
+        msg = "Unsupported assembly ID: {assembly_id}"
+        raise ValueError(msg) from e
+    return gnomad_vcf, assembly
+
+
 def get_cafs(
     anyvar_client: BaseAnyVarClient,
     anyvlm_storage: Storage,
@@ -48,10 +163,14 @@ def get_cafs(
     start: int,
     reference_base: Nucleotide,
     alternate_base: Nucleotide,
+    resolve_focus_alleles: bool = True,
 ) -> list[AnyVlmCohortAlleleFrequencyResult]:
     """Retrieve Cohort Allele Frequency data for all known registered variants matching
     provided search params
 
+    Runs :py:func:`get_cafs_async` on a new event loop, so must not be called from
+    async code.
+
     :param anyvar_client: AnyVar client (variant lookup)
     :param anyvlm_storage: AnyVLM Storage (CAF storage and retrieval)
     :param assembly_id: The reference assembly to utilize
@@ -60,43 +179,242 @@ def get_cafs(
     :param start: start of range search. Uses residue coordinates (1-based)
     :param reference_bases: Single genomic base (A/G/C/T)
     :param alternate_bases: Single genomic base (A/G/C/T)
+    :param resolve_focus_alleles: whether to give each result its full VRS Allele as
+        ``focusAllele``. If ``False``, focus alleles are left as references to VRS
+        IDs, which saves dereferencing the lifted-over allele in AnyVar.
     :raises ValueError: if unsupported assembly ID is provided
     :raises VariantLookupError: if variant is not registered in AnyVar
     :return: list of AnyVlmCohortAlleleFrequencyResult objects for the provided variant
     """
-    gnomad_vcf: str = f"{reference_name}-{start}-{reference_base}-{alternate_base}"
-    try:
-        assembly = ASSEMBLY_MAP[assembly_id]
-    except KeyError as e:
-        msg = "Unsupported assembly ID: {assembly_id}"
-        raise ValueError(msg) from e
+    return anyio.run(
+        get_cafs_async,
+        anyvar_client,
+        anyvlm_storage,
+        assembly_id,
+        reference_name,
+        start,
+        reference_base,
+        alternate_base,
+        resolve_focus_alleles,
+    )
 
-    vrs_variation: Allele = validate_allele(
-        allele=anyvar_client.retrieve_allele_by_expression(gnomad_vcf, assembly)
+
+async def get_cafs_async(
+    anyvar_client: BaseAnyVarClient,
+    anyvlm_storage: Storage | BatchedStorageReader,
+    assembly_id: GrcAssemblyId | UcscAssemblyBuild,
+    reference_name: ChromosomeName,
+    start: int,
+    reference_base: Nucleotide,
+    alternate_base: Nucleotide,
+    resolve_focus_alleles: bool = True,
+) -> list[AnyVlmCohortAlleleFrequencyResult]:
+    """Retrieve Cohort Allele Frequency data for all known registered variants matching
+    provided search params, without blocking the event loop
+
+    AnyVar lookups use the client's async methods, so an HTTP-based client makes them
+    directly on the event loop. If focus alleles aren't resolved, the queried allele is
+    first looked up by its coordinates in storage, along with the liftover equivalent
+    linked to it at ingest, so that ingested alleles need no AnyVar lookups at all
+    (unless linking failed at ingest, in which case the liftover is looked up in
+    AnyVar).
+    Otherwise, once the queried allele and its liftover are resolved in AnyVar, the
+    CAFs for both are retrieved with a single storage query, concurrently with
+    dereferencing the lifted-over allele if focus alleles are resolved.
+
+    :param anyvar_client: AnyVar client (variant lookup)
+    :param anyvlm_storage: AnyVLM Storage (CAF storage and retrieval), or a reader
+        that batches its reads with other queries
+    :param assembly_id: The reference assembly to utilize
+    :param reference_name: The chromosome to search on, with an optional "chr" prefix
+        - e.g., "1", "chr22", "X", "chrY", etc.
+    :param start: start of range search. Uses residue coordinates (1-based)
+    :param reference_bases: Single genomic base (A/G/C/T)
+    :param alternate_bases: Single genomic base (A/G/C/T)
+    :param resolve_focus_alleles: whether to give each result its full VRS Allele as
+        ``focusAllele``. If ``False``, focus alleles are left as references to VRS
+        IDs, which saves dereferencing the lifted-over allele in AnyVar.
+    :raises ValueError: if unsupported assembly ID is provided
+    :raises VariantLookupError: if variant is not registered in AnyVar
+    :return: list of AnyVlmCohortAlleleFrequencyResult objects for the provided variant
+    """
+    gnomad_vcf, assembly = _get_query_expression(
+        assembly_id, reference_name, start, reference_base, alternate_base
     )
 
-    cafs: list[AnyVlmCohortAlleleFrequencyResult] = (
-        _retrieve_cafs_with_resolved_alleles(
-            variation=vrs_variation, anyvlm_storage=anyvlm_storage
+    if not resolve_focus_alleles:
+        cafs = await anyvlm_storage.get_cafs_by_coordinates_async(
+            AlleleCoordinates.from_expression(gnomad_vcf), assembly.value
+        )
+        if cafs:
+            return (
+                await _add_unlinked_liftover_cafs_async(
+                    anyvar_client, anyvlm_storage, {gnomad_vcf: cafs}, assembly
+                )
+            )[gnomad_vcf]
+        _logger.debug("%s not indexed locally; translating in AnyVar", gnomad_vcf)
+
+    vrs_variation: Allele = validate_allele(
+        allele=await anyvar_client.retrieve_allele_by_expression_async(
+            gnomad_vcf, assembly
         )
     )
 
-    liftover_vrs_id: str | None = anyvar_client.get_liftover_variation_id(
-        vrs_id=vrs_variation.id,  # type: ignore
-        starting_assembly=assembly,
+    vrs_id: str = vrs_variation.id  # type: ignore
+    liftover_vrs_id: str | None = await anyvar_client.get_liftover_variation_id_async(
+        vrs_id=vrs_id, starting_assembly=assembly
     )
+    vrs_ids = [vrs_id, liftover_vrs_id] if liftover_vrs_id else [vrs_id]
+    if resolve_focus_alleles and liftover_vrs_id:
+        # the lifted-over allele's CAFs don't depend on dereferencing it, so fetch both
+        # at once
+        cafs_by_id, liftover_variation = await asyncio.gather(
+            anyvlm_storage.get_cafs_by_vrs_allele_ids_async(vrs_ids),
+            _retrieve_allele_async(anyvar_client, liftover_vrs_id),
+        )
+        _resolve_focus_alleles(cafs_by_id[liftover_vrs_id], liftover_variation)
+    else:
+        cafs_by_id = await anyvlm_storage.get_cafs_by_vrs_allele_ids_async(vrs_ids)
+    if resolve_focus_alleles:
+        _resolve_focus_alleles(cafs_by_id[vrs_id], vrs_variation)
+    # the queried allele's CAFs come first
+    return [caf for allele_id in vrs_ids for caf in cafs_by_id[allele_id]]
+
+
+async def _get_cafs_on_assembly_async(
+    anyvar_client: BaseAnyVarClient,
+    anyvlm_storage: Storage,
+    expressions: list[str],
+    assembly: ReferenceAssembly,
+) -> dict[str, list[AnyVlmCohortAlleleFrequencyResult] | Exception]:
+    """Retrieve CAF data for many distinct variants on one assembly, with bulk lookups
 
-    if liftover_vrs_id:
-        liftover_variation: Allele = validate_allele(
-            allele=anyvar_client.retrieve_allele_by_id(vrs_id=liftover_vrs_id)
+    :param anyvar_client: AnyVar client (variant lookup)
+    :param anyvlm_storage: AnyVLM Storage (CAF storage and retrieval)
+    :param expressions: distinct gnomAD-style VCF expressions of the variants
+    :param assembly: reference assembly the variants are on
+    :return: mapping of each expression to its CAF data, or to the exception that
+        prevented retrieving it
+    """
+    coordinates = [
+        AlleleCoordinates.from_expression(expression) for expression in expressions
+    ]
+    indexed = await anyvlm_storage.get_cafs_by_many_coordinates_async(
+        coordinates, assembly.value
+    )
+    hits: dict[str, list[AnyVlmCohortAlleleFrequencyResult]] = {}
+    unindexed: list[str] = []
+    for expression, allele_coordinates in zip(expressions, coordinates, strict=True):
+        if indexed[allele_coordinates]:
+            hits[expression] = indexed[allele_coordinates]
+        else:
+            unindexed.append(expression)
+    results: dict[str, list[AnyVlmCohortAlleleFrequencyResult] | Exception] = dict(
+        await _add_unlinked_liftover_cafs_async(
+            anyvar_client, anyvlm_storage, hits, assembly
         )
+        if hits
+        else {}
+    )
+    if not unindexed:
+        return results
+    _logger.debug("%s queried variants not indexed locally", len(unindexed))
 
-        liftover_cafs: list[AnyVlmCohortAlleleFrequencyResult] = (
-            _retrieve_cafs_with_resolved_alleles(
-                variation=liftover_variation, anyvlm_storage=anyvlm_storage
-            )
+    try:
+        alleles = await anyvar_client.retrieve_alleles_by_expression_async(
+            unindexed, assembly
         )
+    except AnyVarClientError as e:
+        return results | dict.fromkeys(unindexed, e)
+    vrs_ids: dict[str, str] = {}
+    for expression, allele in zip(unindexed, alleles, strict=True):
+        try:
+            vrs_ids[expression] = validate_allele(allele).id  # type: ignore
+        except VariantLookupError:
+            # unregistered variants have no results, as for single queries
+            results[expression] = []
+        except (IncompleteVariantError, UnexpectedVariantTypeError) as e:
+            results[expression] = e
+    if not vrs_ids:
+        return results
 
-        cafs.extend(liftover_cafs)
+    try:
+        liftover_ids = await anyvar_client.get_liftover_variation_ids_async(
+            vrs_ids.values(), assembly
+        )
+    except (AnyVarClientError, LiftoverError) as e:
+        return results | dict.fromkeys(vrs_ids, e)
+    allele_ids = {
+        expression: [vrs_id, liftover_id] if liftover_id else [vrs_id]
+        for (expression, vrs_id), liftover_id in zip(
+            vrs_ids.items(), liftover_ids, strict=True
+        )
+    }
+    cafs_by_id = await anyvlm_storage.get_cafs_by_vrs_allele_ids_async(
+        allele_id for ids in allele_ids.values() for allele_id in ids
+    )
+    for expression, ids in allele_ids.items():
+        # the queried allele's CAFs come first
+        results[expression] = [
+            caf for allele_id in ids for caf in cafs_by_id[allele_id]
+        ]
+    return results
 
-    return cafs
+
+async def get_cafs_batch_async(
+    anyvar_client: BaseAnyVarClient,
+    anyvlm_storage: Storage,
+    queries: Sequence[VariantCountsQuery],
+) -> list[list[AnyVlmCohortAlleleFrequencyResult] | Exception]:
+    """Retrieve Cohort Allele Frequency data for many variant queries at once, without
+    blocking the event loop
+
+    Rather than looking up each query in turn, queries are grouped by assembly. All
+    queried alleles on an assembly are looked up by their coordinates in one storage
+    query. Those that weren't ingested are then resolved and lifted over in AnyVar
+    with bulk client calls, and their CAFs retrieved with one more storage query.
+    Ingested alleles that weren't linked to their liftover at ingest are lifted over
+    in AnyVar too. Focus alleles are left as references to VRS IDs.
+
+    A failure to look up some variants doesn't fail the others, so the result for
+    each query is either its CAF data or the exception that prevented retrieving it:
+    an :py:class:`AnyVarClientError` (e.g. if AnyVar is unreachable),
+    :py:class:`LiftoverError`, :py:class:`IncompleteVariantError`, or
+    :py:class:`UnexpectedVariantTypeError`. Variants that aren't registered in AnyVar
+    have empty results, as with :py:func:`get_cafs_async`.
+
+    :param anyvar_client: AnyVar client (variant lookup)
+    :param anyvlm_storage: AnyVLM Storage (CAF storage and retrieval)
+    :param queries: variant queries to answer
+    :return: list where the i'th item is the CAF data for the i'th query, or the
+        exception that prevented retrieving it
+    """
+    query_expressions = [
+        _get_query_expression(
+            query.assemblyId,
+            query.referenceName,
+            query.start,
+            query.referenceBases,
+            query.alternateBases,
+        )
+        for query in queries
+    ]
+    by_assembly: defaultdict[ReferenceAssembly, list[str]] = defaultdict(list)
+    for expression, assembly in dict.fromkeys(query_expressions):
+        by_assembly[assembly].append(expression)
+
+    results = await asyncio.gather(
+        *(
+            _get_cafs_on_assembly_async(
+                anyvar_client, anyvlm_storage, expressions, assembly
+            )
+            for assembly, expressions in by_assembly.items()
+        )
+    )
+    results_by_assembly = dict(zip(by_assembly, results, strict=True))
+    batch_results: list[list[AnyVlmCohortAlleleFrequencyResult] | Exception] = []
+    for expression, assembly in query_expressions:
+        result = results_by_assembly[assembly][expression]
+        # repeated queries mustn't share a list
+        batch_results.append(result if isinstance(result, Exception) else list(result))
+    return batch_results
@@ -0,0 +1,185 @@
+"""Run VCF ingestion as background jobs and track their progress"""
+
+import logging
+import threading
+import uuid
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from enum import StrEnum
+
+from anyvlm.functions.ingest_vcf import IngestStats
+
+_logger = logging.getLogger(__name__)
+
+
+class IngestJobStatus(StrEnum):
+    """Define lifecycle states of an ingestion job"""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class IngestJob:
+    """Describe a single submitted ingestion job"""
+
+    job_id: str
+    filename: str
+    status: IngestJobStatus = IngestJobStatus.PENDING
+    stats: IngestStats = field(default_factory=IngestStats)
+    submitted_at: datetime = field(default_factory=lambda: datetime.now(tz=UTC))
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    error: str | None = None
+
+    @property
+    def records_per_second(self) -> float | None:
+        """Compute average ingestion throughput since the job started
+
+        :return: records processed per second, or ``None`` if the job hasn't started
+        """
+        if self.started_at is None:
+            return None
+        end = self.finished_at or datetime.now(tz=UTC)
+        elapsed = (end - self.started_at).total_seconds()
+        if elapsed <= 0:
+            return None
+        return self.stats.records_processed / elapsed
+
+
+class IngestJobManager:
+    """Run ingestion jobs on a dedicated executor, off of the server event loop
+
+    Job state is held in memory, so it is only visible to the server process that
+    accepted the job. Finished jobs are forgotten once ``retention`` seconds have
+    passed since they finished.
+    """
+
+    def __init__(self, max_concurrent_jobs: int = 1, retention: float = 86400) -> None:
+        """Initialize job manager
+
+        :param max_concurrent_jobs: maximum number of ingestion jobs to run at once.
+            Additional jobs wait in a queue.
+        :param retention: seconds to keep reporting a job after it finishes
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_jobs, thread_name_prefix="anyvlm-ingest-job"
+        )
+        self.retention = timedelta(seconds=retention)
+        self._jobs: dict[str, IngestJob] = {}
+        self._futures: dict[str, Future] = {}
+        self._cleanups: dict[str, Callable[[], None]] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        run: Callable[[IngestStats], object],
+        filename: str,
+        cleanup: Callable[[], None] | None = None,
+    ) -> IngestJob:
+        """Queue a new ingestion job
+
+        :param run: callable that performs ingestion, updating the provided stats
+            object as it goes
+        :param filename: name of the file being ingested, for reporting
+        :param cleanup: callable to run after the job finishes, whether or not it
+            succeeds (e.g. to remove temporary files)
+        :return: the newly created job
+        """
+        job = IngestJob(job_id=str(uuid.uuid4()), filename=filename)
+
+        def _run_job() -> None:
+            job.started_at = datetime.now(tz=UTC)
+            job.status = IngestJobStatus.RUNNING
+            _logger.info("Starting ingestion job %s for %s", job.job_id, filename)
+            try:
+                run(job.stats)
+            except Exception as e:
+                _logger.exception("Ingestion job %s failed", job.job_id)
+                job.error = str(e)
+                job.status = IngestJobStatus.FAILED
+            else:
+                _logger.info(
+                    "Ingestion job %s finished: %s records processed",
+                    job.job_id,
+                    job.stats.records_processed,
+                )
+                job.status = IngestJobStatus.SUCCEEDED
+            finally:
+                job.finished_at = datetime.now(tz=UTC)
+                if cleanup:
+                    cleanup()
+                    with self._lock:
+                        self._cleanups.pop(job.job_id, None)
+
+        with self._lock:
+            self._prune()
+            self._jobs[job.job_id] = job
+            if cleanup:
+                self._cleanups[job.job_id] = cleanup
+            self._futures[job.job_id] = self._executor.submit(_run_job)
+        return job
+
+    def get(self, job_id: str) -> IngestJob | None:
+        """Retrieve a job by ID
+
+        :param job_id: ID returned on submission
+        :return: the job, or ``None`` if no job with that ID is known (e.g. because
+            it finished longer than the retention period ago)
+        """
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def _prune(self) -> None:
+        """Forget jobs that finished longer than the retention period ago
+
+        Must be called with the lock held.
+        """
+        cutoff = datetime.now(tz=UTC) - self.retention
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+            self._futures.pop(job_id, None)
+            self._cleanups.pop(job_id, None)
+
+    def wait(self, job_id: str, timeout: float | None = None) -> IngestJob:
+        """Block until a job is finished
+
+        :param job_id: ID returned on submission
+        :param timeout: maximum number of seconds to wait
+        :return: the job, which may still be running if ``timeout`` elapsed
+        :raise KeyError: if no job with that ID is known
+        """
+        # other threads submit and prune jobs, but mustn't be blocked while this waits
+        with self._lock:
+            future = self._futures[job_id]
+            job = self._jobs[job_id]
+        wait_futures([future], timeout=timeout)
+        return job
+
+    def shutdown(self) -> None:
+        """Cancel queued jobs and wait for running jobs to finish
+
+        Blocks until running jobs finish, so call it from a worker thread in async
+        code.
+        """
+        _logger.info("Shutting down ingestion job manager")
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for job_id, future in self._futures.items():
+            if future.cancelled():
+                job = self._jobs[job_id]
+                job.status = IngestJobStatus.FAILED
+                job.error = "Job cancelled at server shutdown"
+                cleanup = self._cleanups.get(job_id)
+                if cleanup:
+                    cleanup()
@@ -1,93 +1,584 @@
 """Get a VCF, register its contained variants, and add cohort frequency data to storage"""
 
+import hashlib
 import logging
-from collections import namedtuple
-from collections.abc import Iterator
+import multiprocessing
+import queue
+import tempfile
+import threading
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from dataclasses import dataclass
+from itertools import compress
 from pathlib import Path
 
 import pysam
 from anyvar.mapping.liftover import ReferenceAssembly
-from ga4gh.core.models import iriReference
-from ga4gh.va_spec.base import StudyGroup
 
-from anyvlm.anyvar.base_client import BaseAnyVarClient
+from anyvlm.anyvar.base_client import AnyVarClientError, BaseAnyVarClient
+from anyvlm.config import get_config
+from anyvlm.functions.batch_sizing import AdaptiveBatchSizer
 from anyvlm.storage.base_storage import Storage
-from anyvlm.utils.types import (
-    AncillaryResults,
-    AnyVlmCohortAlleleFrequencyResult,
-    QualityMeasures,
-)
+from anyvlm.utils.exceptions import LiftoverError
+from anyvlm.utils.types import AfBatch, AlleleCoordinates
 
 _logger = logging.getLogger(__name__)
 
 
-AfData = namedtuple("AfData", ("ac", "an", "ac_het", "ac_hom", "ac_hemi", "filters"))
+# (contig, 0-based start, 0-based exclusive end); ``None`` bounds are open-ended
+Region = tuple[str, int, int | None]
+
+
+# Name of the cohort that ingested allele frequencies are attributed to
+COHORT_NAME = "rare disease"
 
 
 class VcfAfColumnsError(Exception):
     """Raise for missing VCF INFO columns that are required for AF ingestion"""
 
 
+@dataclass
+class IngestStats:
+    """Track progress of a single VCF ingestion
+
+    Updated in place as batches are committed to storage, so it can be read from
+    another thread while ingestion is still running. ``records_resumed`` counts
+    records skipped because a previous attempt at ingesting the same file had already
+    committed them. ``batch_size`` is the registration batch size most recently
+    chosen by the batch sizer.
+
+    Stage timings are cumulative seconds spent parsing the VCF, resolving VRS IDs
+    (including lookups of previously registered expressions and liftover links), and
+    writing to storage.
+    Stages run concurrently, so they can add up to more than the elapsed time.
+    """
+
+    records_processed: int = 0
+    records_resumed: int = 0
+    batch_size: int | None = None
+    parse_seconds: float = 0.0
+    register_seconds: float = 0.0
+    store_seconds: float = 0.0
+
+    def add(self, other: "IngestStats") -> None:
+        """Fold the progress of another ingestion (e.g. of one region) into this one
+
+        :param other: progress to add
+        """
+        self.records_processed += other.records_processed
+        self.records_resumed += other.records_resumed
+        self.batch_size = other.batch_size
+        self.parse_seconds += other.parse_seconds
+        self.register_seconds += other.register_seconds
+        self.store_seconds += other.store_seconds
+
+
 def _yield_expression_af_batches(
-    vcf: pysam.VariantFile, batch_size: int = 1000
-) -> Iterator[list[tuple[str, AfData]]]:
-    """Generate batches of tuples of (variant expression, allele frequency data).
+    vcf: Iterable[pysam.VariantRecord],
+    batch_size: int | AdaptiveBatchSizer = 1000,
+    skip: int = 0,
+) -> Iterator[AfBatch]:
+    """Generate batches of variant expressions and allele frequency data.
 
     Operates lazily so only one batch is in memory at a time. If a VCF record has
-    multiple alternate alleles, each is returned as a separate item.
+    multiple alternate alleles, each is a separate item in the batch. INFO fields are
+    read once per record, not once per alternate allele.
 
-    :param vcf: VCF to pull variants from
-    :param batch_size: size of return batches
-    :return: iterator of lists of pairs of variant expressions and AF data instances
+    :param vcf: VCF (or iterator over a region of a VCF) to pull variants from
+    :param batch_size: size of return batches, or a sizer to consult for the size of
+        each batch as it's started
+    :param skip: number of leading items to discard, e.g. because they were committed
+        by an earlier ingestion attempt
+    :return: iterator of column-wise batches of expressions and AF data
     """
-    batch = []
+    if isinstance(batch_size, int):
+        batch_size = AdaptiveBatchSizer.fixed(batch_size)
+    batch = AfBatch()
+    target_size = batch_size.batch_size
 
     for record in vcf:
-        for i, alt in enumerate(record.alts or []):
-            if record.ref is None or "*" in record.ref or "*" in alt:
+        alts = record.alts
+        if not alts:
+            continue
+        ref = record.ref
+        if ref is None or "*" in ref:
+            _logger.info("Skipping missing allele at %s", record)
+            continue
+        info = record.info
+        try:
+            ac = info["AC"]
+            an = info["AN"]
+            ac_het = info["AC_Het"]
+            ac_hom = info["AC_Hom"]
+            ac_hemi = info["AC_Hemi"]
+        except KeyError as e:
+            msg = f"One or more required INFO column is missing: {'AC' in info}, {'AN' in info}, {'AC_Het' in info}, {'AC_Hom' in info}, {'AC_Hemi' in info}"
+            _logger.exception(msg)
+            raise VcfAfColumnsError(msg) from e
+        if an == 0:
+            _logger.debug(
+                "Encountered AN=0 in VCF at %s-%s-%s; this will be skipped during ingest.",
+                record.chrom,
+                record.pos,
+                ref,
+            )
+        filters = list(record.filter.keys())
+        prefix = f"{record.chrom}-{record.pos}-{ref}-"
+
+        for i, alt in enumerate(alts):
+            if "*" in alt:
                 _logger.info("Skipping missing allele at %s", record)
                 continue
-            expression = f"{record.chrom}-{record.pos}-{record.ref}-{alt}"
-            try:
-                af = AfData(
-                    ac=record.info["AC"][i],
-                    an=record.info["AN"],
-                    ac_het=record.info["AC_Het"][i],
-                    ac_hom=record.info["AC_Hom"][i],
-                    ac_hemi=record.info["AC_Hemi"][i],
-                    filters=record.filter.keys(),
-                )
-            except KeyError as e:
-                info = record.info
-                msg = f"One or more required INFO column is missing: {'AC' in info}, {'AN' in info}, {'AC_Het' in info}, {'AC_Hom' in info}, {'AC_Hemi' in info}"
-                _logger.exception(msg)
-                raise VcfAfColumnsError(msg) from e
-            if af.an == 0:
-                _logger.debug(
-                    "Encountered AN=0 in VCF at %s-%s-%s-%s; this will be skipped during ingest.",
-                    record.chrom,
-                    record.pos,
-                    record.ref,
-                    alt,
-                )
-            batch.append((expression, af))
-            if len(batch) >= batch_size:
+            if skip:
+                skip -= 1
+                continue
+            batch.expressions.append(prefix + alt)
+            batch.ac.append(ac[i])
+            batch.an.append(an)
+            batch.ac_het.append(ac_het[i])
+            batch.ac_hom.append(ac_hom[i])
+            batch.ac_hemi.append(ac_hemi[i])
+            batch.filters.append(filters)
+            if len(batch) >= target_size:
                 _logger.debug("Yielding next batch")
                 yield batch
-                batch = []
+                batch = AfBatch()
+                target_size = batch_size.batch_size
     if batch:
         yield batch
     _logger.debug("Expression/AF generator exhausted")
 
 
+def _time_batches(batches: Iterator[AfBatch], stats: IngestStats) -> Iterator[AfBatch]:
+    """Record time spent producing each batch as parse time
+
+    :param batches: source iterator of batches
+    :param stats: progress tracker to add parse time to
+    :return: iterator yielding the same batches
+    """
+    while True:
+        start = time.perf_counter()
+        batch = next(batches, None)
+        stats.parse_seconds += time.perf_counter() - start
+        if batch is None:
+            return
+        yield batch
+
+
+def _prefetch_batches(
+    batches: Iterator[AfBatch], max_queued_batches: int
+) -> Iterator[AfBatch]:
+    """Read batches from ``batches`` on a background thread.
+
+    Parsing runs ahead of the consumer by at most ``max_queued_batches`` batches, so
+    VCF decoding overlaps with registration and storage without reading the whole
+    file into memory. Exceptions raised while parsing are re-raised in the consuming
+    thread at the point in the stream where they occurred.
+
+    :param batches: source iterator of batches (e.g. from ``_yield_expression_af_batches``)
+    :param max_queued_batches: maximum number of parsed batches held in the queue
+    :return: iterator yielding the same batches, in the same order
+    """
+    done = object()
+    batch_queue: queue.Queue = queue.Queue(maxsize=max_queued_batches)
+    stop = threading.Event()
+
+    def _put(item: object) -> None:
+        while not stop.is_set():
+            try:
+                batch_queue.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            return
+
+    def _produce() -> None:
+        try:
+            for batch in batches:
+                if stop.is_set():
+                    return
+                _put(batch)
+        except Exception as e:  # noqa: BLE001 (re-raised by consumer)
+            _put(e)
+        _put(done)
+
+    producer = threading.Thread(target=_produce, name="anyvlm-vcf-parser", daemon=True)
+    producer.start()
+    try:
+        while (item := batch_queue.get()) is not done:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+def _put_allele_expressions(
+    av: BaseAnyVarClient,
+    expressions: list[str],
+    assembly: ReferenceAssembly,
+    batch_sizer: AdaptiveBatchSizer,
+) -> list[str | None]:
+    """Register expressions with AnyVar, reporting latency to the batch sizer
+
+    The number of expressions sent is reported to the sizer, so that latency is
+    related to the amount of work AnyVar was actually given.
+
+    If the request fails, the expressions are split in half and each half retried,
+    until the halves would be smaller than the sizer's minimum batch size.
+
+    :param av: AnyVar client
+    :param expressions: variant expressions to register
+    :param assembly: reference assembly used by expressions
+    :param batch_sizer: sizer to report request outcomes to
+    :return: VRS IDs for each expression, or ``None`` where registration failed
+    :raise AnyVarClientError: if registration fails and can't be split any further
+    """
+    start = time.perf_counter()
+    try:
+        vrs_ids = list(av.put_allele_expressions(expressions, assembly))
+    except AnyVarClientError:
+        batch_sizer.record_failure(len(expressions))
+        half = len(expressions) // 2
+        if half < batch_sizer.min_size:
+            raise
+        _logger.warning(
+            "Registration of %s expressions failed; retrying in two halves",
+            len(expressions),
+        )
+        return _put_allele_expressions(
+            av, expressions[:half], assembly, batch_sizer
+        ) + _put_allele_expressions(av, expressions[half:], assembly, batch_sizer)
+    batch_sizer.record_success(len(expressions), time.perf_counter() - start)
+    return vrs_ids
+
+
+def _register_batch(
+    av: BaseAnyVarClient,
+    storage: Storage,
+    expressions: list[str],
+    assembly: ReferenceAssembly,
+    batch_sizer: AdaptiveBatchSizer | None = None,
+) -> list[str | None]:
+    """Resolve VRS IDs for a batch of variant expressions, registering only new ones
+
+    Expressions are deduplicated and checked against the expressions already
+    registered by earlier ingests, so AnyVar only receives expressions it hasn't seen.
+
+    :param av: AnyVar client
+    :param storage: AnyVLM storage instance
+    :param expressions: variant expressions, in batch order
+    :param assembly: reference assembly used by expressions
+    :param batch_sizer: sizer to report registration latency and failures to. Only
+        requests that are actually made are reported, sized by the number of
+        expressions sent to AnyVar. If not given, the batch is registered in one
+        request and never split.
+    :return: VRS IDs for each expression in ``expressions``, or ``None`` where
+        registration failed
+    """
+    if batch_sizer is None:
+        batch_sizer = AdaptiveBatchSizer.fixed(len(expressions))
+    unique_expressions = list(dict.fromkeys(expressions))
+    vrs_ids: dict[str, str | None] = dict(
+        storage.get_vrs_ids_by_expressions(unique_expressions, assembly.value)
+    )
+    misses = [
+        expression for expression in unique_expressions if expression not in vrs_ids
+    ]
+    _logger.debug(
+        "%s of %s expressions in batch already registered",
+        len(unique_expressions) - len(misses),
+        len(expressions),
+    )
+    if misses:
+        registered = dict(
+            zip(
+                misses,
+                _put_allele_expressions(av, misses, assembly, batch_sizer),
+                strict=True,
+            )
+        )
+        storage.add_expression_vrs_ids(
+            {
+                expression: vrs_id
+                for expression, vrs_id in registered.items()
+                if vrs_id is not None
+            },
+            assembly.value,
+        )
+        vrs_ids.update(registered)
+    return [vrs_ids[expression] for expression in expressions]
+
+
+def _link_liftovers(
+    av: BaseAnyVarClient,
+    storage: Storage,
+    vrs_ids: Iterable[str],
+    assembly: ReferenceAssembly,
+) -> None:
+    """Record the lifted-over equivalents of alleles that haven't been linked yet
+
+    Liftover mappings don't change once registered, so resolving them here saves
+    variant queries a liftover lookup in AnyVar. If AnyVar lookups fail, the alleles
+    are left unlinked, and will be retried the next time they're ingested.
+
+    :param av: AnyVar client
+    :param storage: AnyVLM storage instance
+    :param vrs_ids: VRS IDs of registered alleles
+    :param assembly: reference assembly the alleles are on
+    """
+    unique_ids = list(dict.fromkeys(vrs_ids))
+    linked = storage.get_liftover_ids(unique_ids)
+    misses = [vrs_id for vrs_id in unique_ids if vrs_id not in linked]
+    if not misses:
+        return
+    try:
+        liftover_ids = av.get_liftover_variation_ids(misses, assembly)
+    except (AnyVarClientError, LiftoverError):
+        _logger.warning(
+            "Liftover lookup failed for batch of %s alleles; leaving them unlinked",
+            len(misses),
+            exc_info=True,
+        )
+        return
+    storage.add_liftover_ids(dict(zip(misses, liftover_ids, strict=True)))
+
+
+def _timed_register_batch(
+    av: BaseAnyVarClient,
+    storage: Storage,
+    batch: AfBatch,
+    assembly: ReferenceAssembly,
+    batch_sizer: AdaptiveBatchSizer,
+) -> tuple[list[str | None], float]:
+    """Resolve VRS IDs for a batch and link the alleles to be stored to their
+    liftover equivalents, timing both
+
+    :param av: AnyVar client
+    :param storage: AnyVLM storage instance
+    :param batch: variant expressions and AF data, as parsed from the VCF
+    :param assembly: reference assembly used by VCF
+    :param batch_sizer: sizer to report registration latency and failures to
+    :return: VRS IDs for each expression, and the seconds taken to resolve them
+    """
+    start = time.perf_counter()
+    vrs_ids = _register_batch(av, storage, batch.expressions, assembly, batch_sizer)
+    _link_liftovers(
+        av,
+        storage,
+        (
+            vrs_id
+            for vrs_id, an in zip(vrs_ids, batch.an, strict=True)
+            if vrs_id is not None and an != 0
+        ),
+        assembly,
+    )
+    return vrs_ids, time.perf_counter() - start
+
+
+def _store_batch(
+    storage: Storage,
+    batch: AfBatch,
+    variant_ids: Sequence[str | None],
+    assembly: ReferenceAssembly,
+) -> int:
+    """Write a registered batch's AF data to storage
+
+    Variants that failed to register, or that have AN=0, are skipped. The coordinates
+    of stored variants are indexed too, so that queries for them can skip AnyVar.
+
+    :param storage: AnyVLM storage instance
+    :param batch: variant expressions and AF data, as parsed from the VCF
+    :param variant_ids: VRS IDs for each expression in ``batch``
+    :param assembly: reference assembly used by VCF
+    :return: number of VCF records (one per alternate allele) processed
+    """
+    keep = [
+        variant_id is not None and an != 0
+        for variant_id, an in zip(variant_ids, batch.an, strict=True)
+    ]
+    kept_ids: list[str] = list(compress(variant_ids, keep))  # type: ignore
+    storage.add_allele_frequency_rows(kept_ids, batch.select(keep), COHORT_NAME)
+    storage.add_allele_coordinates(
+        kept_ids,
+        [
+            AlleleCoordinates.from_expression(expression)
+            for expression in compress(batch.expressions, keep)
+        ],
+        assembly.value,
+    )
+    return len(batch)
+
+
+def _hash_file(path: Path) -> str:
+    """Compute a digest of a file's contents, to identify it across ingestion attempts
+
+    :param path: location of file
+    :return: SHA-256 hex digest
+    """
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _ingest_records(
+    records: Iterable[pysam.VariantRecord],
+    av: BaseAnyVarClient,
+    storage: Storage,
+    assembly: ReferenceAssembly,
+    batch_sizer: AdaptiveBatchSizer,
+    max_in_flight_batches: int,
+    stats: IngestStats,
+    file_hash: str | None = None,
+    region: str = "",
+) -> None:
+    """Run the parse/register/store pipeline over a stream of VCF records
+
+    If ``file_hash`` is given, a checkpoint is saved after every committed batch, and
+    ingestion resumes after the last checkpoint saved by a previous attempt.
+
+    :param records: VCF records to ingest
+    :param av: AnyVar client
+    :param storage: AnyVLM storage instance
+    :param assembly: reference assembly used by VCF
+    :param batch_sizer: chooses the number of variants per AnyVar registration request
+    :param max_in_flight_batches: maximum number of concurrent AnyVar registration requests
+    :param stats: progress tracker to update as batches are committed
+    :param file_hash: digest of the file the records come from, used to key checkpoints
+    :param region: label of the region the records come from, used to key checkpoints
+    :raise VcfAfColumnsError: if VCF is missing required columns
+    """
+    committed = 0
+    if file_hash is not None:
+        committed = storage.get_ingest_checkpoint(file_hash, assembly.value, region)
+        if committed:
+            _logger.info(
+                "Resuming ingestion of %s %s after %s committed records",
+                file_hash,
+                region or "(whole file)",
+                committed,
+            )
+            stats.records_resumed += committed
+
+    def _commit(
+        batch: AfBatch,
+        registration: Future[tuple[list[str | None], float]],
+    ) -> None:
+        nonlocal committed
+        variant_ids, register_seconds = registration.result()
+        stats.register_seconds += register_seconds
+        start = time.perf_counter()
+        count = _store_batch(storage, batch, variant_ids, assembly)
+        committed += count
+        if file_hash is not None:
+            storage.set_ingest_checkpoint(file_hash, assembly.value, region, committed)
+        stats.store_seconds += time.perf_counter() - start
+        stats.records_processed += count
+        stats.batch_size = batch_sizer.batch_size
+
+    batches = _prefetch_batches(
+        _time_batches(
+            _yield_expression_af_batches(records, batch_sizer, skip=committed), stats
+        ),
+        max_in_flight_batches + 1,
+    )
+    in_flight: deque[tuple[AfBatch, Future[tuple[list[str | None], float]]]] = deque()
+    with ThreadPoolExecutor(
+        max_workers=max_in_flight_batches, thread_name_prefix="anyvlm-register"
+    ) as executor:
+        try:
+            for batch in batches:
+                in_flight.append(
+                    (
+                        batch,
+                        executor.submit(
+                            _timed_register_batch,
+                            av,
+                            storage,
+                            batch,
+                            assembly,
+                            batch_sizer,
+                        ),
+                    )
+                )
+                # keep one more batch queued than can register at once, so that
+                # AnyVar stays busy while the oldest batch is being written
+                if len(in_flight) > max_in_flight_batches:
+                    _commit(*in_flight.popleft())
+            while in_flight:
+                _commit(*in_flight.popleft())
+        finally:
+            for _, registration in in_flight:
+                registration.cancel()
+            batches.close()
+
+
+def _resolve_pipeline_settings(
+    batch_size: int | None, max_in_flight_batches: int | None
+) -> tuple[AdaptiveBatchSizer, int]:
+    """Fill in unset pipeline parameters from configuration
+
+    :param batch_size: number of variants per AnyVar registration request. If unset,
+        batches are sized adaptively within the configured bounds.
+    :param max_in_flight_batches: maximum number of concurrent AnyVar registration requests
+    :return: batch sizer and maximum number of in-flight batches
+    :raise ValueError: if batch size settings or number of in-flight batches are invalid
+    """
+    config = get_config()
+    if max_in_flight_batches is None:
+        max_in_flight_batches = config.ingest_max_in_flight_batches
+    if max_in_flight_batches < 1:
+        msg = "Number of in-flight batches must be positive"
+        raise ValueError(msg)
+    if batch_size is not None:
+        if batch_size < 1:
+            msg = "Batch size must be positive"
+            raise ValueError(msg)
+        return AdaptiveBatchSizer.fixed(batch_size), max_in_flight_batches
+    batch_sizer = AdaptiveBatchSizer(
+        config.ingest_batch_size,
+        config.ingest_min_batch_size,
+        config.ingest_max_batch_size,
+        config.ingest_target_batch_latency,
+    )
+    return batch_sizer, max_in_flight_batches
+
+
 def ingest_vcf(
     vcf_path: Path,
     av: BaseAnyVarClient,
     storage: Storage,
     assembly: ReferenceAssembly = ReferenceAssembly.GRCH38,
-) -> None:
+    batch_size: int | None = None,
+    max_in_flight_batches: int | None = None,
+    stats: IngestStats | None = None,
+    resumable: bool = True,
+) -> IngestStats:
     """Extract variant and frequency information from a single VCF
 
+    Ingestion is pipelined: VCF parsing runs on a background thread, up to
+    ``max_in_flight_batches`` batches are registered with AnyVar concurrently, and
+    completed batches are written to storage on the calling thread while later batches
+    are still being parsed and registered. Batches are always written in file order,
+    so the first occurrence of a variant wins on conflict, exactly as if the file
+    were processed serially.
+
+    The VRS ID each expression is registered under is remembered in storage, so
+    variants already registered by an earlier ingest (e.g. of a previous release of
+    the same cohort) are looked up locally instead of being sent to AnyVar again.
+
+    If ``resumable``, progress is checkpointed in storage after every committed batch,
+    keyed by a hash of the file's contents. If ingestion fails partway through, a
+    later call with the same file picks up after the last committed batch rather
+    than registering every variant again. Checkpoints are removed once the file has
+    been fully ingested.
+
     Current assumptions (subject to change):
     * annotations for cohort are provided in 1 file
     * INFO fields are named in conformance with convention used here:
@@ -98,39 +589,298 @@ def ingest_vcf(
       * AC_Hemi (type: A)
 
     :param vcf_path: location of input file
-    :param av: AnyVar client
+    :param av: AnyVar client. Must be safe to call from multiple threads if
+        ``max_in_flight_batches`` is greater than 1.
     :param storage: AnyVLM storage instance
     :param assembly: reference assembly used by VCF
+    :param batch_size: number of variants per AnyVar registration request. If not
+        given, batches are sized adaptively: starting from the
+        ``ANYVLM_INGEST_BATCH_SIZE`` setting, the batch size is adjusted after each
+        request toward ``ANYVLM_INGEST_TARGET_BATCH_LATENCY``, within
+        ``ANYVLM_INGEST_MIN_BATCH_SIZE`` and ``ANYVLM_INGEST_MAX_BATCH_SIZE``. Failed
+        requests are split and retried.
+    :param max_in_flight_batches: maximum number of concurrent AnyVar registration
+        requests. Defaults to the ``ANYVLM_INGEST_MAX_IN_FLIGHT_BATCHES`` setting.
+    :param stats: progress tracker to update as batches are committed. A new one is
+        created if not provided.
+    :param resumable: whether to checkpoint progress and resume from prior checkpoints
+    :return: ingestion progress, as of completion
     :raise VcfAfColumnsError: if VCF is missing required columns
     """
+    batch_sizer, max_in_flight_batches = _resolve_pipeline_settings(
+        batch_size, max_in_flight_batches
+    )
+    if stats is None:
+        stats = IngestStats()
+
     pysam.set_verbosity(0)  # silences warning re: lack of an index for the vcf file
     vcf = pysam.VariantFile(filename=vcf_path.absolute().as_uri(), mode="r")
+    with vcf:
+        file_hash = _hash_file(vcf_path) if resumable else None
+        _ingest_records(
+            vcf,
+            av,
+            storage,
+            assembly,
+            batch_sizer,
+            max_in_flight_batches,
+            stats,
+            file_hash=file_hash,
+        )
+    if file_hash is not None:
+        storage.delete_ingest_checkpoints(file_hash, assembly.value)
+    _logger.info("Ingested %s with final batch size %s", vcf_path, stats.batch_size)
+    return stats
 
-    for batch in _yield_expression_af_batches(vcf):
-        expressions, afs = zip(*batch, strict=True)
-        variant_ids = av.put_allele_expressions(expressions, assembly)
 
-        cafs = []
-        for variant_id, af in zip(variant_ids, afs, strict=True):
-            if variant_id is None:
-                continue
-            try:
-                allele_frequency = af.ac / af.an
-            except ZeroDivisionError:
+def _ensure_index(vcf_path: Path, work_dir: Path) -> tuple[Path, Path | None]:
+    """Make sure a tabix or CSI index is available for a VCF, building one if needed
+
+    An uncompressed VCF can't be indexed, so it's BGZF-compressed into ``work_dir``
+    and that copy is indexed instead.
+
+    :param vcf_path: location of input file
+    :param work_dir: directory to write a compressed copy of the VCF to, if needed
+    :return: location of an indexed VCF with the same records as the input, and the
+        path to an index newly built next to the input, if one was
+    :raise OSError: if the VCF isn't indexed and can't be indexed (e.g. because it's
+        compressed with plain gzip rather than BGZF)
+    """
+    pysam.set_verbosity(0)
+    with pysam.VariantFile(str(vcf_path)) as vcf:
+        if vcf.index is not None:
+            return vcf_path, None
+        compression = vcf.compression
+    if compression == "NONE":
+        compressed_path = work_dir / f"{vcf_path.name}.gz"
+        pysam.tabix_compress(str(vcf_path), str(compressed_path))
+        pysam.tabix_index(str(compressed_path), preset="vcf")
+        return compressed_path, None
+    pysam.tabix_index(str(vcf_path), preset="vcf", keep_original=True, force=True)
+    return vcf_path, Path(f"{vcf_path}.tbi")
+
+
+def _plan_regions(vcf_path: Path, region_size: int | None) -> list[Region]:
+    """Divide an indexed VCF into non-overlapping genomic regions
+
+    :param vcf_path: location of input file, which must be indexed
+    :param region_size: maximum size of each region, in base pairs. If ``None``, or
+        if a contig's length isn't declared in the VCF header, each contig is one region.
+    :return: regions covering every indexed contig
+    """
+    regions: list[Region] = []
+    with pysam.VariantFile(str(vcf_path)) as vcf:
+        for contig in vcf.index:
+            header_contig = vcf.header.contigs.get(contig)
+            length = header_contig.length if header_contig is not None else None
+            if region_size is None or length is None:
+                regions.append((contig, 0, None))
                 continue
-            caf = AnyVlmCohortAlleleFrequencyResult(
-                focusAllele=iriReference(variant_id),
-                focusAlleleCount=af.ac,
-                locusAlleleCount=af.an,
-                focusAlleleFrequency=allele_frequency,
-                qualityMeasures=QualityMeasures(qcFilters=af.filters),
-                ancillaryResults=AncillaryResults(
-                    heterozygotes=af.ac_het,
-                    homozygotes=af.ac_hom,
-                    hemizygotes=af.ac_hemi,
-                ),
-                cohort=StudyGroup(name="rare disease"),
+            regions.extend(
+                (contig, start, min(start + region_size, length))
+                for start in range(0, length, region_size)
+            )
+    return regions
+
+
+def _region_label(region: Region | None) -> str:
+    """Describe a region, for keying checkpoints
+
+    :param region: region being ingested, or ``None`` for the whole file
+    :return: region in ``contig:start-end`` form, or ``""`` for the whole file
+    """
+    if region is None:
+        return ""
+    contig, start, end = region
+    return f"{contig}:{start}-{'' if end is None else end}"
+
+
+def _ingest_region(
+    vcf_path: Path,
+    region: Region | None,
+    assembly: ReferenceAssembly,
+    anyvar_uri: str | None,
+    storage_uri: str | None,
+    batch_size: int | None,
+    max_in_flight_batches: int,
+    decompression_threads: int,
+    file_hash: str | None,
+) -> IngestStats:
+    """Ingest one region of a VCF, using newly constructed AnyVar and storage clients
+
+    Intended to run in a worker process, so every argument must be picklable.
+
+    :param vcf_path: location of input file
+    :param region: region to ingest. Records are assigned to the region containing
+        their start position. If ``None``, ingest the whole file.
+    :param assembly: reference assembly used by VCF
+    :param anyvar_uri: AnyVar connection string (see ``create_anyvar_client``)
+    :param storage_uri: AnyVLM storage URI (see ``create_anyvlm_storage``)
+    :param batch_size: number of variants per AnyVar registration request, or ``None``
+        to size batches adaptively
+    :param max_in_flight_batches: maximum number of concurrent AnyVar registration requests
+    :param decompression_threads: number of threads to use for BGZF decompression
+    :param file_hash: digest of the VCF, used to checkpoint progress, or ``None`` to
+        disable checkpointing
+    :return: progress of the region's ingestion, as of completion
+    """
+    from anyvlm.main import (  # noqa: PLC0415
+        create_anyvar_client,
+        create_anyvlm_storage,
+    )
+
+    pysam.set_verbosity(0)
+    batch_sizer, _ = _resolve_pipeline_settings(batch_size, max_in_flight_batches)
+    av = create_anyvar_client(anyvar_uri)
+    storage = create_anyvlm_storage(storage_uri)
+    stats = IngestStats()
+    try:
+        if region is None:
+            vcf = pysam.VariantFile(filename=vcf_path.absolute().as_uri(), mode="r")
+            records: Iterable[pysam.VariantRecord] = vcf
+        else:
+            vcf = pysam.VariantFile(str(vcf_path), threads=decompression_threads)
+            contig, start, end = region
+            # fetch() yields every record overlapping the region; only keep those
+            # that start in it so records spanning a boundary are ingested once
+            records = (
+                record
+                for record in vcf.fetch(contig, start, end)
+                if record.start >= start
+            )
+        with vcf:
+            _ingest_records(
+                records,
+                av,
+                storage,
+                assembly,
+                batch_sizer,
+                max_in_flight_batches,
+                stats,
+                file_hash=file_hash,
+                region=_region_label(region),
+            )
+    finally:
+        av.close()
+        storage.close()
+    return stats
+
+
+def ingest_vcf_sharded(
+    vcf_path: Path,
+    assembly: ReferenceAssembly = ReferenceAssembly.GRCH38,
+    anyvar_uri: str | None = None,
+    storage_uri: str | None = None,
+    processes: int | None = None,
+    region_size: int | None = None,
+    decompression_threads: int = 2,
+    batch_size: int | None = None,
+    max_in_flight_batches: int | None = None,
+    stats: IngestStats | None = None,
+    resumable: bool = True,
+) -> IngestStats:
+    """Ingest a VCF by splitting it into regions and fanning them out across a pool of
+    worker processes
+
+    Each worker reads its region via the VCF's tabix/CSI index and runs the same
+    pipeline as :py:func:`ingest_vcf`, with its own AnyVar client and storage
+    connection. If a BGZF-compressed VCF isn't indexed, an index is built next to it
+    (and removed afterwards). An uncompressed VCF is compressed and indexed as a
+    temporary copy. If indexing isn't possible (e.g. for plain gzip compression), the
+    whole file is ingested by a single worker.
+
+    Unlike :py:func:`ingest_vcf`, regions are written concurrently, so if two records
+    in different regions resolve to the same VRS ID, which one is stored first is not
+    defined.
+
+    :param vcf_path: location of input file
+    :param assembly: reference assembly used by VCF
+    :param anyvar_uri: AnyVar connection string for workers (see ``create_anyvar_client``)
+    :param storage_uri: AnyVLM storage URI for workers (see ``create_anyvlm_storage``)
+    :param processes: number of worker processes. Defaults to the
+        ``ANYVLM_INGEST_PROCESSES`` setting.
+    :param region_size: maximum size of each region, in base pairs. Defaults to the
+        ``ANYVLM_INGEST_REGION_SIZE`` setting; if that is unset, each contig is one region.
+    :param decompression_threads: number of BGZF decompression threads per worker
+    :param batch_size: number of variants per AnyVar registration request. If not
+        given, each worker sizes its batches adaptively, as for :py:func:`ingest_vcf`.
+    :param max_in_flight_batches: maximum number of concurrent AnyVar registration
+        requests per worker
+    :param stats: progress tracker, updated as each region is completed
+    :param resumable: whether to checkpoint progress of each region and resume from
+        prior checkpoints. Checkpoints are keyed by region, so changing the region size
+        between attempts starts ingestion over.
+    :return: ingestion progress, as of completion
+    :raise VcfAfColumnsError: if VCF is missing required columns
+    """
+    config = get_config()
+    # validate settings here rather than in each worker
+    _, max_in_flight_batches = _resolve_pipeline_settings(
+        batch_size, max_in_flight_batches
+    )
+    if processes is None:
+        processes = config.ingest_processes
+    if region_size is None:
+        region_size = config.ingest_region_size
+    if stats is None:
+        stats = IngestStats()
+    file_hash = _hash_file(vcf_path) if resumable else None
+
+    built_index: Path | None = None
+    with tempfile.TemporaryDirectory(prefix="anyvlm-ingest-") as work_dir:
+        try:
+            indexed_path, built_index = _ensure_index(vcf_path, Path(work_dir))
+        except OSError:
+            _logger.warning(
+                "Unable to index %s; ingesting it without sharding", vcf_path
             )
-            cafs.append(caf)
+            indexed_path = vcf_path
+            regions: list[Region | None] = [None]
+        else:
+            regions = list(_plan_regions(indexed_path, region_size))
+        _logger.info(
+            "Ingesting %s in %s region(s) across %s process(es)",
+            vcf_path,
+            len(regions),
+            processes,
+        )
+
+        try:
+            # the caller may be a server thread with open connections and other
+            # threads' locks, which mustn't be copied into workers by forking
+            with ProcessPoolExecutor(
+                max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        _ingest_region,
+                        indexed_path,
+                        region,
+                        assembly,
+                        anyvar_uri,
+                        storage_uri,
+                        batch_size,
+                        max_in_flight_batches,
+                        decompression_threads,
+                        file_hash,
+                    )
+                    for region in regions
+                ]
+                try:
+                    for future in as_completed(futures):
+                        stats.add(future.result())
+                finally:
+                    for future in futures:
+                        future.cancel()
+        finally:
+            if built_index is not None:
+                built_index.unlink(missing_ok=True)
+    if file_hash is not None:
+        from anyvlm.main import create_anyvlm_storage  # noqa: PLC0415
 
-        storage.add_allele_frequencies(cafs)
+        storage = create_anyvlm_storage(storage_uri)
+        try:
+            storage.delete_ingest_checkpoints(file_hash, assembly.value)
+        finally:
+            storage.close()
+    return stats
@@ -20,7 +20,11 @@ from anyvlm import __version__
 from anyvlm.anyvar.base_client import BaseAnyVarClient
 from anyvlm.anyvar.http_client import HttpAnyVarClient
 from anyvlm.anyvar.python_client import PythonAnyVarClient
+from anyvlm.cache.base_cache import ResponseCache
+from anyvlm.cache.generation import GenerationReader
+from anyvlm.cache.memory_cache import LruResponseCache
 from anyvlm.config import get_config
+from anyvlm.functions.ingest_jobs import IngestJobManager
 from anyvlm.restapi.vlm import router as vlm_router
 from anyvlm.schemas.common import (
     SERVICE_DESCRIPTION,
@@ -29,6 +33,7 @@ from anyvlm.schemas.common import (
     ServiceType,
 )
 from anyvlm.storage.base_storage import Storage
+from anyvlm.storage.batching import BatchedStorageReader
 from anyvlm.utils.types import (
     EndpointTag,
 )
@@ -57,13 +62,29 @@ def create_anyvar_client(
             "AnyVar client factory initializing HTTP-based AnyVar client under hostname %s",
             connection_string,
         )
-        return HttpAnyVarClient(connection_string)
+        config = get_config()
+        return HttpAnyVarClient(
+            connection_string,
+            request_timeout=config.anyvar_request_timeout,
+            pool_connections=config.anyvar_pool_connections,
+            pool_maxsize=config.anyvar_pool_maxsize,
+            pool_block=config.anyvar_pool_block,
+            max_retries=config.anyvar_max_retries,
+            backoff_factor=config.anyvar_retry_backoff_factor,
+            backoff_jitter=config.anyvar_retry_backoff_jitter,
+            sub_batch_size=config.anyvar_sub_batch_size,
+            max_concurrent_requests=config.anyvar_max_concurrent_requests,
+        )
     _logger.info(
         "AnyVar client factory initializing AnyVar instance directly; falling back on AnyVar-specific env vars"
     )
     storage = create_storage()
     translator = create_translator()
-    return PythonAnyVarClient(translator, storage)
+    return PythonAnyVarClient(
+        translator,
+        storage,
+        translation_processes=get_config().anyvar_translation_processes,
+    )
 
 
 def create_anyvlm_storage(uri: str | None = None) -> Storage:
@@ -74,6 +95,9 @@ def create_anyvlm_storage(uri: str | None = None) -> Storage:
 
     `postgresql://[username]:[password]@[domain]/[database]`
 
+    Use the `postgresql+asyncpg` scheme to serve variant queries with an async driver
+    (requires the ``asyncpg`` extra).
+
     :param uri: AnyVLM storage URI
     :raises ValueError: if the URI scheme is not supported
     :return: AnyVLM storage instance
@@ -86,6 +110,12 @@ def create_anyvlm_storage(uri: str | None = None) -> Storage:
         from anyvlm.storage.postgres import PostgresObjectStore  # noqa: PLC0415
 
         storage = PostgresObjectStore(uri)
+    elif parsed_uri.scheme == "postgresql+asyncpg":
+        from anyvlm.storage.async_postgres import (  # noqa: PLC0415
+            AsyncPostgresObjectStore,
+        )
+
+        storage = AsyncPostgresObjectStore(uri)
     else:
         msg = f"URI scheme {parsed_uri.scheme} is not implemented"
         raise ValueError(msg)
@@ -98,6 +128,51 @@ def create_anyvlm_storage(uri: str | None = None) -> Storage:
     return storage
 
 
+def create_response_cache(uri: str | None = None) -> ResponseCache | None:
+    """Provide factory to create a ``/variant_counts`` response cache based on `uri`,
+    or the ANYVLM_RESPONSE_CACHE_URI environment value.
+
+    Use `memory://` for a size-bounded LRU cache in each server process, or
+    `redis://[host]:[port]/[db]` for a cache shared by every process (requires the
+    ``redis`` extra).
+
+    :param uri: AnyVLM response cache URI
+    :raises ValueError: if the URI scheme is not supported
+    :raises ImportError: if the Redis client isn't installed
+    :return: response cache instance, or ``None`` if caching isn't configured
+    """
+    config = get_config()
+    if not uri:
+        uri = config.response_cache_uri
+    if not uri:
+        return None
+
+    parsed_uri = urlparse(uri)
+    if parsed_uri.scheme == "memory":
+        cache = LruResponseCache(config.response_cache_max_entries)
+    elif parsed_uri.scheme in ("redis", "rediss"):
+        try:
+            from anyvlm.cache.redis_cache import RedisResponseCache  # noqa: PLC0415
+        except ImportError as e:
+            msg = (
+                "Redis client is not installed. Install it with "
+                "`pip install anyvlm[redis]`."
+            )
+            raise ImportError(msg) from e
+
+        cache = RedisResponseCache(uri, ttl=config.response_cache_ttl)
+    else:
+        msg = f"URI scheme {parsed_uri.scheme} is not implemented"
+        raise ValueError(msg)
+
+    _logger.info(
+        "AnyVLM response cache factory initializing cache via %s scheme -> %s",
+        parsed_uri.scheme,
+        cache,
+    )
+    return cache
+
+
 async def _configure_logging() -> None:
     """Initialize logging.
 
@@ -139,9 +214,27 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     await _configure_logging()
     app.state.anyvar_client = create_anyvar_client()
     app.state.anyvlm_storage = create_anyvlm_storage()
+    config = get_config()
+    if config.storage_batch_window > 0:
+        app.state.storage_reader = BatchedStorageReader(
+            app.state.anyvlm_storage,
+            config.storage_batch_window,
+            config.storage_batch_max_size,
+        )
+    app.state.response_cache = create_response_cache()
+    app.state.generation_reader = GenerationReader(
+        app.state.anyvlm_storage, config.generation_refresh_interval
+    )
+    app.state.ingest_jobs = IngestJobManager(
+        config.ingest_max_concurrent_jobs, config.ingest_job_retention
+    )
     yield
-    app.state.anyvar_client.close()
-    app.state.anyvlm_storage.close()
+    # waits for running jobs, so keep it off of the event loop
+    await anyio.to_thread.run_sync(app.state.ingest_jobs.shutdown)
+    if app.state.response_cache is not None:
+        await app.state.response_cache.close_async()
+    await app.state.anyvar_client.close_async()
+    await app.state.anyvlm_storage.close_async()
 
 
 API_PREFIX = "/anyvlm"
@@ -1,9 +1,12 @@
 """Define route(s) for the variant-level matching (VLM) protocol"""
 
 import gzip
+import hashlib
 import logging
 import tempfile
 import uuid
+from datetime import datetime
+from functools import partial
 from http import HTTPStatus
 from pathlib import Path
 from typing import Annotated, BinaryIO, Literal
@@ -11,22 +14,47 @@ from typing import Annotated, BinaryIO, Literal
 from anyvar.mapping.liftover import ReferenceAssembly
 from fastapi import (
     APIRouter,
+    Header,
     HTTPException,
     Query,
     Request,
+    Response,
     UploadFile,
 )
-from pydantic import BaseModel
-
-from anyvlm.anyvar.base_client import AnyVarClientConnectionError, BaseAnyVarClient
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ValidationError
+
+from anyvlm import __version__
+from anyvlm.anyvar.base_client import (
+    AnyVarClientConnectionError,
+    AnyVarClientError,
+    BaseAnyVarClient,
+)
+from anyvlm.cache.base_cache import ResponseCache, variant_counts_cache_key
+from anyvlm.cache.generation import GenerationReader
+from anyvlm.config import get_config
 from anyvlm.functions.build_vlm_response import build_vlm_response
-from anyvlm.functions.get_cafs import get_cafs
-from anyvlm.functions.ingest_vcf import VcfAfColumnsError
+from anyvlm.functions.get_cafs import get_cafs_async, get_cafs_batch_async
+from anyvlm.functions.ingest_jobs import IngestJob, IngestJobManager, IngestJobStatus
+from anyvlm.functions.ingest_vcf import (
+    IngestStats,
+    VcfAfColumnsError,
+    ingest_vcf_sharded,
+)
 from anyvlm.functions.ingest_vcf import ingest_vcf as ingest_vcf_function
-from anyvlm.schemas.vlm import VlmResponse
+from anyvlm.schemas.vlm import (
+    VariantCountsBatchRequest,
+    VariantCountsBatchResponse,
+    VariantCountsBatchResult,
+    VariantCountsQuery,
+    VlmResponse,
+)
 from anyvlm.storage.base_storage import Storage
+from anyvlm.storage.batching import BatchedStorageReader
 from anyvlm.utils.exceptions import VariantLookupError
 from anyvlm.utils.types import (
+    ASSEMBLY_MAP,
+    AlleleCoordinates,
     AnyVlmCohortAlleleFrequencyResult,
     ChromosomeName,
     EndpointTag,
@@ -56,9 +84,47 @@ REQUIRED_INFO_FIELDS = {"AC", "AN", "AC_Het", "AC_Hom", "AC_Hemi"}
 class VcfIngestionResponse(BaseModel):
     """Response model for VCF ingestion endpoint."""
 
-    status: Literal["success", "error"]
+    status: Literal["accepted", "error"]
     message: str
     details: str | None = None
+    job_id: str | None = None
+
+
+class IngestJobResponse(BaseModel):
+    """Response model for ingestion job status endpoint."""
+
+    job_id: str
+    filename: str
+    status: IngestJobStatus
+    records_processed: int
+    records_resumed: int = 0
+    batch_size: int | None = None
+    records_per_second: float | None = None
+    submitted_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    error: str | None = None
+
+    @classmethod
+    def from_job(cls, job: IngestJob) -> "IngestJobResponse":
+        """Construct a response from the current state of an ingestion job
+
+        :param job: ingestion job to describe
+        :return: job status response
+        """
+        return cls(
+            job_id=job.job_id,
+            filename=job.filename,
+            status=job.status,
+            records_processed=job.stats.records_processed,
+            records_resumed=job.stats.records_resumed,
+            batch_size=job.stats.batch_size,
+            records_per_second=job.records_per_second,
+            submitted_at=job.submitted_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+            error=job.error,
+        )
 
 
 # ====================
@@ -161,6 +227,48 @@ async def save_upload_file_temp(upload_file: UploadFile) -> Path:
         return temp_path
 
 
+def _remove_temp_file(temp_path: Path) -> None:
+    """Remove a temporary upload file, if it still exists
+
+    :param temp_path: path to temporary file
+    """
+    if temp_path.exists():
+        _logger.debug("Cleaning up temporary file: %s", temp_path)
+        temp_path.unlink()
+
+
+def _run_ingest_job(
+    temp_path: Path,
+    anyvar_client: BaseAnyVarClient,
+    anyvlm_storage: Storage,
+    assembly: ReferenceAssembly,
+    stats: IngestStats,
+) -> None:
+    """Ingest an uploaded VCF as part of a background job
+
+    If ``ANYVLM_INGEST_PROCESSES`` is greater than 1, the file is split by region and
+    ingested by a pool of worker processes, each with its own AnyVar and storage
+    connections; otherwise it's ingested in-process using the provided clients.
+
+    :param temp_path: path to the saved upload
+    :param anyvar_client: AnyVar client
+    :param anyvlm_storage: AnyVLM storage instance
+    :param assembly: reference assembly used in VCF
+    :param stats: job progress tracker
+    :raise ValueError: if VCF is missing required INFO columns
+    """
+    try:
+        if get_config().ingest_processes > 1:
+            ingest_vcf_sharded(temp_path, assembly, stats=stats)
+        else:
+            ingest_vcf_function(
+                temp_path, anyvar_client, anyvlm_storage, assembly, stats=stats
+            )
+    except VcfAfColumnsError as e:
+        msg = f"VCF validation failed: {e}"
+        raise ValueError(msg) from e
+
+
 # ====================
 # Endpoints
 # ====================
@@ -173,8 +281,10 @@ async def save_upload_file_temp(upload_file: UploadFile) -> Path:
         "Upload a compressed VCF file (.vcf.gz) to register variants and store allele frequency data. "
         "**Requirements:** File must be gzip-compressed (.vcf.gz), contain required INFO fields "
         "(AC, AN, AC_Het, AC_Hom, AC_Hemi), and be under 5GB. "
-        "Processing is synchronous with a 30-minute timeout."
+        "Ingestion runs as a background job; use the returned job ID with "
+        "`/ingest_jobs/{job_id}` to check its progress."
     ),
+    status_code=HTTPStatus.ACCEPTED,
     tags=[EndpointTag.SEARCH],
 )
 async def ingest_vcf_endpoint(
@@ -188,12 +298,13 @@ async def ingest_vcf_endpoint(
     """Upload and ingest a VCF file with allele frequency data.
 
     Requirements: .vcf.gz format, <5GB, INFO fields (AC, AN, AC_Het, AC_Hom, AC_Hemi).
-    Synchronous processing with 30-minute timeout. Variants batched in groups of 1000.
+    The upload is validated and saved before responding; ingestion itself runs as a
+    background job.
 
     :param request: FastAPI request object
     :param file: uploaded VCF file
     :param assembly: reference assembly used in VCF
-    :return: ingestion status response
+    :return: response containing the ID of the ingestion job
     """
     temp_path: Path | None = None
 
@@ -247,24 +358,23 @@ async def ingest_vcf_endpoint(
                 f"VCF validation failed: {e!s}",
             ) from e
 
-        # Process VCF
+        # Hand off VCF to a background job, which takes over cleanup of the file
         anyvar_client = request.app.state.anyvar_client
         anyvlm_storage = request.app.state.anyvlm_storage
-        _logger.info("Starting VCF ingestion for %s", file.filename)
-
-        try:
-            ingest_vcf_function(temp_path, anyvar_client, anyvlm_storage, assembly)
-        except VcfAfColumnsError as e:
-            _logger.exception("VCF missing required INFO columns")
-            raise HTTPException(422, f"VCF validation failed: {e}") from e
-        except Exception as e:
-            _logger.exception("VCF ingestion failed")
-            raise HTTPException(500, f"Ingestion failed: {e}") from e
-
-        _logger.info("Successfully ingested VCF: %s", file.filename)
+        ingest_jobs: IngestJobManager = request.app.state.ingest_jobs
+        job = ingest_jobs.submit(
+            partial(
+                _run_ingest_job, temp_path, anyvar_client, anyvlm_storage, assembly
+            ),
+            file.filename,
+            cleanup=partial(_remove_temp_file, temp_path),
+        )
+        temp_path = None
+        _logger.info("Queued ingestion job %s for %s", job.job_id, file.filename)
         return VcfIngestionResponse(
-            status="success",
-            message=f"Successfully ingested {file.filename}",
+            status="accepted",
+            message=f"Accepted {file.filename} for ingestion",
+            job_id=job.job_id,
         )
 
     except HTTPException:
@@ -274,15 +384,69 @@ async def ingest_vcf_endpoint(
         _logger.exception("Unexpected error during VCF upload")
         raise HTTPException(500, f"Upload failed: {e}") from e
     finally:
-        # Always cleanup temporary file
-        if temp_path and temp_path.exists():
-            _logger.debug("Cleaning up temporary file: %s", temp_path)
-            temp_path.unlink()
+        # Clean up temporary file unless it was handed off to an ingestion job
+        if temp_path:
+            _remove_temp_file(temp_path)
+
+
+@router.get(
+    "/ingest_jobs/{job_id}",
+    summary="Get status of a VCF ingestion job",
+    description="Report the state, number of records processed, and throughput of a VCF ingestion job.",
+    tags=[EndpointTag.SEARCH],
+)
+def get_ingest_job(
+    request: Request,
+    job_id: str,
+) -> IngestJobResponse:
+    """Report progress of a VCF ingestion job
+
+    :param request: FastAPI request object
+    :param job_id: ID returned by the ingestion endpoint
+    :return: job status
+    :raise HTTPException: if job ID is not known to this server
+    """
+    ingest_jobs: IngestJobManager = request.app.state.ingest_jobs
+    job = ingest_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(HTTPStatus.NOT_FOUND, f"Unknown ingestion job: {job_id}")
+    return IngestJobResponse.from_job(job)
+
+
+def _variant_counts_etag(cache_key: str) -> str:
+    """Derive the ETag of a ``/variant_counts`` response
+
+    The response is fully determined by the normalized query and the dataset
+    generation it's computed from, which the cache key captures, so the ETag can be
+    computed without building the response. The AnyVLM version is included, in case
+    the response format changes between releases.
+
+    :param cache_key: response cache key of the query
+    :return: quoted entity tag
+    """
+    digest = hashlib.sha256(f"{__version__}:{cache_key}".encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check whether an ``If-None-Match`` header matches an ETag
+
+    Uses weak comparison, per RFC 9110 section 13.1.2.
+
+    :param if_none_match: value of the request's ``If-None-Match`` header
+    :param etag: quoted entity tag of the current response
+    :return: whether the client's cached response is still current
+    """
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
 
 
 _allele_counts_description = """Search for a SNP and receive allele counts by zygosity, in accordance with the Variant-Level Matching protocol.
 
 * Unrecognized variants will return a `200 OK` response with a `resultsCount` of 0
+* Responses carry an `ETag` that changes whenever the underlying data does. Requests whose `If-None-Match` header matches it receive a `304 Not Modified` response with no body
 """
 
 
@@ -291,9 +455,10 @@ _allele_counts_description = """Search for a SNP and receive allele counts by zy
     summary="Get allele counts of a single sequence variant, broken down by zygosity",
     description=_allele_counts_description,
     tags=[EndpointTag.SEARCH],
+    response_model=VlmResponse,
 )
 # ruff: noqa: N803, D103
-def variant_counts(
+async def variant_counts(
     request: Request,
     assemblyId: Annotated[
         GrcAssemblyId | UcscAssemblyBuild,
@@ -309,19 +474,58 @@ def variant_counts(
     alternateBases: Annotated[
         Nucleotide, Query(..., description="Single genomic base (A/C/T/G)")
     ],
-) -> VlmResponse:
+    if_none_match: Annotated[
+        str | None,
+        Header(description="ETag(s) of previously received responses"),
+    ] = None,
+) -> Response:
+    # read through the generation reader, so that most requests don't query storage
+    generation_reader: Storage | GenerationReader = (
+        getattr(request.app.state, "generation_reader", None)
+        or request.app.state.anyvlm_storage
+    )
+    cache_key = variant_counts_cache_key(
+        await generation_reader.get_generation_async(),
+        ASSEMBLY_MAP[assemblyId],
+        AlleleCoordinates.from_expression(
+            f"{referenceName}-{start}-{referenceBases}-{alternateBases}"
+        ),
+    )
+    headers = {"ETag": _variant_counts_etag(cache_key)}
+    cache_control = get_config().variant_counts_cache_control
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    if _etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+    response_cache: ResponseCache | None = getattr(
+        request.app.state, "response_cache", None
+    )
+    if response_cache is not None:
+        cached = await response_cache.get(cache_key)
+        if cached is not None:
+            return Response(
+                content=cached, media_type="application/json", headers=headers
+            )
+
     anyvar_client: BaseAnyVarClient = request.app.state.anyvar_client
-    anyvlm_storage: Storage = request.app.state.anyvlm_storage
+    # read through the batched reader, if the server enabled one
+    storage_reader: Storage | BatchedStorageReader = (
+        getattr(request.app.state, "storage_reader", None)
+        or request.app.state.anyvlm_storage
+    )
 
     try:
-        caf_data: list[AnyVlmCohortAlleleFrequencyResult] = get_cafs(
+        caf_data: list[AnyVlmCohortAlleleFrequencyResult] = await get_cafs_async(
             anyvar_client,
-            anyvlm_storage,
+            storage_reader,
             assemblyId,
             referenceName,
             start,
             referenceBases,
             alternateBases,
+            # the response only reports counts, so don't dereference focus alleles
+            resolve_focus_alleles=False,
         )
     except VariantLookupError:
         caf_data = []
@@ -330,4 +534,103 @@ def variant_counts(
             status_code=HTTPStatus.SERVICE_UNAVAILABLE,
             detail="Unable to establish AnyVar connection",
         ) from e
-    return build_vlm_response(caf_data)
+    except AnyVarClientError as e:
+        # an empty response here would be wrong, so it mustn't be cached
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_GATEWAY,
+            detail="Variant lookup in AnyVar failed",
+        ) from e
+    response = JSONResponse(
+        content=build_vlm_response(caf_data).model_dump(mode="json", by_alias=True),
+        headers=headers,
+    )
+    if response_cache is not None:
+        await response_cache.set(cache_key, bytes(response.body))
+    return response
+
+
+def _batch_result(
+    result: list[AnyVlmCohortAlleleFrequencyResult] | Exception,
+) -> VariantCountsBatchResult:
+    """Report the outcome of a single query in a batch
+
+    :param result: CAF data for the query, or the exception that prevented
+        retrieving it
+    :return: the query's response, or the error it would have received on its own
+    """
+    if isinstance(result, AnyVarClientConnectionError):
+        return VariantCountsBatchResult(
+            status=HTTPStatus.SERVICE_UNAVAILABLE,
+            detail="Unable to establish AnyVar connection",
+        )
+    if isinstance(result, AnyVarClientError):
+        return VariantCountsBatchResult(
+            status=HTTPStatus.BAD_GATEWAY, detail="Variant lookup in AnyVar failed"
+        )
+    if isinstance(result, Exception):
+        _logger.error("Variant query in batch failed", exc_info=result)
+        return VariantCountsBatchResult(
+            status=HTTPStatus.INTERNAL_SERVER_ERROR, detail="Internal Server Error"
+        )
+    return VariantCountsBatchResult(
+        status=HTTPStatus.OK, response=build_vlm_response(result)
+    )
+
+
+def _validation_detail(error: ValidationError) -> str:
+    """Describe why a query in a batch is invalid
+
+    :param error: error raised validating the query
+    :return: each problem with the query, with the parameter it applies to
+    """
+    problems = (
+        f"{'.'.join(str(loc) for loc in problem['loc']) or 'query'}: {problem['msg']}"
+        for problem in error.errors()
+    )
+    return f"Invalid query: {'; '.join(problems)}"
+
+
+_batch_allele_counts_description = """Search for many SNPs at once, and receive allele counts by zygosity for each, in accordance with the Variant-Level Matching protocol.
+
+* Each query takes the same parameters as `GET /variant_counts`, and its result holds the response that endpoint would give
+* Results are returned in the order queries were given. A query that fails, e.g. because it's invalid (status 400) or AnyVar is unavailable (status 503), has an error `status` and `detail` instead of a `response`, without failing the rest of the batch
+"""
+
+
+@router.post(
+    "/variant_counts/batch",
+    summary="Get allele counts of many sequence variants, broken down by zygosity",
+    description=_batch_allele_counts_description,
+    tags=[EndpointTag.SEARCH],
+)
+async def variant_counts_batch(
+    request: Request, batch: VariantCountsBatchRequest
+) -> VariantCountsBatchResponse:
+    max_batch_size = get_config().variant_counts_max_batch_size
+    if len(batch.queries) > max_batch_size:
+        raise HTTPException(
+            status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+            detail=f"Batch of {len(batch.queries)} queries exceeds the maximum of {max_batch_size}",
+        )
+    anyvar_client: BaseAnyVarClient = request.app.state.anyvar_client
+    storage: Storage = request.app.state.anyvlm_storage
+
+    # invalid queries fail alone, as they would on their own
+    invalid: dict[int, VariantCountsBatchResult] = {}
+    queries: list[VariantCountsQuery] = []
+    for i, query in enumerate(batch.queries):
+        try:
+            queries.append(VariantCountsQuery.model_validate(query))
+        except ValidationError as e:
+            invalid[i] = VariantCountsBatchResult(
+                status=HTTPStatus.BAD_REQUEST, detail=_validation_detail(e)
+            )
+    results = iter(
+        await get_cafs_batch_async(anyvar_client, storage, queries) if queries else []
+    )
+    return VariantCountsBatchResponse(
+        results=[
+            invalid[i] if i in invalid else _batch_result(next(results))
+            for i in range(len(batch.queries))
+        ]
+    )
@@ -2,10 +2,22 @@
 
 from typing import ClassVar, Literal, Self
 
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    SkipValidation,
+    model_validator,
+)
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-from anyvlm.utils.types import Zygosity
+from anyvlm.utils.types import (
+    ChromosomeName,
+    GrcAssemblyId,
+    Nucleotide,
+    UcscAssemblyBuild,
+    Zygosity,
+)
 
 # ruff: noqa: N815, D107 (allow camelCase instead of snake_case to align with expected VLM protocol response + don't require init docstrings)
 
@@ -190,3 +202,51 @@ class VlmResponse(BaseModel):
                 raise ValueError(error_message) from e
 
         return self
+
+
+class VariantCountsQuery(BaseModel):
+    """A single variant query, with the same parameters as the `variant_counts` endpoint"""
+
+    assemblyId: GrcAssemblyId | UcscAssemblyBuild = Field(
+        ..., description="Genome reference assembly"
+    )
+    referenceName: ChromosomeName = Field(
+        ..., description="Chromosome with optional 'chr' prefix"
+    )
+    start: int = Field(..., description="Variant position")
+    referenceBases: Nucleotide = Field(..., description="Single genomic base (A/C/T/G)")
+    alternateBases: Nucleotide = Field(..., description="Single genomic base (A/C/T/G)")
+
+
+class VariantCountsBatchRequest(BaseModel):
+    """Define request structure for the batch variant_counts endpoint."""
+
+    # queries are validated one at a time by the endpoint, so that an invalid query
+    # fails alone rather than failing the whole batch
+    queries: list[SkipValidation[VariantCountsQuery]] = Field(
+        ..., min_length=1, description="Variant queries to answer"
+    )
+
+
+class VariantCountsBatchResult(BaseModel):
+    """The outcome of a single query in a batch variant_counts request"""
+
+    status: int = Field(
+        ...,
+        description="HTTP status code the query would have received on its own",
+        examples=[200, 400, 503],
+    )
+    response: VlmResponse | None = Field(
+        default=None, description="Response to the query, if it succeeded"
+    )
+    detail: str | None = Field(
+        default=None, description="Description of the error, if the query failed"
+    )
+
+
+class VariantCountsBatchResponse(BaseModel):
+    """Define response structure for the batch variant_counts endpoint."""
+
+    results: list[VariantCountsBatchResult] = Field(
+        ..., description="Result of each query, in the order the queries were given"
+    )
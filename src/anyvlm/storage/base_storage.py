@@ -1,14 +1,47 @@
 """Provide base storage implementation."""
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Mapping, Sequence
 
-from anyvlm.utils.types import AnyVlmCohortAlleleFrequencyResult
+import anyio.to_thread
+
+from anyvlm.utils.types import (
+    AfBatch,
+    AlleleCoordinates,
+    AnyVlmCohortAlleleFrequencyResult,
+)
 
 
 class StorageError(Exception):
     """Base AnyLM storage error."""
 
 
+def validate_allele_frequency_rows(
+    vrs_ids: Sequence[str], afs: AfBatch, cohort: str
+) -> None:
+    """Check a batch of raw allele frequency rows before writing it
+
+    :param vrs_ids: VRS Allele ID for each set of allele frequency data
+    :param afs: allele frequency data, in the same order as ``vrs_ids``. Expressions
+        in the batch are ignored.
+    :param cohort: name of the cohort the allele frequencies describe
+    :raise ValueError: if lengths differ, cohort is empty, or any VRS ID is missing or
+        AN isn't positive
+    """
+    if len(vrs_ids) != len(afs):
+        msg = f"Got {len(vrs_ids)} VRS IDs but {len(afs)} allele frequencies"
+        raise ValueError(msg)
+    if not cohort:
+        msg = "Cohort name is required"
+        raise ValueError(msg)
+    if not all(vrs_ids):
+        msg = "Every allele frequency requires a VRS ID"
+        raise ValueError(msg)
+    if afs and min(afs.an) <= 0:
+        msg = "AN must be positive"
+        raise ValueError(msg)
+
+
 class Storage(ABC):
     """Abstract base class for interacting with storage backends."""
 
@@ -20,6 +53,10 @@ class Storage(ABC):
     def close(self) -> None:
         """Close the storage backend."""
 
+    async def close_async(self) -> None:
+        """Close the storage backend, including any resources used by async methods."""
+        await anyio.to_thread.run_sync(self.close)
+
     @abstractmethod
     def wipe_db(self) -> None:
         """Wipe all data from the storage backend."""
@@ -38,6 +75,23 @@ class Storage(ABC):
         :param cafs: List of cohort allele frequency study result objects to insert
         """
 
+    @abstractmethod
+    def add_allele_frequency_rows(
+        self, vrs_ids: Sequence[str], afs: AfBatch, cohort: str
+    ) -> None:
+        """Add allele frequency data to the database directly from parsed VCF values,
+        without constructing CAF objects. Will skip conflicts.
+
+        Input is validated once for the whole batch; see
+        :py:func:`validate_allele_frequency_rows`.
+
+        :param vrs_ids: VRS Allele ID for each set of allele frequency data
+        :param afs: allele frequency data, in the same order as ``vrs_ids``. Expressions
+            in the batch are ignored.
+        :param cohort: name of the cohort the allele frequencies describe
+        :raise ValueError: if input is invalid
+        """
+
     @abstractmethod
     def get_cafs_by_vrs_allele_id(
         self, vrs_allele_id: str
@@ -48,3 +102,244 @@ class Storage(ABC):
         :return: List of cohort allele frequency study results matching given VRS Allele
             ID. Will use iriReference for focusAllele
         """
+
+    async def get_cafs_by_vrs_allele_id_async(
+        self, vrs_allele_id: str
+    ) -> list[AnyVlmCohortAlleleFrequencyResult]:
+        """Retrieve cohort allele frequency study results by VRS Allele ID, without
+        blocking the event loop
+
+        By default, runs :py:meth:`get_cafs_by_vrs_allele_id` in a worker thread.
+        Backends with an async driver should override this.
+
+        :param vrs_allele_id: VRS Allele ID to filter by
+        :return: List of cohort allele frequency study results matching given VRS Allele
+            ID. Will use iriReference for focusAllele
+        """
+        return await anyio.to_thread.run_sync(
+            self.get_cafs_by_vrs_allele_id, vrs_allele_id
+        )
+
+    @abstractmethod
+    def get_cafs_by_vrs_allele_ids(
+        self, vrs_allele_ids: Iterable[str]
+    ) -> dict[str, list[AnyVlmCohortAlleleFrequencyResult]]:
+        """Retrieve cohort allele frequency study results for many VRS Allele IDs at once
+
+        :param vrs_allele_ids: VRS Allele IDs to filter by
+        :return: mapping of each given VRS Allele ID to the cohort allele frequency
+            study results matching it, which may be empty. Will use iriReference for
+            focusAllele
+        """
+
+    async def get_cafs_by_vrs_allele_ids_async(
+        self, vrs_allele_ids: Iterable[str]
+    ) -> dict[str, list[AnyVlmCohortAlleleFrequencyResult]]:
+        """Retrieve cohort allele frequency study results for many VRS Allele IDs at
+        once, without blocking the event loop
+
+        By default, runs :py:meth:`get_cafs_by_vrs_allele_ids` in a worker thread.
+        Backends with an async driver should override this.
+
+        :param vrs_allele_ids: VRS Allele IDs to filter by
+        :return: mapping of each given VRS Allele ID to the cohort allele frequency
+            study results matching it, which may be empty. Will use iriReference for
+            focusAllele
+        """
+        return await anyio.to_thread.run_sync(
+            self.get_cafs_by_vrs_allele_ids, list(vrs_allele_ids)
+        )
+
+    @abstractmethod
+    def add_allele_coordinates(
+        self,
+        vrs_ids: Sequence[str],
+        coordinates: Sequence[AlleleCoordinates],
+        assembly: str,
+    ) -> None:
+        """Record the coordinates of alleles with allele frequency data. Will skip
+        conflicts.
+
+        :param vrs_ids: VRS Allele ID of each allele
+        :param coordinates: coordinates of each allele, in the same order as ``vrs_ids``
+        :param assembly: reference assembly the coordinates are on
+        :raise ValueError: if lengths differ
+        """
+
+    @abstractmethod
+    def get_cafs_by_coordinates(
+        self, coordinates: AlleleCoordinates, assembly: str
+    ) -> list[AnyVlmCohortAlleleFrequencyResult]:
+        """Retrieve cohort allele frequency study results by allele coordinates
+
+        Results for the allele's lifted-over equivalent are included too, if it has
+        been linked with :py:meth:`add_liftover_ids`.
+
+        :param coordinates: coordinates of the allele to look up
+        :param assembly: reference assembly the coordinates are on
+        :return: List of cohort allele frequency study results for the allele at the
+            given coordinates, if it was ingested, followed by those for its
+            lifted-over equivalent. Will use iriReference for focusAllele
+        """
+
+    async def get_cafs_by_coordinates_async(
+        self, coordinates: AlleleCoordinates, assembly: str
+    ) -> list[AnyVlmCohortAlleleFrequencyResult]:
+        """Retrieve cohort allele frequency study results by allele coordinates, without
+        blocking the event loop
+
+        By default, runs :py:meth:`get_cafs_by_coordinates` in a worker thread.
+        Backends with an async driver should override this.
+
+        :param coordinates: coordinates of the allele to look up
+        :param assembly: reference assembly the coordinates are on
+        :return: List of cohort allele frequency study results for the allele at the
+            given coordinates, if it was ingested, followed by those for its
+            lifted-over equivalent. Will use iriReference for focusAllele
+        """
+        return await anyio.to_thread.run_sync(
+            self.get_cafs_by_coordinates, coordinates, assembly
+        )
+
+    @abstractmethod
+    def get_cafs_by_many_coordinates(
+        self, coordinates: Iterable[AlleleCoordinates], assembly: str
+    ) -> dict[AlleleCoordinates, list[AnyVlmCohortAlleleFrequencyResult]]:
+        """Retrieve cohort allele frequency study results for many alleles at once, by
+        their coordinates
+
+        :param coordinates: coordinates of the alleles to look up
+        :param assembly: reference assembly the coordinates are on
+        :return: mapping of each given set of coordinates to the cohort allele
+            frequency study results for the allele there, followed by those for its
+            lifted-over equivalent. Results may be empty. Will use iriReference for
+            focusAllele
+        """
+
+    async def get_cafs_by_many_coordinates_async(
+        self, coordinates: Iterable[AlleleCoordinates], assembly: str
+    ) -> dict[AlleleCoordinates, list[AnyVlmCohortAlleleFrequencyResult]]:
+        """Retrieve cohort allele frequency study results for many alleles at once, by
+        their coordinates, without blocking the event loop
+
+        By default, runs :py:meth:`get_cafs_by_many_coordinates` in a worker thread.
+        Backends with an async driver should override this.
+
+        :param coordinates: coordinates of the alleles to look up
+        :param assembly: reference assembly the coordinates are on
+        :return: mapping of each given set of coordinates to the cohort allele
+            frequency study results for the allele there, followed by those for its
+            lifted-over equivalent. Results may be empty. Will use iriReference for
+            focusAllele
+        """
+        return await anyio.to_thread.run_sync(
+            self.get_cafs_by_many_coordinates, list(coordinates), assembly
+        )
+
+    @abstractmethod
+    def get_liftover_ids(self, vrs_ids: Iterable[str]) -> dict[str, str | None]:
+        """Look up previously linked liftover equivalents of alleles
+
+        :param vrs_ids: VRS Allele IDs to look up
+        :return: mapping of VRS IDs to the VRS IDs of their lifted-over equivalents, or
+            ``None`` where AnyVar had no liftover. Alleles that haven't been linked are
+            omitted.
+        """
+
+    async def get_liftover_ids_async(
+        self, vrs_ids: Iterable[str]
+    ) -> dict[str, str | None]:
+        """Look up previously linked liftover equivalents of alleles, without blocking
+        the event loop
+
+        By default, runs :py:meth:`get_liftover_ids` in a worker thread. Backends with
+        an async driver should override this.
+
+        :param vrs_ids: VRS Allele IDs to look up
+        :return: mapping of VRS IDs to the VRS IDs of their lifted-over equivalents, or
+            ``None`` where AnyVar had no liftover. Alleles that haven't been linked are
+            omitted.
+        """
+        return await anyio.to_thread.run_sync(self.get_liftover_ids, list(vrs_ids))
+
+    @abstractmethod
+    def add_liftover_ids(self, liftover_ids: Mapping[str, str | None]) -> None:
+        """Link alleles to their lifted-over equivalents. Will skip conflicts.
+
+        :param liftover_ids: mapping of VRS IDs to the VRS IDs of their lifted-over
+            equivalents, or ``None`` where AnyVar has no liftover
+        """
+
+    @abstractmethod
+    def get_generation(self) -> int:
+        """Get the current dataset generation
+
+        The generation increases with every write that adds allele frequency data, and
+        when the database is wiped, so results cached under one generation are stale
+        once it changes. Coordinates and liftover links don't change it: they only
+        speed up finding allele frequency data that's already stored.
+
+        :return: current generation number, 0 if nothing has been written
+        """
+
+    async def get_generation_async(self) -> int:
+        """Get the current dataset generation, without blocking the event loop
+
+        By default, runs :py:meth:`get_generation` in a worker thread. Backends with
+        an async driver should override this.
+
+        :return: current generation number, 0 if nothing has been written
+        """
+        return await anyio.to_thread.run_sync(self.get_generation)
+
+    @abstractmethod
+    def get_ingest_checkpoint(self, file_hash: str, assembly: str, region: str) -> int:
+        """Retrieve the number of items committed by a previous ingestion attempt
+
+        :param file_hash: SHA-256 hex digest of the ingested file's contents
+        :param assembly: reference assembly the file was ingested under
+        :param region: region of the file being ingested, or ``""`` for the whole file
+        :return: number of items (one per alternate allele) already committed, or 0
+            if there is no checkpoint
+        """
+
+    @abstractmethod
+    def set_ingest_checkpoint(
+        self, file_hash: str, assembly: str, region: str, items_committed: int
+    ) -> None:
+        """Record the number of items committed so far by an ingestion
+
+        :param file_hash: SHA-256 hex digest of the ingested file's contents
+        :param assembly: reference assembly the file is ingested under
+        :param region: region of the file being ingested, or ``""`` for the whole file
+        :param items_committed: number of items (one per alternate allele) committed
+        """
+
+    @abstractmethod
+    def delete_ingest_checkpoints(self, file_hash: str, assembly: str) -> None:
+        """Remove all checkpoints for a file, e.g. once it has been fully ingested
+
+        :param file_hash: SHA-256 hex digest of the ingested file's contents
+        :param assembly: reference assembly the file was ingested under
+        """
+
+    @abstractmethod
+    def get_vrs_ids_by_expressions(
+        self, expressions: Iterable[str], assembly: str
+    ) -> dict[str, str]:
+        """Look up VRS IDs previously registered for variant expressions
+
+        :param expressions: variant expressions (e.g. ``chrom-pos-ref-alt``) to look up
+        :param assembly: reference assembly the expressions refer to
+        :return: mapping of expressions to VRS IDs. Expressions that haven't been
+            registered are omitted.
+        """
+
+    @abstractmethod
+    def add_expression_vrs_ids(self, vrs_ids: Mapping[str, str], assembly: str) -> None:
+        """Record the VRS IDs that variant expressions were registered under. Will skip
+        conflicts.
+
+        :param vrs_ids: mapping of variant expressions to VRS IDs
+        :param assembly: reference assembly the expressions refer to
+        """
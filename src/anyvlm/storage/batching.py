@@ -0,0 +1,131 @@
+"""Coalesce concurrent CAF reads from storage into multi-key queries"""
+
+import asyncio
+from collections import defaultdict
+from collections.abc import Iterable
+
+from anyvlm.storage.base_storage import Storage
+from anyvlm.utils.batch_loader import BatchLoader
+from anyvlm.utils.types import AlleleCoordinates, AnyVlmCohortAlleleFrequencyResult
+
+
+class BatchedStorageReader:
+    """Serve the async CAF reads used by variant queries through batch loaders
+
+    Reads that arrive within ``window`` seconds of each other are answered by one
+    multi-key storage query, rather than one query (and one pooled connection) each.
+    This trades up to ``window`` seconds of added latency per read for fewer, larger
+    queries when many variant queries are served at once.
+    """
+
+    def __init__(
+        self, storage: Storage, window: float, max_batch_size: int = 100
+    ) -> None:
+        """Initialize batched reader
+
+        :param storage: AnyVLM storage instance to read from
+        :param window: seconds to wait for more reads after the first read of a batch
+        :param max_batch_size: number of distinct keys at which a batch is queried
+            without waiting for the window to close
+        :raise ValueError: if the window is negative or the max batch size isn't
+            positive
+        """
+        self.storage = storage
+        self._vrs_id_loader: BatchLoader[
+            str, list[AnyVlmCohortAlleleFrequencyResult]
+        ] = BatchLoader(
+            storage.get_cafs_by_vrs_allele_ids_async, window, max_batch_size
+        )
+        self._coordinates_loader: BatchLoader[
+            tuple[str, AlleleCoordinates], list[AnyVlmCohortAlleleFrequencyResult]
+        ] = BatchLoader(self._load_coordinates, window, max_batch_size)
+        self._liftover_loader: BatchLoader[str, str | None] = BatchLoader(
+            storage.get_liftover_ids_async, window, max_batch_size
+        )
+
+    async def get_cafs_by_vrs_allele_ids_async(
+        self, vrs_allele_ids: Iterable[str]
+    ) -> dict[str, list[AnyVlmCohortAlleleFrequencyResult]]:
+        """Retrieve cohort allele frequency study results for many VRS Allele IDs, as
+        part of the next batch
+
+        :param vrs_allele_ids: VRS Allele IDs to filter by
+        :return: mapping of each given VRS Allele ID to the cohort allele frequency
+            study results matching it, which may be empty. Will use iriReference for
+            focusAllele
+        """
+        vrs_allele_ids = list(dict.fromkeys(vrs_allele_ids))
+        cafs = await asyncio.gather(
+            *(
+                self._vrs_id_loader.load(vrs_allele_id)
+                for vrs_allele_id in vrs_allele_ids
+            )
+        )
+        # callers may modify results, so don't hand them lists shared with other callers
+        return {
+            vrs_allele_id: list(result)
+            for vrs_allele_id, result in zip(vrs_allele_ids, cafs, strict=True)
+        }
+
+    async def get_cafs_by_coordinates_async(
+        self, coordinates: AlleleCoordinates, assembly: str
+    ) -> list[AnyVlmCohortAlleleFrequencyResult]:
+        """Retrieve cohort allele frequency study results by allele coordinates, as
+        part of the next batch
+
+        :param coordinates: coordinates of the allele to look up
+        :param assembly: reference assembly the coordinates are on
+        :return: List of cohort allele frequency study results for the allele at the
+            given coordinates, if it was ingested, followed by those for its
+            lifted-over equivalent. Will use iriReference for focusAllele
+        """
+        return list(await self._coordinates_loader.load((assembly, coordinates)))
+
+    async def get_liftover_ids_async(
+        self, vrs_ids: Iterable[str]
+    ) -> dict[str, str | None]:
+        """Look up previously linked liftover equivalents of alleles, as part of the
+        next batch
+
+        :param vrs_ids: VRS Allele IDs to look up
+        :return: mapping of VRS IDs to the VRS IDs of their lifted-over equivalents, or
+            ``None`` where AnyVar had no liftover. Alleles that haven't been linked are
+            omitted.
+        """
+        vrs_ids = list(dict.fromkeys(vrs_ids))
+        # unlinked alleles are missing from batch results, so fail to load
+        results = await asyncio.gather(
+            *(self._liftover_loader.load(vrs_id) for vrs_id in vrs_ids),
+            return_exceptions=True,
+        )
+        linked: dict[str, str | None] = {}
+        for vrs_id, result in zip(vrs_ids, results, strict=True):
+            if isinstance(result, KeyError):
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            linked[vrs_id] = result
+        return linked
+
+    async def _load_coordinates(
+        self, keys: list[tuple[str, AlleleCoordinates]]
+    ) -> dict[tuple[str, AlleleCoordinates], list[AnyVlmCohortAlleleFrequencyResult]]:
+        """Look up a batch of coordinates, with one query per assembly
+
+        :param keys: assembly and coordinates of each allele to look up
+        :return: CAFs for each key
+        """
+        by_assembly: defaultdict[str, list[AlleleCoordinates]] = defaultdict(list)
+        for assembly, coordinates in keys:
+            by_assembly[assembly].append(coordinates)
+        results = await asyncio.gather(
+            *(
+                self.storage.get_cafs_by_many_coordinates_async(coordinates, assembly)
+                for assembly, coordinates in by_assembly.items()
+            )
+        )
+        return {
+            (assembly, coordinates): cafs
+            for assembly, result in zip(by_assembly, results, strict=True)
+            for coordinates, cafs in result.items()
+        }
@@ -2,6 +2,7 @@
 
 from anyvar.storage.orm import _camel_to_snake
 from sqlalchemy import (
+    BigInteger,
     Integer,
     String,
     create_engine,
@@ -50,6 +51,63 @@ class AlleleFrequencyData(Base):
     filter: Mapped[list[str] | None] = mapped_column(ARRAY(String), nullable=True)
 
 
+class RegisteredExpression(Base):
+    """AnyVLM ORM model mapping variant expressions to the VRS IDs AnyVar registered them under."""
+
+    assembly: Mapped[str] = mapped_column(String, primary_key=True)
+    expression: Mapped[str] = mapped_column(String, primary_key=True)
+    vrs_id: Mapped[str] = mapped_column(String, nullable=False)
+
+
+class AlleleCoordinate(Base):
+    """AnyVLM ORM model locating ingested alleles by VCF-style coordinates.
+
+    The composite primary key indexes the coordinates, so that variant queries can be
+    answered without translating them in AnyVar.
+    """
+
+    assembly: Mapped[str] = mapped_column(String, primary_key=True)
+    chromosome: Mapped[str] = mapped_column(String, primary_key=True)
+    position: Mapped[int] = mapped_column(Integer, primary_key=True)
+    ref: Mapped[str] = mapped_column(String, primary_key=True)
+    alt: Mapped[str] = mapped_column(String, primary_key=True)
+    vrs_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
+
+
+class LiftoverLink(Base):
+    """AnyVLM ORM model linking ingested alleles to their lifted-over equivalents.
+
+    A null ``liftover_vrs_id`` records that AnyVar has no liftover for the allele.
+    """
+
+    vrs_id: Mapped[str] = mapped_column(String, primary_key=True)
+    liftover_vrs_id: Mapped[str | None] = mapped_column(String, nullable=True)
+
+
+class IngestCheckpoint(Base):
+    """AnyVLM ORM model for tracking progress of VCF ingestion, for resumption.
+
+    ``region`` is empty when the whole file is ingested as one unit.
+    """
+
+    file_hash: Mapped[str] = mapped_column(String, primary_key=True)
+    assembly: Mapped[str] = mapped_column(String, primary_key=True)
+    region: Mapped[str] = mapped_column(String, primary_key=True)
+    items_committed: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
+class DatasetGeneration(Base):
+    """AnyVLM ORM model counting changes to stored data. Holds at most one row.
+
+    Every write that can change the result of a variant query increments
+    ``generation``, so that cached query results can be tagged with the generation
+    they were computed from.
+    """
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    generation: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
 def create_tables(db_url: str) -> None:
     """Create all tables in the database.
 
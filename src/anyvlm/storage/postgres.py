@@ -1,24 +1,67 @@
 """Provide PostgreSQL-based storage implementation."""
 
+import io
+from collections.abc import Iterable, Mapping, Sequence
 from urllib.parse import urlparse
 
-from sqlalchemy import create_engine, delete, select
+from sqlalchemy import (
+    ARRAY,
+    Row,
+    Select,
+    String,
+    any_,
+    bindparam,
+    create_engine,
+    delete,
+    literal,
+    select,
+    text,
+    tuple_,
+    union_all,
+)
 from sqlalchemy.dialects.postgresql import insert
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from anyvlm.storage import orm
 from anyvlm.storage.base_storage import (
     Storage,
+    validate_allele_frequency_rows,
 )
 from anyvlm.storage.mapper_registry import mapper_registry
 from anyvlm.storage.orm import create_tables
-from anyvlm.utils.types import AnyVlmCohortAlleleFrequencyResult
+from anyvlm.utils.types import (
+    AfBatch,
+    AlleleCoordinates,
+    AnyVlmCohortAlleleFrequencyResult,
+)
+
+
+def _copy_field(value: object) -> str:
+    """Format a value as a field in PostgreSQL's CSV ``COPY`` format
+
+    :param value: column value. Lists are formatted as PostgreSQL array literals.
+    :return: CSV field. ``None`` is an unquoted empty field, which ``COPY`` reads as
+        ``NULL``; everything else is quoted, so empty strings are preserved.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        elements = (
+            "NULL"
+            if element is None
+            else '"' + str(element).replace("\\", "\\\\").replace('"', '\\"') + '"'
+            for element in value
+        )
+        value = "{" + ",".join(elements) + "}"
+    return '"' + str(value).replace('"', '""') + '"'
 
 
 class PostgresObjectStore(Storage):
     """PostgreSQL storage backend using dedicated ORM tables."""
 
     MAX_ROWS = 100
+    # Batches of at least this many CAFs are bulk loaded with COPY rather than INSERT
+    COPY_MIN_ROWS = 500
 
     def __init__(self, db_url: str, *args, **kwargs) -> None:
         """Initialize PostgreSQL storage.
@@ -37,6 +80,11 @@ class PostgresObjectStore(Storage):
         """Wipe all data from the storage backend."""
         with self.session_factory() as session, session.begin():
             session.execute(delete(orm.AlleleFrequencyData))
+            session.execute(delete(orm.IngestCheckpoint))
+            session.execute(delete(orm.RegisteredExpression))
+            session.execute(delete(orm.AlleleCoordinate))
+            session.execute(delete(orm.LiftoverLink))
+            self._bump_generation(session)
 
     @property
     def sanitized_url(self) -> str:
@@ -64,11 +112,115 @@ class PostgresObjectStore(Storage):
         if not cafs:
             return
 
-        db_entities = [mapper_registry.to_db_entity(caf) for caf in cafs]
-        stmt = insert(orm.AlleleFrequencyData).on_conflict_do_nothing()
+        self._insert_allele_frequencies(
+            [mapper_registry.to_db_entity(caf).to_dict() for caf in cafs]
+        )
+
+    def add_allele_frequency_rows(
+        self, vrs_ids: Sequence[str], afs: AfBatch, cohort: str
+    ) -> None:
+        """Add allele frequency data to the database directly from parsed VCF values,
+        without constructing CAF objects. Will skip conflicts.
+
+        :param vrs_ids: VRS Allele ID for each set of allele frequency data
+        :param afs: allele frequency data, in the same order as ``vrs_ids``. Expressions
+            in the batch are ignored.
+        :param cohort: name of the cohort the allele frequencies describe
+        :raise ValueError: if input is invalid
+        """
+        validate_allele_frequency_rows(vrs_ids, afs, cohort)
+        if not afs:
+            return
+
+        self._insert_allele_frequencies(
+            [
+                {
+                    "vrs_id": vrs_id,
+                    "cohort": cohort,
+                    "an": an,
+                    "ac": ac,
+                    "ac_het": ac_het,
+                    "ac_hom": ac_hom,
+                    "ac_hemi": ac_hemi,
+                    "filter": filters,
+                }
+                for vrs_id, an, ac, ac_het, ac_hom, ac_hemi, filters in zip(
+                    vrs_ids,
+                    afs.an,
+                    afs.ac,
+                    afs.ac_het,
+                    afs.ac_hom,
+                    afs.ac_hemi,
+                    afs.filters,
+                    strict=True,
+                )
+            ]
+        )
+
+    def _insert_allele_frequencies(self, rows: list[dict]) -> None:
+        """Insert allele frequency rows, skipping conflicts
 
+        :param rows: allele frequency table rows, as column name to value mappings
+        """
+        if len(rows) >= self.COPY_MIN_ROWS:
+            self._copy_allele_frequencies(rows)
+            return
+
+        # a single multi-row VALUES statement, so that its rowcount is reliable
+        stmt = insert(orm.AlleleFrequencyData).values(rows).on_conflict_do_nothing()
         with self.session_factory() as session, session.begin():
-            session.execute(stmt, [entity.to_dict() for entity in db_entities])
+            if session.execute(stmt).rowcount:  # type: ignore[attr-defined]
+                self._bump_generation(session)
+
+    def _copy_allele_frequencies(self, rows: list[dict]) -> None:
+        """Bulk load allele frequency rows, skipping conflicts
+
+        Rows are streamed with ``COPY`` into a temporary staging table, then merged
+        into the allele frequency table with a single ``INSERT ... SELECT``. Rows that
+        conflict with each other are deduplicated first, keeping the first, so the
+        result is the same as inserting them one at a time.
+
+        :param rows: allele frequency table rows, as column name to value mappings
+        """
+        table = orm.AlleleFrequencyData.__table__
+        columns = [column.name for column in table.columns]
+        primary_key = [column.name for column in table.primary_key]
+
+        unique_rows: dict[tuple, dict] = {}
+        for row in rows:
+            unique_rows.setdefault(tuple(row[column] for column in primary_key), row)
+        buffer = io.StringIO()
+        for row in unique_rows.values():
+            buffer.write(",".join(_copy_field(row[column]) for column in columns))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        column_list = ", ".join(f'"{column}"' for column in columns)
+        with self.session_factory() as session, session.begin():
+            # CREATE TABLE AS doesn't copy NOT NULL constraints, so constraint
+            # violations are raised by the merge, the same as for a plain INSERT
+            session.execute(
+                text(
+                    f"CREATE TEMPORARY TABLE allele_frequency_data_staging "  # noqa: S608
+                    f"ON COMMIT DROP AS SELECT {column_list} FROM {table.name} WITH NO DATA"
+                )
+            )
+            dbapi_connection = session.connection().connection.dbapi_connection
+            with dbapi_connection.cursor() as cursor:  # type: ignore[union-attr]
+                cursor.copy_expert(
+                    f"COPY allele_frequency_data_staging ({column_list}) "
+                    "FROM STDIN WITH (FORMAT csv)",
+                    buffer,
+                )
+            merged = session.execute(
+                text(
+                    f"INSERT INTO {table.name} ({column_list}) "  # noqa: S608
+                    f"SELECT {column_list} FROM allele_frequency_data_staging "
+                    "ON CONFLICT DO NOTHING"
+                )
+            )
+            if merged.rowcount:  # type: ignore[attr-defined]
+                self._bump_generation(session)
 
     def get_cafs_by_vrs_allele_id(
         self, vrs_allele_id: str
@@ -81,14 +233,418 @@ class PostgresObjectStore(Storage):
         """
         cafs: list[AnyVlmCohortAlleleFrequencyResult] = []
         with self.session_factory() as session:
-            stmt = (
-                select(orm.AlleleFrequencyData)
-                .where(orm.AlleleFrequencyData.vrs_id == vrs_allele_id)
-                .limit(self.MAX_ROWS)
-            )
-            db_objects = session.scalars(stmt).all()
+            db_objects = session.scalars(
+                self._select_cafs_by_vrs_allele_id(vrs_allele_id)
+            ).all()
 
             for db_object in db_objects:
                 caf = mapper_registry.from_db_entity(db_object)
                 cafs.append(caf)
         return cafs
+
+    def _select_cafs_by_vrs_allele_id(self, vrs_allele_id: str) -> Select:
+        """Build the query for allele frequency data of a VRS Allele
+
+        :param vrs_allele_id: VRS Allele ID to filter by
+        :return: select statement for matching allele frequency rows
+        """
+        return (
+            select(orm.AlleleFrequencyData)
+            .where(orm.AlleleFrequencyData.vrs_id == vrs_allele_id)
+            .limit(self.MAX_ROWS)
+        )
+
+    def get_cafs_by_vrs_allele_ids(
+        self, vrs_allele_ids: Iterable[str]
+    ) -> dict[str, list[AnyVlmCohortAlleleFrequencyResult]]:
+        """Retrieve cohort allele frequency study results for many VRS Allele IDs at once
+
+        All IDs are looked up with a single query.
+
+        :param vrs_allele_ids: VRS Allele IDs to filter by
+        :return: mapping of each given VRS Allele ID to the cohort allele frequency
+            study results matching it, which may be empty. Will use iriReference for
+            focusAllele
+        """
+        vrs_allele_ids = list(dict.fromkeys(vrs_allele_ids))
+        if not vrs_allele_ids:
+            return {}
+        with self.session_factory() as session:
+            db_objects = session.scalars(
+                self._select_cafs_by_vrs_allele_ids(vrs_allele_ids)
+            ).all()
+            return self._group_cafs_by_vrs_allele_id(vrs_allele_ids, db_objects)
+
+    def _select_cafs_by_vrs_allele_ids(self, vrs_allele_ids: list[str]) -> Select:
+        """Build the query for allele frequency data of many VRS Alleles
+
+        IDs are bound as a single array parameter (``vrs_id = ANY(:vrs_ids)``), so the
+        statement is the same whatever the number of IDs.
+
+        :param vrs_allele_ids: distinct VRS Allele IDs to filter by
+        :return: select statement for matching allele frequency rows
+        """
+        return (
+            select(orm.AlleleFrequencyData)
+            .where(
+                orm.AlleleFrequencyData.vrs_id
+                == any_(bindparam("vrs_ids", vrs_allele_ids, type_=ARRAY(String)))
+            )
+            .limit(self.MAX_ROWS * len(vrs_allele_ids))
+        )
+
+    @staticmethod
+    def _group_cafs_by_vrs_allele_id(
+        vrs_allele_ids: list[str], db_objects: Iterable[orm.AlleleFrequencyData]
+    ) -> dict[str, list[AnyVlmCohortAlleleFrequencyResult]]:
+        """Convert allele frequency rows to CAFs, grouped by VRS Allele ID
+
+        :param vrs_allele_ids: VRS Allele IDs that were looked up
+        :param db_objects: allele frequency rows matching ``vrs_allele_ids``
+        :return: mapping of each of ``vrs_allele_ids`` to its CAFs, which may be empty
+        """
+        cafs: dict[str, list[AnyVlmCohortAlleleFrequencyResult]] = {
+            vrs_allele_id: [] for vrs_allele_id in vrs_allele_ids
+        }
+        for db_object in db_objects:
+            cafs[db_object.vrs_id].append(mapper_registry.from_db_entity(db_object))
+        return cafs
+
+    def add_allele_coordinates(
+        self,
+        vrs_ids: Sequence[str],
+        coordinates: Sequence[AlleleCoordinates],
+        assembly: str,
+    ) -> None:
+        """Record the coordinates of alleles with allele frequency data. Will skip
+        conflicts.
+
+        :param vrs_ids: VRS Allele ID of each allele
+        :param coordinates: coordinates of each allele, in the same order as ``vrs_ids``
+        :param assembly: reference assembly the coordinates are on
+        :raise ValueError: if lengths differ
+        """
+        if len(vrs_ids) != len(coordinates):
+            msg = f"Got {len(vrs_ids)} VRS IDs but {len(coordinates)} coordinates"
+            raise ValueError(msg)
+        if not vrs_ids:
+            return
+        stmt = insert(orm.AlleleCoordinate).on_conflict_do_nothing()
+        with self.session_factory() as session, session.begin():
+            session.execute(
+                stmt,
+                [
+                    {"assembly": assembly, "vrs_id": vrs_id, **allele._asdict()}
+                    for vrs_id, allele in zip(vrs_ids, coordinates, strict=True)
+                ],
+            )
+
+    def get_cafs_by_coordinates(
+        self, coordinates: AlleleCoordinates, assembly: str
+    ) -> list[AnyVlmCohortAlleleFrequencyResult]:
+        """Retrieve cohort allele frequency study results by allele coordinates
+
+        Results for the allele's lifted-over equivalent are included too, if it has
+        been linked with :py:meth:`add_liftover_ids`.
+
+        :param coordinates: coordinates of the allele to look up
+        :param assembly: reference assembly the coordinates are on
+        :return: List of cohort allele frequency study results for the allele at the
+            given coordinates, if it was ingested, followed by those for its
+            lifted-over equivalent. Will use iriReference for focusAllele
+        """
+        return self.get_cafs_by_many_coordinates([coordinates], assembly)[coordinates]
+
+    def get_cafs_by_many_coordinates(
+        self, coordinates: Iterable[AlleleCoordinates], assembly: str
+    ) -> dict[AlleleCoordinates, list[AnyVlmCohortAlleleFrequencyResult]]:
+        """Retrieve cohort allele frequency study results for many alleles at once, by
+        their coordinates
+
+        All coordinates are looked up with a single query.
+
+        :param coordinates: coordinates of the alleles to look up
+        :param assembly: reference assembly the coordinates are on
+        :return: mapping of each given set of coordinates to the cohort allele
+            frequency study results for the allele there, followed by those for its
+            lifted-over equivalent. Results may be empty. Will use iriReference for
+            focusAllele
+        """
+        coordinates = list(dict.fromkeys(coordinates))
+        if not coordinates:
+            return {}
+        with self.session_factory() as session:
+            rows = session.execute(
+                self._select_cafs_by_coordinates(coordinates, assembly)
+            ).all()
+            return self._group_cafs_by_coordinates(coordinates, rows)
+
+    def _select_cafs_by_coordinates(
+        self, coordinates: list[AlleleCoordinates], assembly: str
+    ) -> Select:
+        """Build the query for allele frequency data of the alleles at given
+        coordinates and of their linked liftover equivalents
+
+        :param coordinates: distinct coordinates of the alleles to look up
+        :param assembly: reference assembly the coordinates are on
+        :return: select statement for matching allele frequency rows, each with the
+            coordinates it was matched by. Each queried allele's rows come before its
+            liftover's.
+        """
+        matched = (
+            select(
+                orm.AlleleCoordinate.chromosome,
+                orm.AlleleCoordinate.position,
+                orm.AlleleCoordinate.ref,
+                orm.AlleleCoordinate.alt,
+                orm.AlleleCoordinate.vrs_id,
+            )
+            .where(
+                orm.AlleleCoordinate.assembly == assembly,
+                tuple_(
+                    orm.AlleleCoordinate.chromosome,
+                    orm.AlleleCoordinate.position,
+                    orm.AlleleCoordinate.ref,
+                    orm.AlleleCoordinate.alt,
+                ).in_(coordinates),
+            )
+            .cte("matched")
+        )
+        locus = (
+            matched.c.chromosome,
+            matched.c.position,
+            matched.c.ref,
+            matched.c.alt,
+        )
+        targets = union_all(
+            select(
+                *locus,
+                matched.c.vrs_id.label("target_vrs_id"),
+                literal(0).label("is_liftover"),
+            ),
+            select(
+                *locus,
+                orm.LiftoverLink.liftover_vrs_id.label("target_vrs_id"),
+                literal(1).label("is_liftover"),
+            ).join(orm.LiftoverLink, orm.LiftoverLink.vrs_id == matched.c.vrs_id),
+        ).subquery("targets")
+        return (
+            select(
+                orm.AlleleFrequencyData,
+                targets.c.chromosome,
+                targets.c.position,
+                targets.c.ref,
+                targets.c.alt,
+            )
+            .join(targets, orm.AlleleFrequencyData.vrs_id == targets.c.target_vrs_id)
+            .order_by(targets.c.is_liftover)
+            .limit(self.MAX_ROWS * len(coordinates))
+        )
+
+    @staticmethod
+    def _group_cafs_by_coordinates(
+        coordinates: list[AlleleCoordinates], rows: Iterable[Row]
+    ) -> dict[AlleleCoordinates, list[AnyVlmCohortAlleleFrequencyResult]]:
+        """Convert allele frequency rows to CAFs, grouped by the coordinates they
+        were matched by
+
+        :param coordinates: coordinates that were looked up
+        :param rows: rows selected by :py:meth:`_select_cafs_by_coordinates`
+        :return: mapping of each of ``coordinates`` to its CAFs, which may be empty
+        """
+        cafs: dict[AlleleCoordinates, list[AnyVlmCohortAlleleFrequencyResult]] = {
+            allele: [] for allele in coordinates
+        }
+        for db_object, *locus in rows:
+            cafs[AlleleCoordinates(*locus)].append(
+                mapper_registry.from_db_entity(db_object)
+            )
+        return cafs
+
+    def get_liftover_ids(self, vrs_ids: Iterable[str]) -> dict[str, str | None]:
+        """Look up previously linked liftover equivalents of alleles
+
+        :param vrs_ids: VRS Allele IDs to look up
+        :return: mapping of VRS IDs to the VRS IDs of their lifted-over equivalents, or
+            ``None`` where AnyVar had no liftover. Alleles that haven't been linked are
+            omitted.
+        """
+        vrs_ids = list(vrs_ids)
+        if not vrs_ids:
+            return {}
+        with self.session_factory() as session:
+            return dict(
+                session.execute(self._select_liftover_ids(vrs_ids)).tuples().all()
+            )
+
+    @staticmethod
+    def _select_liftover_ids(vrs_ids: list[str]) -> Select:
+        """Build the query for the liftover links of alleles
+
+        :param vrs_ids: VRS Allele IDs to look up
+        :return: select statement for matching VRS ID and liftover VRS ID pairs
+        """
+        return select(orm.LiftoverLink.vrs_id, orm.LiftoverLink.liftover_vrs_id).where(
+            orm.LiftoverLink.vrs_id.in_(vrs_ids)
+        )
+
+    def add_liftover_ids(self, liftover_ids: Mapping[str, str | None]) -> None:
+        """Link alleles to their lifted-over equivalents. Will skip conflicts.
+
+        :param liftover_ids: mapping of VRS IDs to the VRS IDs of their lifted-over
+            equivalents, or ``None`` where AnyVar has no liftover
+        """
+        if not liftover_ids:
+            return
+        stmt = insert(orm.LiftoverLink).on_conflict_do_nothing()
+        with self.session_factory() as session, session.begin():
+            session.execute(
+                stmt,
+                [
+                    {"vrs_id": vrs_id, "liftover_vrs_id": liftover_vrs_id}
+                    for vrs_id, liftover_vrs_id in liftover_ids.items()
+                ],
+            )
+
+    def get_generation(self) -> int:
+        """Get the current dataset generation
+
+        The generation increases with every write that adds allele frequency data, and
+        when the database is wiped, so results cached under one generation are stale
+        once it changes. Coordinates and liftover links don't change it: they only
+        speed up finding allele frequency data that's already stored.
+
+        :return: current generation number, 0 if nothing has been written
+        """
+        with self.session_factory() as session:
+            return session.scalar(self._select_generation()) or 0
+
+    @staticmethod
+    def _select_generation() -> Select:
+        """Build the query for the current dataset generation
+
+        :return: select statement for the generation number
+        """
+        return select(orm.DatasetGeneration.generation).where(
+            orm.DatasetGeneration.id == 1
+        )
+
+    @staticmethod
+    def _bump_generation(session: Session) -> None:
+        """Increment the dataset generation, as part of a write's transaction
+
+        The increment is committed with the write it accompanies, so readers never see
+        new data under an old generation. Concurrent writers serialize on the
+        generation row, so only call it for writes that changed something, and last in
+        the transaction, to hold the row's lock for as short a time as possible.
+
+        :param session: session with the write's open transaction
+        """
+        stmt = insert(orm.DatasetGeneration).values(id=1, generation=1)
+        session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[orm.DatasetGeneration.id],
+                set_={"generation": orm.DatasetGeneration.generation + 1},
+            )
+        )
+
+    def get_ingest_checkpoint(self, file_hash: str, assembly: str, region: str) -> int:
+        """Retrieve the number of items committed by a previous ingestion attempt
+
+        :param file_hash: SHA-256 hex digest of the ingested file's contents
+        :param assembly: reference assembly the file was ingested under
+        :param region: region of the file being ingested, or ``""`` for the whole file
+        :return: number of items (one per alternate allele) already committed, or 0
+            if there is no checkpoint
+        """
+        with self.session_factory() as session:
+            items_committed = session.scalar(
+                select(orm.IngestCheckpoint.items_committed).where(
+                    orm.IngestCheckpoint.file_hash == file_hash,
+                    orm.IngestCheckpoint.assembly == assembly,
+                    orm.IngestCheckpoint.region == region,
+                )
+            )
+        return items_committed or 0
+
+    def set_ingest_checkpoint(
+        self, file_hash: str, assembly: str, region: str, items_committed: int
+    ) -> None:
+        """Record the number of items committed so far by an ingestion
+
+        :param file_hash: SHA-256 hex digest of the ingested file's contents
+        :param assembly: reference assembly the file is ingested under
+        :param region: region of the file being ingested, or ``""`` for the whole file
+        :param items_committed: number of items (one per alternate allele) committed
+        """
+        stmt = insert(orm.IngestCheckpoint).values(
+            file_hash=file_hash,
+            assembly=assembly,
+            region=region,
+            items_committed=items_committed,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                orm.IngestCheckpoint.file_hash,
+                orm.IngestCheckpoint.assembly,
+                orm.IngestCheckpoint.region,
+            ],
+            set_={"items_committed": stmt.excluded.items_committed},
+        )
+        with self.session_factory() as session, session.begin():
+            session.execute(stmt)
+
+    def delete_ingest_checkpoints(self, file_hash: str, assembly: str) -> None:
+        """Remove all checkpoints for a file, e.g. once it has been fully ingested
+
+        :param file_hash: SHA-256 hex digest of the ingested file's contents
+        :param assembly: reference assembly the file was ingested under
+        """
+        with self.session_factory() as session, session.begin():
+            session.execute(
+                delete(orm.IngestCheckpoint).where(
+                    orm.IngestCheckpoint.file_hash == file_hash,
+                    orm.IngestCheckpoint.assembly == assembly,
+                )
+            )
+
+    def get_vrs_ids_by_expressions(
+        self, expressions: Iterable[str], assembly: str
+    ) -> dict[str, str]:
+        """Look up VRS IDs previously registered for variant expressions
+
+        :param expressions: variant expressions (e.g. ``chrom-pos-ref-alt``) to look up
+        :param assembly: reference assembly the expressions refer to
+        :return: mapping of expressions to VRS IDs. Expressions that haven't been
+            registered are omitted.
+        """
+        expressions = list(expressions)
+        if not expressions:
+            return {}
+        stmt = select(
+            orm.RegisteredExpression.expression, orm.RegisteredExpression.vrs_id
+        ).where(
+            orm.RegisteredExpression.assembly == assembly,
+            orm.RegisteredExpression.expression.in_(expressions),
+        )
+        with self.session_factory() as session:
+            return dict(session.execute(stmt).tuples().all())
+
+    def add_expression_vrs_ids(self, vrs_ids: Mapping[str, str], assembly: str) -> None:
+        """Record the VRS IDs that variant expressions were registered under. Will skip
+        conflicts.
+
+        :param vrs_ids: mapping of variant expressions to VRS IDs
+        :param assembly: reference assembly the expressions refer to
+        """
+        if not vrs_ids:
+            return
+        stmt = insert(orm.RegisteredExpression).on_conflict_do_nothing()
+        with self.session_factory() as session, session.begin():
+            session.execute(
+                stmt,
+                [
+                    {"assembly": assembly, "expression": expression, "vrs_id": vrs_id}
+                    for expression, vrs_id in vrs_ids.items()
+                ],
+            )
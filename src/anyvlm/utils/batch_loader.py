@@ -0,0 +1,105 @@
+"""Coalesce concurrent single-key lookups into batched lookups"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Hashable, Mapping
+from typing import Generic, TypeVar
+
+_logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BatchLoader(Generic[K, V]):
+    """Collect keys requested within a short window, and load them with one call
+
+    The first key requested after a batch is dispatched starts a new window. When the
+    window closes, or once ``max_batch_size`` distinct keys are waiting, all waiting
+    keys are passed to ``load_batch`` at once, and each caller receives the value for
+    its own key. Concurrent requests for the same key share a single lookup.
+
+    Must only be used from one event loop at a time.
+    """
+
+    def __init__(
+        self,
+        load_batch: Callable[[list[K]], Awaitable[Mapping[K, V]]],
+        window: float,
+        max_batch_size: int = 100,
+    ) -> None:
+        """Initialize batch loader
+
+        :param load_batch: coroutine function that looks up a list of distinct keys,
+            returning a mapping with a value for each
+        :param window: seconds to wait for more keys after the first key of a batch
+        :param max_batch_size: number of distinct keys at which a batch is dispatched
+            without waiting for the window to close
+        :raise ValueError: if the window is negative or the max batch size isn't
+            positive
+        """
+        if window < 0:
+            msg = f"Batch window must not be negative, got {window}"
+            raise ValueError(msg)
+        if max_batch_size < 1:
+            msg = f"Max batch size must be at least 1, got {max_batch_size}"
+            raise ValueError(msg)
+        self._load_batch = load_batch
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._pending: dict[K, asyncio.Future[V]] = {}
+        self._dispatch_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> V:
+        """Look up a single key, as part of the next batch
+
+        :param key: key to look up
+        :return: value that ``load_batch`` returned for the key
+        :raise KeyError: if ``load_batch`` returned no value for the key
+        :raise Exception: whatever ``load_batch`` raised, if it failed
+        """
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._dispatch()
+            elif self._dispatch_handle is None:
+                self._dispatch_handle = loop.call_later(self.window, self._dispatch)
+        # other callers may be waiting on the same key, so a cancelled caller mustn't
+        # cancel the shared lookup
+        return await asyncio.shield(future)
+
+    def _dispatch(self) -> None:
+        """Start loading all waiting keys, and open a new window for later keys"""
+        if self._dispatch_handle is not None:
+            self._dispatch_handle.cancel()
+            self._dispatch_handle = None
+        batch, self._pending = self._pending, {}
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        # hold a reference, so that the task isn't garbage collected while running
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: dict[K, asyncio.Future[V]]) -> None:
+        """Load a batch of keys and hand each waiting caller its value
+
+        :param batch: futures awaited by callers, by key
+        """
+        _logger.debug("Loading batch of %s keys", len(batch))
+        try:
+            values = await self._load_batch(list(batch))
+        except Exception as e:  # noqa: BLE001
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in batch.items():
+            if future.done():
+                continue
+            if key in values:
+                future.set_result(values[key])
+            else:
+                future.set_exception(KeyError(key))
@@ -1,8 +1,11 @@
 """Provide helpful type definitions, references, and type-based operations."""
 
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 from enum import StrEnum
+from itertools import compress
 from types import MappingProxyType
-from typing import Annotated
+from typing import Annotated, NamedTuple
 
 from anyvar.mapping.liftover import ReferenceAssembly
 from ga4gh.va_spec.base import CohortAlleleFrequencyStudyResult
@@ -23,6 +26,69 @@ class QualityMeasures(BaseModel):
     qcFilters: list[str] | None = None  # noqa: N815
 
 
+class AlleleCoordinates(NamedTuple):
+    """Locate a VCF-style allele on a reference assembly
+
+    ``chromosome`` is normalized to drop any "chr" prefix, so that alleles ingested
+    from VCFs using either naming convention can be found by the same query.
+    """
+
+    chromosome: str
+    position: int
+    ref: str
+    alt: str
+
+    @classmethod
+    def from_expression(cls, expression: str) -> "AlleleCoordinates":
+        """Parse a gnomAD-style allele expression
+
+        :param expression: expression formatted as ``chrom-pos-ref-alt``
+        :return: allele coordinates
+        :raise ValueError: if the expression isn't formatted as expected
+        """
+        chromosome, position, ref, alt = expression.rsplit("-", 3)
+        return cls(chromosome.upper().removeprefix("CHR"), int(position), ref, alt)
+
+
+@dataclass
+class AfBatch:
+    """Allele frequency data for a batch of alternate alleles, held column-wise
+
+    The i'th element of each column describes the i'th allele in the batch.
+    """
+
+    expressions: list[str] = field(default_factory=list)
+    ac: list[int] = field(default_factory=list)
+    an: list[int] = field(default_factory=list)
+    ac_het: list[int | None] = field(default_factory=list)
+    ac_hom: list[int | None] = field(default_factory=list)
+    ac_hemi: list[int | None] = field(default_factory=list)
+    filters: list[list[str]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        """Get the number of alleles in the batch
+
+        :return: batch length
+        """
+        return len(self.expressions)
+
+    def select(self, keep: Sequence[bool]) -> "AfBatch":
+        """Filter the batch down to a subset of its alleles
+
+        :param keep: whether to keep each allele in the batch
+        :return: new batch containing only the kept alleles, in their original order
+        """
+        return AfBatch(
+            expressions=list(compress(self.expressions, keep)),
+            ac=list(compress(self.ac, keep)),
+            an=list(compress(self.an, keep)),
+            ac_het=list(compress(self.ac_het, keep)),
+            ac_hom=list(compress(self.ac_hom, keep)),
+            ac_hemi=list(compress(self.ac_hemi, keep)),
+            filters=list(compress(self.filters, keep)),
+        )
+
+
 class AnyVlmCohortAlleleFrequencyResult(CohortAlleleFrequencyStudyResult):
     """Define model for AnyVLM Cohort Allele Frequency Result
 
@@ -1,11 +1,12 @@
 """Test that get_cafs function works correctly"""
 
+import anyio
 import pytest
 from deepdiff import DeepDiff
 from helpers import EXPECTED_VRS_ID, TEST_VARIANT, build_caf
 
 from anyvlm.anyvar.python_client import PythonAnyVarClient
-from anyvlm.functions.get_cafs import get_cafs
+from anyvlm.functions.get_cafs import get_cafs, get_cafs_async
 from anyvlm.storage.postgres import PostgresObjectStore
 from anyvlm.utils.exceptions import VariantLookupError
 from anyvlm.utils.types import AnyVlmCohortAlleleFrequencyResult
@@ -44,6 +45,31 @@ def test_get_cafs_results_returned(
     assert diff == {}
 
 
+@pytest.mark.vcr
+def test_get_cafs_async_results_returned(
+    anyvar_populated_python_client: PythonAnyVarClient,
+    populated_postgres_storage: PostgresObjectStore,
+    expected_cafs: list[AnyVlmCohortAlleleFrequencyResult],
+):
+    """Test that get_cafs_async matches get_cafs when results are expected"""
+    cafs = anyio.run(
+        get_cafs_async,
+        anyvar_populated_python_client,
+        populated_postgres_storage,
+        TEST_VARIANT.assembly,
+        TEST_VARIANT.chromosome,
+        TEST_VARIANT.position,
+        TEST_VARIANT.ref,
+        TEST_VARIANT.alt,
+    )
+    diff = DeepDiff(
+        [caf.model_dump(exclude_none=True) for caf in cafs],
+        [caf.model_dump(exclude_none=True) for caf in expected_cafs],
+        ignore_order=True,
+    )
+    assert diff == {}
+
+
 @pytest.mark.vcr
 def test_get_cafs_no_results_returned(
     anyvar_populated_python_client: PythonAnyVarClient,
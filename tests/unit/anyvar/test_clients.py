@@ -7,12 +7,29 @@ variants deposited by the `put_objects` test are all that's in there (i.e. use a
 AnyVar DB to record new test cassettes)
 """
 
+import json
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import ClassVar
+from unittest.mock import MagicMock
+
+import anyio
 import pytest
+import requests
 from anyvar.anyvar import create_storage
+from anyvar.translate.base import TranslationError
 from ga4gh.vrs import models
 
-from anyvlm.anyvar.base_client import BaseAnyVarClient
+from anyvlm.anyvar.base_client import (
+    AnyVarClientConnectionError,
+    AnyVarClientError,
+    BaseAnyVarClient,
+)
 from anyvlm.anyvar.http_client import HttpAnyVarClient
+from anyvlm.anyvar.python_client import PythonAnyVarClient
 
 
 @pytest.fixture
@@ -52,8 +69,9 @@ POPULATED_CLIENTS = [
 ]
 
 
+# the HTTP client's expression lookups are tested against a local fake AnyVar below
 @pytest.mark.vcr
-@pytest.mark.parametrize("anyvar_client", UNPOPULATED_CLIENTS, indirect=True)
+@pytest.mark.parametrize("anyvar_client", ["anyvar_python_client"], indirect=True)
 def test_retrieve_allele_by_expression_unpopulated(
     anyvar_client: BaseAnyVarClient, alleles: dict
 ):
@@ -70,7 +88,9 @@ def test_retrieve_allele_by_expression_unpopulated(
 
 
 @pytest.mark.vcr
-@pytest.mark.parametrize("anyvar_client", POPULATED_CLIENTS, indirect=True)
+@pytest.mark.parametrize(
+    "anyvar_client", ["anyvar_populated_python_client"], indirect=True
+)
 def test_retrieve_allele_by_expression_populated(
     anyvar_client: BaseAnyVarClient, alleles: dict
 ):
@@ -109,3 +129,322 @@ def test_put_allele_expressions_handle_invalid(
         ["Y-2781761-A-C", allele_fixture["vcf_expression"]]
     )
     assert results == [None, allele_fixture["variation"]["id"]]
+
+
+def test_retrieve_alleles_by_expression_python(
+    anyvar_populated_python_client: PythonAnyVarClient, alleles: dict
+):
+    """Test bulk `retrieve_alleles_by_expression` for the Python client"""
+    allele_fixtures = [
+        allele_fixture
+        for allele_fixture in alleles.values()
+        if "vcf_expression" in allele_fixture
+    ]
+    results = anyvar_populated_python_client.retrieve_alleles_by_expression(
+        ["Y-2781761-A-C"]  # wrong REF
+        + [allele_fixture["vcf_expression"] for allele_fixture in allele_fixtures]
+    )
+    assert results == [None] + [
+        models.Allele(**allele_fixture["variation"])
+        for allele_fixture in allele_fixtures
+    ]
+
+
+def test_http_client_timeout(monkeypatch):
+    """Test that a request that times out is reported as a connection failure"""
+
+    def request(*args, **kwargs):
+        raise requests.ReadTimeout
+
+    monkeypatch.setattr(requests.Session, "request", request)
+    with pytest.raises(AnyVarClientConnectionError):
+        HttpAnyVarClient().put_allele_expressions(["chr14-18223529-C-A"])
+
+
+class _FakeAnyVarHandler(BaseHTTPRequestHandler):
+    """Register each expression under an ID derived from it, optionally failing the
+    first request with a 503
+
+    Variation searches find the alleles in ``registered``, keyed by definition, and
+    respond with ``search_status`` for any other definition.
+    """
+
+    fail_first = False
+    registered: ClassVar[dict[str, dict]] = {}
+    search_status = HTTPStatus.NOT_FOUND
+    delay = 0.0
+    requests_received = 0
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_PUT(self) -> None:
+        cls = type(self)
+        with cls.lock:
+            cls.requests_received += 1
+            first = cls.requests_received == 1
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(cls.delay)
+            if cls.fail_first and first:
+                self.send_response(HTTPStatus.SERVICE_UNAVAILABLE)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if self.path == "/variation":
+                self._send_search_response(payload["definition"])
+                return
+            self._send_json(
+                HTTPStatus.OK,
+                [
+                    {
+                        "input_variation": item,
+                        "messages": [],
+                        "object": None,
+                        "object_id": f"ga4gh:VA.{item['definition']}",
+                    }
+                    for item in payload
+                ],
+            )
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    do_POST = do_PUT  # noqa: N815
+
+    def _send_search_response(self, definition: str) -> None:
+        """Respond to a variation search the way AnyVar's ``POST /variation`` does"""
+        cls = type(self)
+        if definition in cls.registered:
+            self._send_json(
+                HTTPStatus.OK, {"messages": [], "data": cls.registered[definition]}
+            )
+        elif cls.search_status == HTTPStatus.NOT_FOUND:
+            self._send_json(
+                HTTPStatus.NOT_FOUND, {"detail": f"VRS Object {definition} not found"}
+            )
+        else:
+            self._send_json(cls.search_status, {"detail": "Internal Server Error"})
+
+    def _send_json(self, status: HTTPStatus, content: dict | list) -> None:
+        body = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def fake_anyvar_handler():
+    """Provide a fresh fake AnyVar request handler class, with its own counters"""
+    return type("FakeAnyVarHandler", (_FakeAnyVarHandler,), {"lock": threading.Lock()})
+
+
+@pytest.fixture
+def fake_anyvar_uri(fake_anyvar_handler):
+    """Serve the fake AnyVar handler on a local port"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), fake_anyvar_handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_http_client_retrieve_allele_by_expression(
+    fake_anyvar_handler, fake_anyvar_uri, alleles: dict
+):
+    """Test that registered expressions are found, and unregistered ones aren't"""
+    expressions = {
+        allele_fixture["vcf_expression"]: models.Allele(**allele_fixture["variation"])
+        for allele_fixture in alleles.values()
+        if "vcf_expression" in allele_fixture
+    }
+    unregistered = "Y-2781761-A-C"
+    fake_anyvar_handler.registered = {
+        expression: allele.model_dump(exclude_none=True)
+        for expression, allele in expressions.items()
+    }
+    client = HttpAnyVarClient(fake_anyvar_uri)
+
+    async def lookup() -> list:
+        try:
+            return await client.retrieve_alleles_by_expression_async(
+                [*expressions, unregistered]
+            )
+        finally:
+            await client.close_async()
+
+    for expression, allele in expressions.items():
+        assert client.retrieve_allele_by_expression(expression) == allele
+    assert client.retrieve_allele_by_expression(unregistered) is None
+    assert anyio.run(lookup) == [*expressions.values(), None]
+
+
+def test_http_client_retries_transient_errors(fake_anyvar_handler, fake_anyvar_uri):
+    """Test that a transient error status is retried"""
+    fake_anyvar_handler.fail_first = True
+    client = HttpAnyVarClient(fake_anyvar_uri, backoff_factor=0, backoff_jitter=0)
+    try:
+        assert client.put_allele_expressions(["chr14-18223529-C-A"]) == [
+            "ga4gh:VA.chr14-18223529-C-A"
+        ]
+        assert fake_anyvar_handler.requests_received == 2
+    finally:
+        client.close()
+
+
+def test_http_client_concurrent_sub_batches(fake_anyvar_handler, fake_anyvar_uri):
+    """Test that large inputs are registered in concurrent sub-batches, in order"""
+    fake_anyvar_handler.delay = 0.1
+    client = HttpAnyVarClient(
+        fake_anyvar_uri, sub_batch_size=10, max_concurrent_requests=3
+    )
+    expressions = [f"chr1-{pos}-A-T" for pos in range(1, 96)]
+    try:
+        results = client.put_allele_expressions(expressions)
+    finally:
+        client.close()
+    assert results == [f"ga4gh:VA.{expression}" for expression in expressions]
+    assert fake_anyvar_handler.requests_received == 10
+    assert 1 < fake_anyvar_handler.max_in_flight <= 3
+
+    with pytest.raises(ValueError, match="must be positive"):
+        HttpAnyVarClient(fake_anyvar_uri, sub_batch_size=0)
+
+
+def test_http_client_async_lookup(fake_anyvar_handler, fake_anyvar_uri):
+    """Test async lookups, including retry of a transient error status"""
+    fake_anyvar_handler.fail_first = True
+    client = HttpAnyVarClient(fake_anyvar_uri, backoff_factor=0, backoff_jitter=0)
+
+    async def lookup() -> None:
+        try:
+            assert (
+                await client.retrieve_allele_by_expression_async("Y-2781761-A-C")
+                is None
+            )
+        finally:
+            await client.close_async()
+
+    anyio.run(lookup)
+    assert fake_anyvar_handler.requests_received == 2
+
+
+def test_http_client_async_connection_error():
+    """Test that failure to connect is reported as a connection failure"""
+    client = HttpAnyVarClient("http://127.0.0.1:1", max_retries=0)
+
+    async def lookup() -> None:
+        try:
+            await client.retrieve_allele_by_id_async("ga4gh:VA.abc")
+        finally:
+            await client.close_async()
+
+    with pytest.raises(AnyVarClientConnectionError):
+        anyio.run(lookup)
+
+
+class _FakeTranslator:
+    """Translate expressions to stand-in alleles, failing on expressions marked bad"""
+
+    def translate_variation(self, expression: str, **kwargs) -> SimpleNamespace:
+        if expression.startswith("bad"):
+            raise TranslationError
+        return SimpleNamespace(id=f"ga4gh:VA.{expression}")
+
+
+def _create_fake_translator() -> _FakeTranslator:
+    return _FakeTranslator()
+
+
+def test_python_client_translation_processes():
+    """Test that expressions translated by worker processes keep their input order"""
+    storage = MagicMock()
+    client = PythonAnyVarClient(
+        _FakeTranslator(),
+        storage,
+        translation_processes=2,
+        translator_factory=_create_fake_translator,
+    )
+    expressions = [f"bad{i}" if i % 7 == 0 else f"expr{i}" for i in range(50)]
+    try:
+        results = client.put_allele_expressions(expressions)
+    finally:
+        client.close()
+    assert results == [
+        None if expression.startswith("bad") else f"ga4gh:VA.{expression}"
+        for expression in expressions
+    ]
+    # translated variants are stored together, by the calling process
+    storage.add_objects.assert_called_once()
+    assert [obj.id for obj in storage.add_objects.call_args.args[0]] == [
+        result for result in results if result is not None
+    ]
+
+    with pytest.raises(ValueError, match="must be positive"):
+        PythonAnyVarClient(_FakeTranslator(), storage, translation_processes=0)
+
+
+def test_http_client_async_bulk_lookup(fake_anyvar_handler, fake_anyvar_uri):
+    """Test that bulk async lookups are made concurrently, up to the limit, in order"""
+    fake_anyvar_handler.delay = 0.1
+    client = HttpAnyVarClient(fake_anyvar_uri, max_concurrent_requests=3)
+    expressions = [f"1-{pos}-A-T" for pos in range(1, 11)]
+
+    async def lookup() -> list:
+        try:
+            return await client.retrieve_alleles_by_expression_async(expressions)
+        finally:
+            await client.close_async()
+
+    # nothing is registered in the fake AnyVar
+    assert anyio.run(lookup) == [None] * len(expressions)
+    assert fake_anyvar_handler.requests_received == len(expressions)
+    assert 1 < fake_anyvar_handler.max_in_flight <= 3
+
+
+def test_http_client_lookup_server_error(fake_anyvar_handler, fake_anyvar_uri):
+    """Test that a server error is raised, rather than reported as unregistered"""
+    fake_anyvar_handler.search_status = HTTPStatus.INTERNAL_SERVER_ERROR
+    client = HttpAnyVarClient(fake_anyvar_uri)
+
+    async def lookup() -> None:
+        try:
+            await client.retrieve_allele_by_expression_async("Y-2781761-A-C")
+        finally:
+            await client.close_async()
+
+    with pytest.raises(AnyVarClientError, match="Y-2781761-A-C"):
+        anyio.run(lookup)
+    try:
+        with pytest.raises(AnyVarClientError, match="Y-2781761-A-C"):
+            client.retrieve_allele_by_expression("Y-2781761-A-C")
+    finally:
+        client.close()
+
+
+def test_http_client_async_pool_per_loop(fake_anyvar_handler, fake_anyvar_uri):
+    """Test that the pool for a previous event loop is closed when it's replaced"""
+    client = HttpAnyVarClient(fake_anyvar_uri)
+    pools = []
+
+    async def lookup() -> None:
+        await client.retrieve_allele_by_expression_async("Y-2781761-A-C")
+        pools.append(client._async_client)  # noqa: SLF001
+
+    try:
+        anyio.run(lookup)
+        anyio.run(lookup)
+    finally:
+        anyio.run(client.close_async)
+    assert pools[0] is not pools[1]
+    assert pools[0].is_closed
+    assert pools[1].is_closed
+    assert fake_anyvar_handler.requests_received == 2
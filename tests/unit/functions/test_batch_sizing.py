@@ -0,0 +1,52 @@
+import pytest
+
+from anyvlm.functions.batch_sizing import AdaptiveBatchSizer
+
+
+def test_batch_sizer_tracks_target_latency():
+    sizer = AdaptiveBatchSizer(1000, 100, 10000, target_latency=10.0)
+    assert sizer.batch_size == 1000
+
+    # fast requests grow the batch, by at most a factor of 2 at a time
+    sizer.record_success(1000, 1.0)
+    assert sizer.batch_size == 2000
+    sizer.record_success(2000, 8.0)
+    assert sizer.batch_size == 2500
+
+    # slow requests shrink it
+    sizer.record_success(2500, 12.5)
+    assert sizer.batch_size == 2000
+
+    # and it stays within bounds
+    sizer.record_success(8000, 0.1)
+    assert sizer.batch_size == 10000
+    sizer.record_success(150, 100.0)
+    assert sizer.batch_size == 100
+
+
+def test_batch_sizer_failure():
+    sizer = AdaptiveBatchSizer(1000, 100, 10000, target_latency=10.0)
+    sizer.record_failure(1000)
+    assert sizer.batch_size == 500
+    # a failure of an older, larger batch doesn't grow the current size
+    sizer.record_failure(4000)
+    assert sizer.batch_size == 250
+    sizer.record_failure(250)
+    sizer.record_failure(125)
+    assert sizer.batch_size == 100
+
+
+def test_batch_sizer_fixed():
+    sizer = AdaptiveBatchSizer.fixed(50)
+    sizer.record_success(50, 0.01)
+    sizer.record_failure(50)
+    assert sizer.batch_size == 50
+
+
+@pytest.mark.parametrize(
+    ("min_size", "max_size", "target_latency"),
+    [(0, 10, 1.0), (10, 5, 1.0), (1, 10, 0)],
+)
+def test_batch_sizer_invalid(min_size: int, max_size: int, target_latency: float):
+    with pytest.raises(ValueError, match="must be positive|Invalid batch size"):
+        AdaptiveBatchSizer(5, min_size, max_size, target_latency)
@@ -0,0 +1,392 @@
+"""Test concurrency of CAF retrieval, using in-memory AnyVar and storage stand-ins"""
+
+import anyio
+from ga4gh.core.models import iriReference
+from ga4gh.vrs import models
+from helpers import EXPECTED_VRS_ID, TEST_VARIANT, build_caf
+
+from anyvlm.anyvar.base_client import (
+    AnyVarClientConnectionError,
+    AnyVarClientError,
+    BaseAnyVarClient,
+)
+from anyvlm.functions.get_cafs import get_cafs, get_cafs_batch_async
+from anyvlm.schemas.vlm import VariantCountsQuery
+from anyvlm.utils.types import AlleleCoordinates
+
+LIFTOVER_VRS_ID = "ga4gh:VA.lifted"
+
+
+class _LiftoverAnyVarClient(BaseAnyVarClient):
+    """Resolve every expression to one allele, which lifts over to another"""
+
+    def __init__(self, allele: models.Allele, liftover_allele: models.Allele) -> None:
+        self.allele = allele
+        self.liftover_allele = liftover_allele
+        self.liftover_requested = anyio.Event()
+        self.liftover_dereferenced = anyio.Event()
+        self.alleles_dereferenced = 0
+
+    def retrieve_allele_by_id(self, vrs_id):
+        raise NotImplementedError
+
+    def retrieve_allele_by_expression(self, expression, assembly=None):
+        raise NotImplementedError
+
+    def put_allele_expressions(self, expressions, assembly=None):
+        raise NotImplementedError
+
+    def get_liftover_variation_id(self, vrs_id, starting_assembly):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    async def retrieve_allele_by_expression_async(self, expression, assembly=None):  # noqa: ARG002
+        return self.allele
+
+    async def get_liftover_variation_id_async(self, vrs_id, starting_assembly):  # noqa: ARG002
+        self.liftover_requested.set()
+        return self.liftover_allele.id
+
+    async def get_liftover_variation_ids_async(self, vrs_ids, starting_assembly):
+        return [
+            await self.get_liftover_variation_id_async(vrs_id, starting_assembly)
+            for vrs_id in vrs_ids
+        ]
+
+    async def retrieve_allele_by_id_async(self, vrs_id):  # noqa: ARG002
+        self.alleles_dereferenced += 1
+        self.liftover_dereferenced.set()
+        return self.liftover_allele
+
+
+class _BlockingStorage:
+    """Return a CAF per allele, optionally only once the lifted-over allele is being
+    dereferenced
+    """
+
+    def __init__(
+        self, anyvar_client: _LiftoverAnyVarClient, caf_iri, block: bool = True
+    ) -> None:
+        self.anyvar_client = anyvar_client
+        self.caf_iri = caf_iri
+        self.block = block
+        self.queries = []
+
+    async def get_cafs_by_vrs_allele_ids_async(self, vrs_allele_ids):
+        self.queries.append(list(vrs_allele_ids))
+        if self.block:
+            # deadlocks (and times out) if storage is queried before dereferencing
+            # starts, rather than concurrently with it
+            with anyio.fail_after(5):
+                await self.anyvar_client.liftover_dereferenced.wait()
+        return {
+            vrs_allele_id: [build_caf(self.caf_iri, allele_id=vrs_allele_id)]
+            for vrs_allele_id in vrs_allele_ids
+        }
+
+    async def get_cafs_by_coordinates_async(self, coordinates, assembly):  # noqa: ARG002
+        return []
+
+
+class _CoordinateStorage:
+    """Index a single allele by coordinates, optionally linked to its liftover
+    equivalent
+    """
+
+    def __init__(
+        self, coordinates: AlleleCoordinates, caf_iri, linked: bool = True
+    ) -> None:
+        self.coordinates = coordinates
+        self.caf_iri = caf_iri
+        self.linked = linked
+
+    async def get_cafs_by_vrs_allele_ids_async(self, vrs_allele_ids):
+        return {
+            vrs_allele_id: [build_caf(self.caf_iri, allele_id=vrs_allele_id)]
+            for vrs_allele_id in vrs_allele_ids
+        }
+
+    async def get_cafs_by_coordinates_async(self, coordinates, assembly):  # noqa: ARG002
+        if coordinates != self.coordinates:
+            return []
+        allele_ids = [EXPECTED_VRS_ID]
+        if self.linked:
+            allele_ids.append(LIFTOVER_VRS_ID)
+        return [
+            build_caf(self.caf_iri, allele_id=allele_id) for allele_id in allele_ids
+        ]
+
+    async def get_liftover_ids_async(self, vrs_ids):
+        if not self.linked:
+            return {}
+        return {
+            vrs_id: LIFTOVER_VRS_ID for vrs_id in vrs_ids if vrs_id == EXPECTED_VRS_ID
+        }
+
+
+def test_get_cafs_fans_out(alleles: dict, caf_iri):
+    """Test that both alleles' CAFs are retrieved in one storage query, concurrently
+    with dereferencing the lifted-over allele
+    """
+    allele = models.Allele(**alleles[EXPECTED_VRS_ID]["variation"])
+    liftover_allele = allele.model_copy(update={"id": LIFTOVER_VRS_ID})
+    anyvar_client = _LiftoverAnyVarClient(allele, liftover_allele)
+    storage = _BlockingStorage(anyvar_client, caf_iri)
+
+    cafs = get_cafs(
+        anyvar_client,
+        storage,  # type: ignore
+        TEST_VARIANT.assembly,
+        TEST_VARIANT.chromosome,
+        TEST_VARIANT.position,
+        TEST_VARIANT.ref,
+        TEST_VARIANT.alt,
+    )
+    # original allele's CAFs come first
+    assert [caf.focusAllele for caf in cafs] == [allele, liftover_allele]
+    assert storage.queries == [[EXPECTED_VRS_ID, LIFTOVER_VRS_ID]]
+
+
+def test_get_cafs_unresolved_focus_alleles(alleles: dict, caf_iri):
+    """Test that the lifted-over allele isn't dereferenced unless focus alleles are
+    resolved
+    """
+    allele = models.Allele(**alleles[EXPECTED_VRS_ID]["variation"])
+    liftover_allele = allele.model_copy(update={"id": LIFTOVER_VRS_ID})
+    anyvar_client = _LiftoverAnyVarClient(allele, liftover_allele)
+
+    cafs = get_cafs(
+        anyvar_client,
+        _BlockingStorage(anyvar_client, caf_iri, block=False),  # type: ignore
+        TEST_VARIANT.assembly,
+        TEST_VARIANT.chromosome,
+        TEST_VARIANT.position,
+        TEST_VARIANT.ref,
+        TEST_VARIANT.alt,
+        resolve_focus_alleles=False,
+    )
+    assert [caf.focusAllele for caf in cafs] == [
+        iriReference(EXPECTED_VRS_ID),
+        iriReference(LIFTOVER_VRS_ID),
+    ]
+    assert anyvar_client.alleles_dereferenced == 0
+
+
+def test_get_cafs_by_coordinates(alleles: dict, caf_iri):
+    """Test that locally indexed alleles are found without any AnyVar lookups"""
+    allele = models.Allele(**alleles[EXPECTED_VRS_ID]["variation"])
+    liftover_allele = allele.model_copy(update={"id": LIFTOVER_VRS_ID})
+    anyvar_client = _LiftoverAnyVarClient(allele, liftover_allele)
+    anyvar_client.allele = None  # translating the query would fail
+    storage = _CoordinateStorage(
+        AlleleCoordinates(
+            TEST_VARIANT.chromosome.upper().removeprefix("CHR"),
+            TEST_VARIANT.position,
+            TEST_VARIANT.ref,
+            TEST_VARIANT.alt,
+        ),
+        caf_iri,
+    )
+
+    cafs = get_cafs(
+        anyvar_client,
+        storage,  # type: ignore
+        TEST_VARIANT.assembly,
+        TEST_VARIANT.chromosome,
+        TEST_VARIANT.position,
+        TEST_VARIANT.ref,
+        TEST_VARIANT.alt,
+        resolve_focus_alleles=False,
+    )
+    assert [caf.focusAllele for caf in cafs] == [
+        iriReference(EXPECTED_VRS_ID),
+        iriReference(LIFTOVER_VRS_ID),
+    ]
+    assert not anyvar_client.liftover_requested.is_set()
+
+
+def test_get_cafs_by_coordinates_unlinked(alleles: dict, caf_iri):
+    """Test that a locally indexed allele that wasn't linked to its liftover at ingest
+    is lifted over in AnyVar
+    """
+    allele = models.Allele(**alleles[EXPECTED_VRS_ID]["variation"])
+    liftover_allele = allele.model_copy(update={"id": LIFTOVER_VRS_ID})
+    anyvar_client = _LiftoverAnyVarClient(allele, liftover_allele)
+    anyvar_client.allele = None  # translating the query would fail
+    storage = _CoordinateStorage(
+        AlleleCoordinates(
+            TEST_VARIANT.chromosome.upper().removeprefix("CHR"),
+            TEST_VARIANT.position,
+            TEST_VARIANT.ref,
+            TEST_VARIANT.alt,
+        ),
+        caf_iri,
+        linked=False,
+    )
+
+    cafs = get_cafs(
+        anyvar_client,
+        storage,  # type: ignore
+        TEST_VARIANT.assembly,
+        TEST_VARIANT.chromosome,
+        TEST_VARIANT.position,
+        TEST_VARIANT.ref,
+        TEST_VARIANT.alt,
+        resolve_focus_alleles=False,
+    )
+    assert [caf.focusAllele for caf in cafs] == [
+        iriReference(EXPECTED_VRS_ID),
+        iriReference(LIFTOVER_VRS_ID),
+    ]
+    assert anyvar_client.liftover_requested.is_set()
+    assert anyvar_client.alleles_dereferenced == 0
+
+
+class _FailingLiftoverAnyVarClient(_LiftoverAnyVarClient):
+    """Fail every liftover lookup"""
+
+    async def get_liftover_variation_ids_async(self, vrs_ids, starting_assembly):  # noqa: ARG002
+        msg = "Liftover lookup failed"
+        raise AnyVarClientError(msg)
+
+
+def test_get_cafs_by_coordinates_liftover_failure(alleles: dict, caf_iri, caplog):
+    """Test that a locally indexed allele's CAFs are still returned when looking up its
+    liftover in AnyVar fails
+    """
+    allele = models.Allele(**alleles[EXPECTED_VRS_ID]["variation"])
+    liftover_allele = allele.model_copy(update={"id": LIFTOVER_VRS_ID})
+    anyvar_client = _FailingLiftoverAnyVarClient(allele, liftover_allele)
+    storage = _CoordinateStorage(
+        AlleleCoordinates(
+            TEST_VARIANT.chromosome.upper().removeprefix("CHR"),
+            TEST_VARIANT.position,
+            TEST_VARIANT.ref,
+            TEST_VARIANT.alt,
+        ),
+        caf_iri,
+        linked=False,
+    )
+
+    cafs = get_cafs(
+        anyvar_client,
+        storage,  # type: ignore
+        TEST_VARIANT.assembly,
+        TEST_VARIANT.chromosome,
+        TEST_VARIANT.position,
+        TEST_VARIANT.ref,
+        TEST_VARIANT.alt,
+        resolve_focus_alleles=False,
+    )
+    assert [caf.focusAllele for caf in cafs] == [iriReference(EXPECTED_VRS_ID)]
+    assert "Liftover lookup failed" in caplog.text
+
+
+class _BulkAnyVarClient(_LiftoverAnyVarClient):
+    """Resolve one expression per assembly, recording bulk lookups"""
+
+    def __init__(self, allele: models.Allele, liftover_allele: models.Allele) -> None:
+        super().__init__(allele, liftover_allele)
+        self.expression_lookups = []
+        self.liftover_lookups = []
+
+    async def retrieve_alleles_by_expression_async(self, expressions, assembly):
+        self.expression_lookups.append((assembly.value, list(expressions)))
+        if assembly.value == "GRCh37":
+            raise AnyVarClientConnectionError
+        return [
+            self.allele if expression.startswith("Y-") else None
+            for expression in expressions
+        ]
+
+    async def get_liftover_variation_ids_async(self, vrs_ids, starting_assembly):  # noqa: ARG002
+        vrs_ids = list(vrs_ids)
+        self.liftover_lookups.append(vrs_ids)
+        return [self.liftover_allele.id for _ in vrs_ids]
+
+
+class _BulkStorage(_CoordinateStorage):
+    """Index a single allele by coordinates, recording bulk lookups"""
+
+    def __init__(self, coordinates: AlleleCoordinates, caf_iri) -> None:
+        super().__init__(coordinates, caf_iri)
+        self.queries = []
+
+    async def get_cafs_by_many_coordinates_async(self, coordinates, assembly):
+        self.queries.append((assembly, list(coordinates)))
+        return {
+            allele_coordinates: await self.get_cafs_by_coordinates_async(
+                allele_coordinates, assembly
+            )
+            for allele_coordinates in coordinates
+        }
+
+    async def get_cafs_by_vrs_allele_ids_async(self, vrs_allele_ids):
+        vrs_allele_ids = list(vrs_allele_ids)
+        self.queries.append(vrs_allele_ids)
+        return {
+            vrs_allele_id: [build_caf(self.caf_iri, allele_id=vrs_allele_id)]
+            for vrs_allele_id in vrs_allele_ids
+        }
+
+
+def test_get_cafs_batch(alleles: dict, caf_iri):
+    """Test that a batch of queries is answered with bulk lookups, in order, with
+    failures reported per query
+    """
+    allele = models.Allele(**alleles[EXPECTED_VRS_ID]["variation"])
+    liftover_allele = allele.model_copy(update={"id": LIFTOVER_VRS_ID})
+    anyvar_client = _BulkAnyVarClient(allele, liftover_allele)
+    indexed = AlleleCoordinates("14", 18223529, "C", "A")
+    storage = _BulkStorage(indexed, caf_iri)
+
+    def _query(assembly_id: str, expression: str) -> VariantCountsQuery:
+        chromosome, position, ref, alt = expression.split("-")
+        return VariantCountsQuery(
+            assemblyId=assembly_id,  # type: ignore
+            referenceName=chromosome,
+            start=int(position),
+            referenceBases=ref,
+            alternateBases=alt,
+        )
+
+    queries = [
+        _query("GRCh38", "Y-2781761-C-A"),  # registered in AnyVar
+        _query("GRCh38", "chr14-18223529-C-A"),  # indexed locally
+        _query("GRCh38", "1-100-A-T"),  # not registered
+        _query("GRCh37", "1-100-A-T"),  # AnyVar is unreachable
+        _query("hg38", "chrY-2781761-C-A"),  # repeated query
+    ]
+    results = anyio.run(get_cafs_batch_async, anyvar_client, storage, queries)
+
+    focus_alleles = [iriReference(EXPECTED_VRS_ID), iriReference(LIFTOVER_VRS_ID)]
+    assert [caf.focusAllele for caf in results[0]] == focus_alleles  # type: ignore
+    assert [caf.focusAllele for caf in results[1]] == focus_alleles  # type: ignore
+    assert results[2] == []
+    assert isinstance(results[3], AnyVarClientConnectionError)
+    assert results[4] == results[0]
+    assert results[4] is not results[0]
+
+    # one bulk lookup of each kind per assembly, for only the unindexed variants
+    assert sorted(anyvar_client.expression_lookups) == [
+        ("GRCh37", ["1-100-A-T"]),
+        ("GRCh38", ["Y-2781761-C-A", "1-100-A-T"]),
+    ]
+    assert anyvar_client.liftover_lookups == [[EXPECTED_VRS_ID]]
+    assert sorted(storage.queries, key=str) == sorted(
+        [
+            (
+                "GRCh38",
+                [
+                    AlleleCoordinates("Y", 2781761, "C", "A"),
+                    indexed,
+                    AlleleCoordinates("1", 100, "A", "T"),
+                ],
+            ),
+            ("GRCh37", [AlleleCoordinates("1", 100, "A", "T")]),
+            [EXPECTED_VRS_ID, LIFTOVER_VRS_ID],
+        ],
+        key=str,
+    )
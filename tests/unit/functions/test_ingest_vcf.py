@@ -1,14 +1,28 @@
 from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from unittest.mock import MagicMock
 
+import pysam
 import pytest
 from anyvar.core.objects import SupportedVrsVariation
 from anyvar.mapping.liftover import ReferenceAssembly
 from ga4gh.vrs.models import Allele
 
-from anyvlm.anyvar.base_client import BaseAnyVarClient
-from anyvlm.functions.ingest_vcf import VcfAfColumnsError, ingest_vcf
+from anyvlm.anyvar.base_client import AnyVarClientError, BaseAnyVarClient
+from anyvlm.functions import ingest_vcf as ingest_vcf_module
+from anyvlm.functions.batch_sizing import AdaptiveBatchSizer
+from anyvlm.functions.ingest_vcf import (
+    VcfAfColumnsError,
+    _hash_file,
+    _plan_regions,
+    _register_batch,
+    _yield_expression_af_batches,
+    ingest_vcf,
+    ingest_vcf_sharded,
+)
 from anyvlm.storage.base_storage import Storage
+from anyvlm.utils.types import AlleleCoordinates
 
 
 @pytest.fixture(scope="session")
@@ -44,6 +58,10 @@ def stub_anyvar_client():
             ReferenceAssembly.GRCH37,
         ): "ga4gh:VA.i8WIscnfIDr0xAn6XgCwMUk63Y-Lg3BN",
     }
+    liftover_responses = {
+        "ga4gh:VA.6Vh1yfYyljQHm6_qLTKqzi1URy8MfcGe": "ga4gh:VA.i8WIscnfIDr0xAn6XgCwMUk63Y-Lg3BN",
+        "ga4gh:VA.i8WIscnfIDr0xAn6XgCwMUk63Y-Lg3BN": "ga4gh:VA.6Vh1yfYyljQHm6_qLTKqzi1URy8MfcGe",
+    }
 
     class TestAnyVarClient(BaseAnyVarClient):
         def retrieve_allele_by_id(
@@ -71,9 +89,11 @@ def stub_anyvar_client():
             ]
 
         def get_liftover_variation_id(
-            self, vrs_id: str, starting_assembly: ReferenceAssembly
+            self,
+            vrs_id: str,
+            starting_assembly: ReferenceAssembly,  # noqa: ARG002
         ) -> str | None:
-            raise NotImplementedError
+            return liftover_responses.get(vrs_id)
 
         def close(self) -> None:
             """Clean up AnyVar connection."""
@@ -91,6 +111,28 @@ def input_grch37_vcf_path(test_data_dir: Path) -> Path:
     return test_data_dir / "vcf" / "grch37_vcf.vcf"
 
 
+def test_yield_expression_af_batches(input_grch38_vcf_path: Path):
+    """Test that INFO fields are extracted into column-wise batches"""
+    with pysam.VariantFile(str(input_grch38_vcf_path)) as vcf:
+        batches = list(_yield_expression_af_batches(vcf, batch_size=3, skip=1))
+    assert [len(batch) for batch in batches] == [3, 1]
+    assert batches[0].expressions == [
+        "chr14-18223557-C-T",
+        "chr14-18223583-C-G",
+        "chr14-18223586-T-C",
+    ]
+    assert batches[0].ac == [2, 1268, 1]
+    assert batches[0].an == [4452, 3238, 4672]
+    assert batches[0].ac_het == [2, 1262, 1]
+    assert batches[0].ac_hom == [0, 6, 0]
+    assert batches[0].ac_hemi == [0, 0, 0]
+    assert batches[0].filters == [[], ["ExcessHet"], ["LowQual", "NO_HQ_GENOTYPES"]]
+
+    selected = batches[0].select([True, False, True])
+    assert selected.expressions == ["chr14-18223557-C-T", "chr14-18223586-T-C"]
+    assert selected.an == [4452, 4672]
+
+
 def test_ingest_vcf_grch38(
     test_data_dir: Path, stub_anyvar_client: BaseAnyVarClient, postgres_storage: Storage
 ):
@@ -110,6 +152,333 @@ def test_ingest_vcf_grch37(
     )
 
 
+def test_ingest_vcf_links_liftovers(
+    input_grch38_vcf_path: Path,
+    input_grch37_vcf_path: Path,
+    stub_anyvar_client: BaseAnyVarClient,
+    postgres_storage: Storage,
+):
+    """Test that ingested alleles are linked to their liftover equivalents, so that
+    coordinate lookups return CAFs from both assemblies
+    """
+    ingest_vcf(input_grch38_vcf_path, stub_anyvar_client, postgres_storage)
+    ingest_vcf(
+        input_grch37_vcf_path,
+        stub_anyvar_client,
+        postgres_storage,
+        ReferenceAssembly.GRCH37,
+    )
+    assert postgres_storage.get_liftover_ids(
+        [
+            "ga4gh:VA.6Vh1yfYyljQHm6_qLTKqzi1URy8MfcGe",
+            "ga4gh:VA.slgr2fnRKaUnQrJZvYNDGMrfZHw6QCr6",
+        ]
+    ) == {
+        "ga4gh:VA.6Vh1yfYyljQHm6_qLTKqzi1URy8MfcGe": "ga4gh:VA.i8WIscnfIDr0xAn6XgCwMUk63Y-Lg3BN",
+        "ga4gh:VA.slgr2fnRKaUnQrJZvYNDGMrfZHw6QCr6": None,
+    }
+
+    cafs = postgres_storage.get_cafs_by_coordinates(
+        AlleleCoordinates("14", 18223557, "C", "T"), "GRCh38"
+    )
+    assert [caf.focusAllele.root for caf in cafs] == [  # type: ignore
+        "ga4gh:VA.6Vh1yfYyljQHm6_qLTKqzi1URy8MfcGe",
+        "ga4gh:VA.i8WIscnfIDr0xAn6XgCwMUk63Y-Lg3BN",
+    ]
+
+
+def test_ingest_vcf_pipelined(
+    input_grch38_vcf_path: Path,
+    stub_anyvar_client: BaseAnyVarClient,
+    postgres_storage: Storage,
+):
+    """Test that small batches with several registrations in flight store every variant"""
+    stats = ingest_vcf(
+        input_grch38_vcf_path,
+        stub_anyvar_client,
+        postgres_storage,
+        batch_size=2,
+        max_in_flight_batches=3,
+    )
+    assert stats.records_processed == 5
+    assert stats.batch_size == 2
+    assert stats.parse_seconds > 0
+    assert stats.register_seconds > 0
+    assert stats.store_seconds > 0
+    for vrs_id in (
+        "ga4gh:VA.slgr2fnRKaUnQrJZvYNDGMrfZHw6QCr6",
+        "ga4gh:VA.6Vh1yfYyljQHm6_qLTKqzi1URy8MfcGe",
+        "ga4gh:VA.7RhOJ6GlTAnbiwEcfvl9ZKSzrJl47Emg",
+        "ga4gh:VA.srLXVmS7-JU1hLfxMZkkgFMy64GS7D8H",
+        "ga4gh:VA.1ra1LoRvuvAhbeKl4YgbdrGkXWjc8Lpc",
+    ):
+        assert len(postgres_storage.get_cafs_by_vrs_allele_id(vrs_id)) == 1
+    # stored variants are also indexed by coordinates
+    cafs = postgres_storage.get_cafs_by_coordinates(
+        AlleleCoordinates("14", 18223557, "C", "T"), "GRCh38"
+    )
+    assert [caf.focusAllele.root for caf in cafs] == [  # type: ignore
+        "ga4gh:VA.6Vh1yfYyljQHm6_qLTKqzi1URy8MfcGe"
+    ]
+
+
+@pytest.fixture
+def bgzipped_grch38_vcf_path(input_grch38_vcf_path: Path, tmp_path: Path) -> Path:
+    """Provide a BGZF-compressed copy of the GRCh38 VCF, without an index"""
+    vcf_path = tmp_path / "grch38_vcf.vcf.gz"
+    pysam.tabix_compress(str(input_grch38_vcf_path), str(vcf_path))
+    return vcf_path
+
+
+def test_plan_regions(bgzipped_grch38_vcf_path: Path):
+    pysam.tabix_index(str(bgzipped_grch38_vcf_path), preset="vcf")
+    assert _plan_regions(bgzipped_grch38_vcf_path, None) == [("chr14", 0, None)]
+
+    regions = _plan_regions(bgzipped_grch38_vcf_path, 50_000_000)
+    assert regions == [
+        ("chr14", 0, 50_000_000),
+        ("chr14", 50_000_000, 100_000_000),
+        ("chr14", 100_000_000, 107_043_718),
+    ]
+
+
+def _in_process_executor(max_workers: int, mp_context) -> ThreadPoolExecutor:
+    """Run sharded ingest workers as threads, checking they'd have been spawned"""
+    # forking a server process would copy its locks and connections into workers
+    assert mp_context.get_start_method() == "spawn"
+    return ThreadPoolExecutor(max_workers)
+
+
+def test_ingest_vcf_sharded(
+    bgzipped_grch38_vcf_path: Path,
+    stub_anyvar_client: BaseAnyVarClient,
+    postgres_storage: Storage,
+    anyvlm_postgres_uri: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that region boundaries falling between variants lose or duplicate nothing"""
+    # run workers in-process so that they can use the stub client
+    monkeypatch.setattr(ingest_vcf_module, "ProcessPoolExecutor", _in_process_executor)
+    monkeypatch.setattr(
+        "anyvlm.main.create_anyvar_client", lambda _uri: stub_anyvar_client
+    )
+
+    stats = ingest_vcf_sharded(
+        bgzipped_grch38_vcf_path,
+        storage_uri=anyvlm_postgres_uri,
+        processes=2,
+        region_size=18223560,
+        batch_size=2,
+    )
+    assert stats.records_processed == 5
+    # the index built for sharding should be cleaned up
+    assert not bgzipped_grch38_vcf_path.with_suffix(".gz.tbi").exists()
+    for vrs_id in (
+        "ga4gh:VA.slgr2fnRKaUnQrJZvYNDGMrfZHw6QCr6",
+        "ga4gh:VA.6Vh1yfYyljQHm6_qLTKqzi1URy8MfcGe",
+        "ga4gh:VA.7RhOJ6GlTAnbiwEcfvl9ZKSzrJl47Emg",
+        "ga4gh:VA.srLXVmS7-JU1hLfxMZkkgFMy64GS7D8H",
+        "ga4gh:VA.1ra1LoRvuvAhbeKl4YgbdrGkXWjc8Lpc",
+    ):
+        assert len(postgres_storage.get_cafs_by_vrs_allele_id(vrs_id)) == 1
+
+
+def test_ingest_vcf_sharded_uncompressed(
+    input_grch38_vcf_path: Path,
+    stub_anyvar_client: BaseAnyVarClient,
+    postgres_storage: Storage,
+    anyvlm_postgres_uri: str,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+):
+    """Test that an uncompressed VCF is sharded via a temporary compressed copy"""
+    vcf_path = tmp_path / input_grch38_vcf_path.name
+    vcf_path.write_bytes(input_grch38_vcf_path.read_bytes())
+    monkeypatch.setattr(ingest_vcf_module, "ProcessPoolExecutor", _in_process_executor)
+    monkeypatch.setattr(
+        "anyvlm.main.create_anyvar_client", lambda _uri: stub_anyvar_client
+    )
+
+    stats = ingest_vcf_sharded(
+        vcf_path,
+        storage_uri=anyvlm_postgres_uri,
+        processes=2,
+        region_size=18223560,
+        batch_size=2,
+    )
+    assert stats.records_processed == 5
+    # nothing is left next to the input
+    assert list(tmp_path.iterdir()) == [vcf_path]
+    assert (
+        len(
+            postgres_storage.get_cafs_by_vrs_allele_id(
+                "ga4gh:VA.1ra1LoRvuvAhbeKl4YgbdrGkXWjc8Lpc"
+            )
+        )
+        == 1
+    )
+
+
+def test_ingest_vcf_resume(
+    input_grch38_vcf_path: Path,
+    stub_anyvar_client: BaseAnyVarClient,
+    postgres_storage: Storage,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that a retry after a failed batch picks up after the last committed batch"""
+    put_allele_expressions = stub_anyvar_client.put_allele_expressions
+    submitted: list[list[str]] = []
+
+    def _fail_second_batch(
+        expressions: Iterable[str], assembly: ReferenceAssembly
+    ) -> Sequence[str | None]:
+        submitted.append(list(expressions))
+        if len(submitted) == 2:
+            msg = "AnyVar went away"
+            raise RuntimeError(msg)
+        return put_allele_expressions(expressions, assembly)
+
+    monkeypatch.setattr(
+        stub_anyvar_client, "put_allele_expressions", _fail_second_batch
+    )
+    with pytest.raises(RuntimeError, match="AnyVar went away"):
+        ingest_vcf(
+            input_grch38_vcf_path, stub_anyvar_client, postgres_storage, batch_size=2
+        )
+    file_hash = _hash_file(input_grch38_vcf_path)
+    assert postgres_storage.get_ingest_checkpoint(file_hash, "GRCh38", "") == 2
+
+    submitted.clear()
+
+    def _record_batch(
+        expressions: Iterable[str], assembly: ReferenceAssembly
+    ) -> Sequence[str | None]:
+        submitted.append(list(expressions))
+        return put_allele_expressions(expressions, assembly)
+
+    monkeypatch.setattr(stub_anyvar_client, "put_allele_expressions", _record_batch)
+    stats = ingest_vcf(
+        input_grch38_vcf_path, stub_anyvar_client, postgres_storage, batch_size=2
+    )
+    assert stats.records_resumed == 2
+    assert stats.records_processed == 3
+    assert postgres_storage.get_ingest_checkpoint(file_hash, "GRCh38", "") == 0
+    # variants committed before the failure were never resubmitted
+    assert submitted == [
+        ["chr14-18223583-C-G", "chr14-18223586-T-C"],
+        ["chr14-18223591-G-A"],
+    ]
+    for vrs_id in (
+        "ga4gh:VA.slgr2fnRKaUnQrJZvYNDGMrfZHw6QCr6",
+        "ga4gh:VA.1ra1LoRvuvAhbeKl4YgbdrGkXWjc8Lpc",
+    ):
+        assert len(postgres_storage.get_cafs_by_vrs_allele_id(vrs_id)) == 1
+
+
+def test_register_batch(
+    stub_anyvar_client: BaseAnyVarClient,
+    postgres_storage: Storage,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that only unique, previously unregistered expressions are sent to AnyVar"""
+    postgres_storage.add_expression_vrs_ids(
+        {"chr14-18223529-C-A": "ga4gh:VA.slgr2fnRKaUnQrJZvYNDGMrfZHw6QCr6"},
+        ReferenceAssembly.GRCH38.value,
+    )
+    put_allele_expressions = stub_anyvar_client.put_allele_expressions
+    submitted: list[list[str]] = []
+
+    def _record_batch(
+        expressions: Iterable[str], assembly: ReferenceAssembly
+    ) -> Sequence[str | None]:
+        submitted.append(list(expressions))
+        return put_allele_expressions(expressions, assembly)
+
+    monkeypatch.setattr(stub_anyvar_client, "put_allele_expressions", _record_batch)
+    sizer = MagicMock(wraps=AdaptiveBatchSizer(3, 1, 8, target_latency=10.0))
+
+    vrs_ids = _register_batch(
+        stub_anyvar_client,
+        postgres_storage,
+        ["chr14-18223557-C-T", "chr14-18223529-C-A", "chr14-18223557-C-T"],
+        ReferenceAssembly.GRCH38,
+        sizer,
+    )
+    assert vrs_ids == [
+        "ga4gh:VA.6Vh1yfYyljQHm6_qLTKqzi1URy8MfcGe",
+        "ga4gh:VA.slgr2fnRKaUnQrJZvYNDGMrfZHw6QCr6",
+        "ga4gh:VA.6Vh1yfYyljQHm6_qLTKqzi1URy8MfcGe",
+    ]
+    assert submitted == [["chr14-18223557-C-T"]]
+    # latency is reported for the expressions actually sent
+    assert sizer.record_success.call_args.args[0] == 1
+
+    # newly registered expressions are remembered for next time
+    submitted.clear()
+    sizer.reset_mock()
+    _register_batch(
+        stub_anyvar_client,
+        postgres_storage,
+        ["chr14-18223557-C-T"],
+        ReferenceAssembly.GRCH38,
+        sizer,
+    )
+    assert submitted == []
+    sizer.record_success.assert_not_called()
+
+
+def test_register_batch_split_on_failure(
+    stub_anyvar_client: BaseAnyVarClient,
+    postgres_storage: Storage,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Test that a failed registration request is split and retried, shrinking batches"""
+    put_allele_expressions = stub_anyvar_client.put_allele_expressions
+    submitted: list[list[str]] = []
+
+    def _fail_large_batches(
+        expressions: Iterable[str], assembly: ReferenceAssembly
+    ) -> Sequence[str | None]:
+        submitted.append(list(expressions))
+        if len(submitted[-1]) > 2:
+            raise AnyVarClientError
+        return put_allele_expressions(expressions, assembly)
+
+    monkeypatch.setattr(
+        stub_anyvar_client, "put_allele_expressions", _fail_large_batches
+    )
+    expressions = [
+        "chr14-18223529-C-A",
+        "chr14-18223557-C-T",
+        "chr14-18223583-C-G",
+        "chr14-18223586-T-C",
+    ]
+    sizer = AdaptiveBatchSizer(4, 1, 8, target_latency=10.0)
+    vrs_ids = _register_batch(
+        stub_anyvar_client,
+        postgres_storage,
+        expressions,
+        ReferenceAssembly.GRCH38,
+        sizer,
+    )
+    assert len(vrs_ids) == 4
+    assert None not in vrs_ids
+    assert submitted == [expressions, expressions[:2], expressions[2:]]
+
+    # can't split below the minimum batch size
+    postgres_storage.wipe_db()
+    sizer = AdaptiveBatchSizer(4, 3, 8, target_latency=10.0)
+    with pytest.raises(AnyVarClientError):
+        _register_batch(
+            stub_anyvar_client,
+            postgres_storage,
+            expressions,
+            ReferenceAssembly.GRCH38,
+            sizer,
+        )
+    assert sizer.batch_size == 3
+
+
 def test_ingest_vcf_notfound(
     stub_anyvar_client: BaseAnyVarClient, postgres_storage: Storage
 ):
@@ -0,0 +1,89 @@
+"""Test async PostgreSQL storage implementation."""
+
+import anyio
+import pytest
+from sqlalchemy.engine import make_url
+
+from anyvlm.main import create_anyvlm_storage
+from anyvlm.utils.types import AlleleCoordinates, AnyVlmCohortAlleleFrequencyResult
+
+pytest.importorskip("asyncpg")
+
+
+@pytest.fixture
+def async_postgres_storage(anyvlm_postgres_uri: str):
+    """Create async storage against the test database, resetting state around each test"""
+    uri = make_url(anyvlm_postgres_uri).set(drivername="postgresql+asyncpg")
+    storage = create_anyvlm_storage(uri.render_as_string(hide_password=False))
+    storage.wipe_db()
+    yield storage
+    storage.wipe_db()
+    anyio.run(storage.close_async)
+
+
+def test_get_cafs_by_vrs_allele_id_async(
+    async_postgres_storage, caf_iri: AnyVlmCohortAlleleFrequencyResult
+):
+    """Test that data written through the sync connection is read by the async engine"""
+    assert type(async_postgres_storage).__name__ == "AsyncPostgresObjectStore"
+    async_postgres_storage.add_allele_frequencies([caf_iri])
+    vrs_id = caf_iri.focusAllele.root  # type: ignore
+    cafs = anyio.run(async_postgres_storage.get_cafs_by_vrs_allele_id_async, vrs_id)
+    assert cafs == async_postgres_storage.get_cafs_by_vrs_allele_id(vrs_id)
+    assert len(cafs) == 1
+    assert (
+        anyio.run(
+            async_postgres_storage.get_cafs_by_vrs_allele_id_async, "ga4gh:VA.unknown"
+        )
+        == []
+    )
+
+
+def test_get_cafs_by_vrs_allele_ids_async(
+    async_postgres_storage, caf_iri: AnyVlmCohortAlleleFrequencyResult
+):
+    """Test that async multi-ID reads bind IDs as an array with asyncpg too"""
+    async_postgres_storage.add_allele_frequencies([caf_iri])
+    vrs_ids = [caf_iri.focusAllele.root, "ga4gh:VA.unknown"]  # type: ignore
+    cafs = anyio.run(async_postgres_storage.get_cafs_by_vrs_allele_ids_async, vrs_ids)
+    assert cafs == async_postgres_storage.get_cafs_by_vrs_allele_ids(vrs_ids)
+    assert [len(cafs[vrs_id]) for vrs_id in vrs_ids] == [1, 0]
+
+
+def test_get_cafs_by_many_coordinates_async(
+    async_postgres_storage, caf_iri: AnyVlmCohortAlleleFrequencyResult
+):
+    """Test that async coordinate lookups match sync lookups"""
+    vrs_id = caf_iri.focusAllele.root  # type: ignore
+    hit = AlleleCoordinates("14", 18223529, "C", "A")
+    miss = hit._replace(alt="G")
+    async_postgres_storage.add_allele_frequencies([caf_iri])
+    async_postgres_storage.add_allele_coordinates([vrs_id], [hit], "GRCh38")
+    async_postgres_storage.add_liftover_ids({vrs_id: None})
+    cafs = anyio.run(
+        async_postgres_storage.get_cafs_by_many_coordinates_async, [hit, miss], "GRCh38"
+    )
+    assert cafs == async_postgres_storage.get_cafs_by_many_coordinates(
+        [hit, miss], "GRCh38"
+    )
+    assert [len(cafs[hit]), len(cafs[miss])] == [1, 0]
+    assert (
+        anyio.run(async_postgres_storage.get_cafs_by_coordinates_async, hit, "GRCh38")
+        == cafs[hit]
+    )
+    links = [vrs_id, "ga4gh:VA.unlinked"]
+    assert anyio.run(
+        async_postgres_storage.get_liftover_ids_async, links
+    ) == async_postgres_storage.get_liftover_ids(links)
+
+
+def test_async_engine_per_loop(async_postgres_storage):
+    """Test that the engine for a previous event loop is disposed when it's replaced"""
+    anyio.run(async_postgres_storage.get_cafs_by_vrs_allele_id_async, "ga4gh:VA.a")
+    first_engine = async_postgres_storage.async_engine
+    first_pool = first_engine.pool
+    assert first_pool.checkedin() == 1
+    anyio.run(async_postgres_storage.get_cafs_by_vrs_allele_id_async, "ga4gh:VA.a")
+    assert async_postgres_storage.async_engine is not first_engine
+    assert first_engine.pool is not first_pool
+    assert first_engine.pool.checkedin() == 0
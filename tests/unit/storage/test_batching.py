@@ -0,0 +1,82 @@
+"""Test batching of concurrent storage reads"""
+
+import anyio
+
+from anyvlm.storage.batching import BatchedStorageReader
+from anyvlm.storage.postgres import PostgresObjectStore
+from anyvlm.utils.types import AlleleCoordinates, AnyVlmCohortAlleleFrequencyResult
+
+
+def test_batched_storage_reader(
+    monkeypatch,
+    postgres_storage: PostgresObjectStore,
+    caf_iri: AnyVlmCohortAlleleFrequencyResult,
+):
+    """Test that concurrent reads are answered by one query per kind of lookup"""
+    vrs_id = caf_iri.focusAllele.root  # type: ignore
+    coordinates = AlleleCoordinates("14", 18223529, "C", "A")
+    postgres_storage.add_allele_frequencies([caf_iri])
+    postgres_storage.add_allele_coordinates([vrs_id], [coordinates], "GRCh38")
+    postgres_storage.add_liftover_ids({vrs_id: None})
+
+    queries = []
+    for method in (
+        "get_cafs_by_vrs_allele_ids_async",
+        "get_cafs_by_many_coordinates_async",
+        "get_liftover_ids_async",
+    ):
+        original = getattr(postgres_storage, method)
+
+        async def _record(keys, *args, _original=original, _method=method):
+            queries.append((_method, list(keys)))
+            return await _original(keys, *args)
+
+        monkeypatch.setattr(postgres_storage, method, _record)
+
+    reader = BatchedStorageReader(postgres_storage, window=0.05)
+    missing = coordinates._replace(alt="G")
+    results = {}
+
+    async def _read(name, read, *args):
+        results[name] = await read(*args)
+
+    async def _main():
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(
+                _read, "ids", reader.get_cafs_by_vrs_allele_ids_async, [vrs_id]
+            )
+            tg.start_soon(
+                _read,
+                "more_ids",
+                reader.get_cafs_by_vrs_allele_ids_async,
+                [vrs_id, "ga4gh:VA.missing"],
+            )
+            for name, allele in (("hit", coordinates), ("miss", missing)):
+                tg.start_soon(
+                    _read,
+                    name,
+                    reader.get_cafs_by_coordinates_async,
+                    allele,
+                    "GRCh38",
+                )
+            for name, allele_ids in (
+                ("links", [vrs_id]),
+                ("more_links", ["ga4gh:VA.unlinked"]),
+            ):
+                tg.start_soon(_read, name, reader.get_liftover_ids_async, allele_ids)
+
+    anyio.run(_main)
+    expected = postgres_storage.get_cafs_by_vrs_allele_id(vrs_id)
+    assert results == {
+        "ids": {vrs_id: expected},
+        "more_ids": {vrs_id: expected, "ga4gh:VA.missing": []},
+        "hit": expected,
+        "miss": [],
+        "links": {vrs_id: None},
+        "more_links": {},
+    }
+    assert sorted(queries) == [
+        ("get_cafs_by_many_coordinates_async", [coordinates, missing]),
+        ("get_cafs_by_vrs_allele_ids_async", [vrs_id, "ga4gh:VA.missing"]),
+        ("get_liftover_ids_async", [vrs_id, "ga4gh:VA.unlinked"]),
+    ]
@@ -1,5 +1,6 @@
 """Tests postgres storage implementation methods directly."""
 
+import anyio
 import pytest
 from ga4gh.core.models import iriReference
 from ga4gh.va_spec.base import StudyGroup
@@ -7,7 +8,13 @@ from ga4gh.vrs.models import Allele, LiteralSequenceExpression, sequenceString
 from sqlalchemy.exc import IntegrityError
 
 from anyvlm.storage.postgres import PostgresObjectStore
-from anyvlm.utils.types import AnyVlmCohortAlleleFrequencyResult, QualityMeasures
+from anyvlm.utils.types import (
+    AfBatch,
+    AlleleCoordinates,
+    AncillaryResults,
+    AnyVlmCohortAlleleFrequencyResult,
+    QualityMeasures,
+)
 
 
 @pytest.fixture
@@ -85,3 +92,226 @@ def test_add_allele_frequencies_failures(
     """Test that add_allele_frequencies method fails correctly on bad input"""
     with pytest.raises(IntegrityError, match='null value in column "cohort"'):
         postgres_storage.add_allele_frequencies([caf_empty_cohort])
+
+
+def test_ingest_checkpoints(postgres_storage: PostgresObjectStore):
+    """Test that ingestion checkpoints can be saved, updated, and cleared"""
+    assert postgres_storage.get_ingest_checkpoint("abc", "GRCh38", "") == 0
+
+    postgres_storage.set_ingest_checkpoint("abc", "GRCh38", "", 1000)
+    postgres_storage.set_ingest_checkpoint("abc", "GRCh38", "chr1:0-", 10)
+    postgres_storage.set_ingest_checkpoint("abc", "GRCh38", "", 2000)
+    assert postgres_storage.get_ingest_checkpoint("abc", "GRCh38", "") == 2000
+    assert postgres_storage.get_ingest_checkpoint("abc", "GRCh38", "chr1:0-") == 10
+    assert postgres_storage.get_ingest_checkpoint("abc", "GRCh37", "") == 0
+
+    postgres_storage.delete_ingest_checkpoints("abc", "GRCh38")
+    assert postgres_storage.get_ingest_checkpoint("abc", "GRCh38", "") == 0
+    assert postgres_storage.get_ingest_checkpoint("abc", "GRCh38", "chr1:0-") == 0
+
+
+def test_expression_vrs_ids(postgres_storage: PostgresObjectStore):
+    """Test that expression to VRS ID mappings can be saved and looked up in bulk"""
+    assert postgres_storage.get_vrs_ids_by_expressions([], "GRCh38") == {}
+
+    postgres_storage.add_expression_vrs_ids(
+        {"chr1-1-A-T": "ga4gh:VA.1", "chr1-2-A-T": "ga4gh:VA.2"}, "GRCh38"
+    )
+    # conflicts are skipped rather than overwritten
+    postgres_storage.add_expression_vrs_ids({"chr1-1-A-T": "ga4gh:VA.3"}, "GRCh38")
+    assert postgres_storage.get_vrs_ids_by_expressions(
+        ["chr1-1-A-T", "chr1-2-A-T", "chr1-3-A-T"], "GRCh38"
+    ) == {"chr1-1-A-T": "ga4gh:VA.1", "chr1-2-A-T": "ga4gh:VA.2"}
+    assert postgres_storage.get_vrs_ids_by_expressions(["chr1-1-A-T"], "GRCh37") == {}
+
+
+def test_add_allele_frequencies_copy(
+    monkeypatch,
+    postgres_storage: PostgresObjectStore,
+    caf_iri: AnyVlmCohortAlleleFrequencyResult,
+    caf_empty_cohort: AnyVlmCohortAlleleFrequencyResult,
+):
+    """Test that bulk loading with COPY round-trips values and skips conflicts"""
+    monkeypatch.setattr(postgres_storage, "COPY_MIN_ROWS", 1)
+    caf_iri.qualityMeasures = QualityMeasures(qcFilters=['Low,"Qual"', "a\\b", "{}"])
+    duplicate = caf_iri.model_copy(deep=True)
+    duplicate.locusAlleleCount = caf_iri.locusAlleleCount + 1
+    postgres_storage.add_allele_frequencies([caf_iri, duplicate])
+    postgres_storage.add_allele_frequencies([duplicate])
+
+    stored = postgres_storage.get_cafs_by_vrs_allele_id(caf_iri.focusAllele.root)  # type: ignore
+    assert len(stored) == 1
+    assert stored[0].locusAlleleCount == caf_iri.locusAlleleCount
+    assert stored[0].qualityMeasures.qcFilters == ['Low,"Qual"', "a\\b", "{}"]  # type: ignore
+
+    with pytest.raises(IntegrityError, match='null value in column "cohort"'):
+        postgres_storage.add_allele_frequencies([caf_empty_cohort])
+
+
+@pytest.mark.parametrize("copy_min_rows", [1, 100])
+def test_add_allele_frequency_rows(
+    monkeypatch, postgres_storage: PostgresObjectStore, copy_min_rows: int
+):
+    """Test that raw allele frequency rows are stored the same as equivalent CAFs"""
+    monkeypatch.setattr(postgres_storage, "COPY_MIN_ROWS", copy_min_rows)
+    vrs_id = "ga4gh:VA.J3Hi64dkKFKdnKIwB2419Qz3STDB2sJq"
+    postgres_storage.add_allele_frequency_rows(
+        [vrs_id],
+        AfBatch(
+            expressions=["chr14-18223529-C-A"],
+            ac=[3],
+            an=[6164],
+            ac_het=[1],
+            ac_hom=[1],
+            ac_hemi=[0],
+            filters=[["LowQual"]],
+        ),
+        "rare disease",
+    )
+
+    stored = postgres_storage.get_cafs_by_vrs_allele_id(vrs_id)
+    assert len(stored) == 1
+    assert stored[0].locusAlleleCount == 6164
+    assert stored[0].ancillaryResults == AncillaryResults(
+        heterozygotes=1, homozygotes=1, hemizygotes=0
+    )
+    assert stored[0].qualityMeasures == QualityMeasures(qcFilters=["LowQual"])
+    assert stored[0].cohort.name == "rare disease"  # type: ignore
+
+
+@pytest.mark.parametrize(
+    ("vrs_ids", "an", "cohort", "match"),
+    [
+        (["ga4gh:VA.1", "ga4gh:VA.2"], 2, "c", "Got 2"),
+        (["ga4gh:VA.1"], 2, "", "Cohort name"),
+        ([""], 2, "c", "requires a VRS ID"),
+        (["ga4gh:VA.1"], 0, "c", "AN must be positive"),
+    ],
+)
+def test_add_allele_frequency_rows_invalid(
+    postgres_storage: PostgresObjectStore,
+    vrs_ids: list[str],
+    an: int,
+    cohort: str,
+    match: str,
+):
+    """Test that invalid batches of raw rows are rejected before anything is written"""
+    afs = AfBatch(["chr1-1-A-T"], [0], [an], [0], [0], [0], [[]])
+    with pytest.raises(ValueError, match=match):
+        postgres_storage.add_allele_frequency_rows(vrs_ids, afs, cohort)
+
+
+def test_get_cafs_by_vrs_allele_id_async(
+    postgres_storage: PostgresObjectStore, caf_iri: AnyVlmCohortAlleleFrequencyResult
+):
+    """Test that async reads match sync reads"""
+    postgres_storage.add_allele_frequencies([caf_iri])
+    vrs_id = caf_iri.focusAllele.root  # type: ignore
+    cafs = anyio.run(postgres_storage.get_cafs_by_vrs_allele_id_async, vrs_id)
+    assert cafs == postgres_storage.get_cafs_by_vrs_allele_id(vrs_id)
+    assert len(cafs) == 1
+
+
+def test_get_cafs_by_coordinates(
+    postgres_storage: PostgresObjectStore, caf_iri: AnyVlmCohortAlleleFrequencyResult
+):
+    """Test that CAFs can be looked up by the coordinates of their allele"""
+    postgres_storage.add_allele_frequencies([caf_iri])
+    vrs_id = caf_iri.focusAllele.root  # type: ignore
+    coordinates = AlleleCoordinates.from_expression("chr14-18223529-C-A")
+    assert coordinates == AlleleCoordinates("14", 18223529, "C", "A")
+    postgres_storage.add_allele_coordinates([vrs_id], [coordinates], "GRCh38")
+    # conflicts are skipped rather than overwritten
+    postgres_storage.add_allele_coordinates(["ga4gh:VA.1"], [coordinates], "GRCh38")
+
+    cafs = postgres_storage.get_cafs_by_coordinates(coordinates, "GRCh38")
+    assert cafs == postgres_storage.get_cafs_by_vrs_allele_id(vrs_id)
+    assert len(cafs) == 1
+    assert (
+        anyio.run(postgres_storage.get_cafs_by_coordinates_async, coordinates, "GRCh38")
+        == cafs
+    )
+    assert postgres_storage.get_cafs_by_coordinates(coordinates, "GRCh37") == []
+    assert (
+        postgres_storage.get_cafs_by_coordinates(
+            coordinates._replace(alt="G"), "GRCh38"
+        )
+        == []
+    )
+
+    with pytest.raises(ValueError, match="Got 1"):
+        postgres_storage.add_allele_coordinates([vrs_id], [], "GRCh38")
+
+
+def test_liftover_ids(
+    postgres_storage: PostgresObjectStore, caf_iri: AnyVlmCohortAlleleFrequencyResult
+):
+    """Test that linked liftover equivalents are returned with coordinate lookups"""
+    assert postgres_storage.get_liftover_ids([]) == {}
+    vrs_id = caf_iri.focusAllele.root  # type: ignore
+    liftover_caf = caf_iri.model_copy(deep=True)
+    liftover_caf.focusAllele = iriReference("ga4gh:VA.lifted")
+    postgres_storage.add_allele_frequencies([liftover_caf, caf_iri])
+    coordinates = AlleleCoordinates("14", 18223529, "C", "A")
+    postgres_storage.add_allele_coordinates([vrs_id], [coordinates], "GRCh38")
+
+    postgres_storage.add_liftover_ids({vrs_id: "ga4gh:VA.lifted", "ga4gh:VA.1": None})
+    # conflicts are skipped rather than overwritten
+    postgres_storage.add_liftover_ids({vrs_id: None})
+    assert postgres_storage.get_liftover_ids([vrs_id, "ga4gh:VA.1", "ga4gh:VA.2"]) == {
+        vrs_id: "ga4gh:VA.lifted",
+        "ga4gh:VA.1": None,
+    }
+
+    cafs = postgres_storage.get_cafs_by_coordinates(coordinates, "GRCh38")
+    # the queried allele's CAFs come first
+    assert [caf.focusAllele for caf in cafs] == [
+        iriReference(vrs_id),
+        iriReference("ga4gh:VA.lifted"),
+    ]
+
+
+def test_get_cafs_by_vrs_allele_ids(
+    postgres_storage: PostgresObjectStore, caf_iri: AnyVlmCohortAlleleFrequencyResult
+):
+    """Test that CAFs for many alleles are looked up at once, grouped by allele"""
+    assert postgres_storage.get_cafs_by_vrs_allele_ids([]) == {}
+    vrs_id = caf_iri.focusAllele.root  # type: ignore
+    other_caf = caf_iri.model_copy(deep=True)
+    other_caf.focusAllele = iriReference("ga4gh:VA.other")
+    postgres_storage.add_allele_frequencies([caf_iri, other_caf])
+
+    vrs_ids = [vrs_id, "ga4gh:VA.other", "ga4gh:VA.missing", vrs_id]
+    cafs = postgres_storage.get_cafs_by_vrs_allele_ids(vrs_ids)
+    assert cafs == {
+        vrs_id: postgres_storage.get_cafs_by_vrs_allele_id(vrs_id),
+        "ga4gh:VA.other": postgres_storage.get_cafs_by_vrs_allele_id("ga4gh:VA.other"),
+        "ga4gh:VA.missing": [],
+    }
+    assert len(cafs[vrs_id]) == 1
+    assert anyio.run(postgres_storage.get_cafs_by_vrs_allele_ids_async, vrs_ids) == cafs
+
+
+@pytest.mark.parametrize("copy_min_rows", [1, 100])
+def test_generation(
+    monkeypatch,
+    postgres_storage: PostgresObjectStore,
+    caf_iri: AnyVlmCohortAlleleFrequencyResult,
+    copy_min_rows: int,
+):
+    """Test that only writes that store new allele frequency data bump the generation"""
+    monkeypatch.setattr(postgres_storage, "COPY_MIN_ROWS", copy_min_rows)
+    vrs_id = caf_iri.focusAllele.root  # type: ignore
+    generation = postgres_storage.get_generation()
+
+    postgres_storage.add_allele_frequencies([caf_iri])
+    assert postgres_storage.get_generation() == generation + 1
+    # nothing new was stored
+    postgres_storage.add_allele_frequencies([caf_iri])
+    postgres_storage.add_allele_coordinates(
+        [vrs_id], [AlleleCoordinates("14", 18223529, "C", "A")], "GRCh38"
+    )
+    postgres_storage.add_liftover_ids({vrs_id: None})
+    assert postgres_storage.get_generation() == generation + 1
+    postgres_storage.wipe_db()
+    assert anyio.run(postgres_storage.get_generation_async) == generation + 2
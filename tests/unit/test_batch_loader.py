@@ -0,0 +1,76 @@
+"""Test coalescing of concurrent lookups"""
+
+import asyncio
+
+import anyio
+import pytest
+
+from anyvlm.utils.batch_loader import BatchLoader
+
+
+class _RecordingLoader:
+    """Look up keys by doubling them, recording each batch"""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.batches: list[list[int]] = []
+        self.fail = fail
+
+    async def __call__(self, keys: list[int]) -> dict[int, int]:
+        self.batches.append(keys)
+        if self.fail:
+            msg = "storage unavailable"
+            raise RuntimeError(msg)
+        return {key: key * 2 for key in keys if key >= 0}
+
+
+def test_batch_loader_coalesces_within_window():
+    """Test that concurrent loads are answered by one batch, with duplicate keys shared"""
+    load_batch = _RecordingLoader()
+    results = {}
+
+    async def _main():
+        loader = BatchLoader(load_batch, window=0.05)
+
+        async def _load(task_id: int, key: int):
+            results[task_id] = await loader.load(key)
+
+        async with anyio.create_task_group() as tg:
+            for task_id, key in enumerate([1, 2, 1, 3]):
+                tg.start_soon(_load, task_id, key)
+        # a later load starts a new batch
+        results[4] = await loader.load(4)
+
+    anyio.run(_main)
+    assert results == {0: 2, 1: 4, 2: 2, 3: 6, 4: 8}
+    assert load_batch.batches == [[1, 2, 3], [4]]
+
+
+def test_batch_loader_max_batch_size():
+    """Test that a full batch is dispatched without waiting for the window"""
+    load_batch = _RecordingLoader()
+
+    async def _main():
+        loader = BatchLoader(load_batch, window=60, max_batch_size=2)
+        with anyio.fail_after(5):
+            return await asyncio.gather(loader.load(1), loader.load(2))
+
+    assert anyio.run(_main) == [2, 4]
+    assert load_batch.batches == [[1, 2]]
+
+
+def test_batch_loader_errors():
+    """Test that failures reach every waiting caller, and missing keys raise KeyError"""
+
+    async def _main(load_batch, key):
+        loader = BatchLoader(load_batch, window=0)
+        return await asyncio.gather(loader.load(key), loader.load(5))
+
+    with pytest.raises(RuntimeError, match="storage unavailable"):
+        anyio.run(_main, _RecordingLoader(fail=True), 1)
+    with pytest.raises(KeyError):
+        anyio.run(_main, _RecordingLoader(), -1)
+
+    with pytest.raises(ValueError, match="must not be negative"):
+        BatchLoader(_RecordingLoader(), window=-1)
+    with pytest.raises(ValueError, match="at least 1"):
+        BatchLoader(_RecordingLoader(), window=0, max_batch_size=0)
@@ -0,0 +1,270 @@
+"""Test caching of variant counts responses, in AnyVLM and by HTTP clients"""
+
+from http import HTTPStatus
+
+import anyio
+import pytest
+from anyvar.mapping.liftover import ReferenceAssembly
+from fastapi.testclient import TestClient
+from ga4gh.core.models import iriReference
+
+from anyvlm.anyvar.base_client import AnyVarClientError
+from anyvlm.cache import generation as generation_module
+from anyvlm.cache.base_cache import variant_counts_cache_key
+from anyvlm.cache.generation import GenerationReader
+from anyvlm.cache.memory_cache import LruResponseCache
+from anyvlm.config import get_config
+from anyvlm.main import app as vlm_restapi
+from anyvlm.main import create_response_cache
+from anyvlm.restapi.vlm import _etag_matches
+from anyvlm.storage.postgres import PostgresObjectStore
+from anyvlm.utils.types import AlleleCoordinates, AnyVlmCohortAlleleFrequencyResult
+
+ENDPOINT = "/anyvlm/variant_counts"
+COORDINATES = AlleleCoordinates("14", 18223529, "C", "A")
+QUERY = {
+    "assemblyId": "GRCh38",
+    "referenceName": COORDINATES.chromosome,
+    "start": COORDINATES.position,
+    "referenceBases": COORDINATES.ref,
+    "alternateBases": COORDINATES.alt,
+}
+
+
+class _UnreachableAnyVarClient:
+    """Fail if the endpoint tries to reach AnyVar"""
+
+    def __getattr__(self, name: str):
+        msg = f"AnyVar should not be called, but {name} was accessed"
+        raise AssertionError(msg)
+
+
+class _FailingAnyVarClient:
+    """Fail every lookup with an AnyVar server error"""
+
+    async def retrieve_allele_by_expression_async(self, expression, assembly):
+        msg = f"Lookup failed for variant expression '{expression}' on {assembly}"
+        raise AnyVarClientError(msg)
+
+
+def test_variant_counts_cache_key():
+    """Test that equivalent queries share a key, and generations don't"""
+    key = variant_counts_cache_key(
+        3,
+        ReferenceAssembly.GRCH38,
+        AlleleCoordinates.from_expression("chr14-18223529-C-A"),
+    )
+    assert key == "variant_counts:3:GRCh38:14:18223529:C:A"
+    assert key == variant_counts_cache_key(3, ReferenceAssembly.GRCH38, COORDINATES)
+    assert key != variant_counts_cache_key(4, ReferenceAssembly.GRCH38, COORDINATES)
+
+
+def test_lru_response_cache():
+    """Test that the least recently used entry is evicted when full"""
+    cache = LruResponseCache(max_entries=2)
+
+    async def _main():
+        await cache.set("a", b"1")
+        await cache.set("b", b"2")
+        assert await cache.get("a") == b"1"
+        await cache.set("c", b"3")
+        return [await cache.get(key) for key in ("a", "b", "c")]
+
+    assert anyio.run(_main) == [b"1", None, b"3"]
+
+    with pytest.raises(ValueError, match="at least 1"):
+        LruResponseCache(max_entries=0)
+
+
+def test_create_response_cache(monkeypatch):
+    """Test response cache factory"""
+    monkeypatch.delenv("ANYVLM_RESPONSE_CACHE_URI", raising=False)
+    assert create_response_cache() is None
+    assert isinstance(create_response_cache("memory://"), LruResponseCache)
+    with pytest.raises(ValueError, match="not implemented"):
+        create_response_cache("memcached://localhost:11211")
+
+
+@pytest.fixture
+def client_with_response_cache(postgres_storage: PostgresObjectStore):
+    """Create test fixture for client with a response cache, that must not use AnyVar"""
+    vlm_restapi.state.anyvar_client = _UnreachableAnyVarClient()
+    vlm_restapi.state.anyvlm_storage = postgres_storage
+    vlm_restapi.state.response_cache = LruResponseCache()
+
+    yield TestClient(vlm_restapi)
+
+    del vlm_restapi.state.anyvar_client
+    del vlm_restapi.state.anyvlm_storage
+    del vlm_restapi.state.response_cache
+
+
+def test_variant_counts_response_cache(
+    monkeypatch,
+    client_with_response_cache: TestClient,
+    postgres_storage: PostgresObjectStore,
+    caf_iri: AnyVlmCohortAlleleFrequencyResult,
+):
+    """Test that repeated queries are served from cache until the data changes"""
+    vrs_id = caf_iri.focusAllele.root  # type: ignore
+    postgres_storage.add_allele_frequencies([caf_iri])
+    postgres_storage.add_allele_coordinates([vrs_id], [COORDINATES], "GRCh38")
+    postgres_storage.add_liftover_ids({vrs_id: None})
+
+    lookups = []
+    original = postgres_storage.get_cafs_by_coordinates_async
+
+    async def _record(*args):
+        lookups.append(args)
+        return await original(*args)
+
+    monkeypatch.setattr(postgres_storage, "get_cafs_by_coordinates_async", _record)
+
+    def _query(assembly_id: str, reference_name: str) -> dict:
+        response = client_with_response_cache.get(
+            ENDPOINT,
+            params={
+                "assemblyId": assembly_id,
+                "referenceName": reference_name,
+                "start": COORDINATES.position,
+                "referenceBases": COORDINATES.ref,
+                "alternateBases": COORDINATES.alt,
+            },
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    first = _query("GRCh38", "14")
+    assert first["responseSummary"]["numTotalResults"] == 1
+    # equivalent query is answered from cache
+    assert _query("hg38", "chr14") == first
+    assert len(lookups) == 1
+
+    # storing new allele frequency data invalidates cached responses
+    other_caf = caf_iri.model_copy(deep=True)
+    other_caf.focusAllele = iriReference("ga4gh:VA.other")
+    postgres_storage.add_allele_frequencies([other_caf])
+    assert _query("GRCh38", "14") == first
+    assert len(lookups) == 2
+
+
+def test_etag_matches():
+    """Test If-None-Match comparison"""
+    etag = '"abc"'
+    assert _etag_matches('"abc"', etag)
+    assert _etag_matches('"xyz", W/"abc"', etag)
+    assert _etag_matches("*", etag)
+    assert not _etag_matches('"xyz"', etag)
+    assert not _etag_matches(None, etag)
+
+
+def test_variant_counts_conditional_get(
+    monkeypatch,
+    client_with_response_cache: TestClient,
+    postgres_storage: PostgresObjectStore,
+    caf_iri: AnyVlmCohortAlleleFrequencyResult,
+):
+    """Test that matching If-None-Match requests get a 304 without reading CAFs"""
+    vrs_id = caf_iri.focusAllele.root  # type: ignore
+    postgres_storage.add_allele_frequencies([caf_iri])
+    postgres_storage.add_allele_coordinates([vrs_id], [COORDINATES], "GRCh38")
+    postgres_storage.add_liftover_ids({vrs_id: None})
+    monkeypatch.setattr(
+        get_config(), "variant_counts_cache_control", "public, max-age=300"
+    )
+
+    response = client_with_response_cache.get(ENDPOINT, params=QUERY)
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["cache-control"] == "public, max-age=300"
+    etag = response.headers["etag"]
+    # served from the response cache, with the same headers
+    response = client_with_response_cache.get(ENDPOINT, params=QUERY)
+    assert response.headers["etag"] == etag
+
+    async def _unreachable(*args):
+        msg = "CAFs should not be read"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(postgres_storage, "get_cafs_by_coordinates_async", _unreachable)
+    response = client_with_response_cache.get(
+        ENDPOINT,
+        params={**QUERY, "assemblyId": "hg38"},
+        headers={"If-None-Match": etag},
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert response.headers["cache-control"] == "public, max-age=300"
+
+    # the ETag changes with the data
+    monkeypatch.undo()
+    other_caf = caf_iri.model_copy(deep=True)
+    other_caf.focusAllele = iriReference("ga4gh:VA.other")
+    postgres_storage.add_allele_frequencies([other_caf])
+    response = client_with_response_cache.get(
+        ENDPOINT, params=QUERY, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.headers["etag"] != etag
+    assert "cache-control" not in response.headers
+
+
+def test_variant_counts_failed_lookup_not_cached(
+    client_with_response_cache: TestClient, postgres_storage: PostgresObjectStore
+):
+    """Test that a failed AnyVar lookup is an error, which isn't cached or tagged"""
+    client_with_response_cache.app.state.anyvar_client = _FailingAnyVarClient()  # type: ignore
+
+    for _ in range(2):
+        response = client_with_response_cache.get(ENDPOINT, params=QUERY)
+        assert response.status_code == HTTPStatus.BAD_GATEWAY
+        assert response.json() == {"detail": "Variant lookup in AnyVar failed"}
+        assert "etag" not in response.headers
+    cache_key = variant_counts_cache_key(
+        postgres_storage.get_generation(), ReferenceAssembly.GRCH38, COORDINATES
+    )
+    response_cache = client_with_response_cache.app.state.response_cache  # type: ignore
+    assert anyio.run(response_cache.get, cache_key) is None
+
+
+class _CountingStorage:
+    """Report a generation that increases with every read"""
+
+    def __init__(self) -> None:
+        self.reads = 0
+
+    async def get_generation_async(self) -> int:
+        self.reads += 1
+        await anyio.sleep(0.01)
+        return self.reads
+
+
+def test_generation_reader(monkeypatch):
+    """Test that the generation is read at most once per refresh interval"""
+    now = 100.0
+    monkeypatch.setattr(generation_module, "monotonic", lambda: now)
+    storage = _CountingStorage()
+    reader = GenerationReader(storage, refresh_interval=1.0)  # type: ignore
+
+    async def _main():
+        nonlocal now
+        # concurrent reads share one storage query
+        results = []
+
+        async def _read():
+            results.append(await reader.get_generation_async())
+
+        async with anyio.create_task_group() as tg:
+            for _ in range(3):
+                tg.start_soon(_read)
+        now += 0.5
+        results.append(await reader.get_generation_async())
+        now += 0.6
+        results.append(await reader.get_generation_async())
+        return results
+
+    assert anyio.run(_main) == [1, 1, 1, 1, 2]
+    assert storage.reads == 2
+
+    with pytest.raises(ValueError, match="must not be negative"):
+        GenerationReader(storage, refresh_interval=-1)  # type: ignore
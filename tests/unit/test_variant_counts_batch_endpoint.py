@@ -0,0 +1,165 @@
+"""Test batch variant counts endpoint functionality."""
+
+from http import HTTPStatus
+
+import pytest
+from fastapi.testclient import TestClient
+
+from anyvlm.anyvar.base_client import AnyVarClientConnectionError, AnyVarClientError
+from anyvlm.config import get_config
+from anyvlm.main import app as vlm_restapi
+from anyvlm.restapi.vlm import _batch_result
+from anyvlm.storage.postgres import PostgresObjectStore
+from anyvlm.utils.exceptions import LiftoverError
+from anyvlm.utils.types import AlleleCoordinates, AnyVlmCohortAlleleFrequencyResult
+
+ENDPOINT = "/anyvlm/variant_counts/batch"
+COORDINATES = AlleleCoordinates("14", 18223529, "C", "A")
+
+
+class _UnregisteredAnyVarClient:
+    """Report every variant as unregistered, with GRCh37 lookups unable to connect"""
+
+    def __init__(self) -> None:
+        self.lookups = []
+
+    async def retrieve_alleles_by_expression_async(self, expressions, assembly):
+        self.lookups.append(list(expressions))
+        if assembly.value == "GRCh37":
+            raise AnyVarClientConnectionError
+        return [None for _ in expressions]
+
+
+@pytest.fixture
+def anyvar_client():
+    """Create test fixture for AnyVar client with nothing registered"""
+    return _UnregisteredAnyVarClient()
+
+
+@pytest.fixture
+def client_with_indexed_variant(
+    anyvar_client: _UnregisteredAnyVarClient,
+    postgres_storage: PostgresObjectStore,
+    caf_iri: AnyVlmCohortAlleleFrequencyResult,
+):
+    """Create test fixture for client where one variant is ingested and indexed"""
+    vrs_id = caf_iri.focusAllele.root  # type: ignore
+    postgres_storage.add_allele_frequencies([caf_iri])
+    postgres_storage.add_allele_coordinates([vrs_id], [COORDINATES], "GRCh38")
+    postgres_storage.add_liftover_ids({vrs_id: None})
+    vlm_restapi.state.anyvar_client = anyvar_client
+    vlm_restapi.state.anyvlm_storage = postgres_storage
+
+    yield TestClient(vlm_restapi)
+
+    del vlm_restapi.state.anyvar_client
+    del vlm_restapi.state.anyvlm_storage
+
+
+def _query(assembly_id: str, reference_name: str, start: int = 18223529) -> dict:
+    return {
+        "assemblyId": assembly_id,
+        "referenceName": reference_name,
+        "start": start,
+        "referenceBases": "C",
+        "alternateBases": "A",
+    }
+
+
+def test_variant_counts_batch_endpoint(
+    client_with_indexed_variant: TestClient, anyvar_client: _UnregisteredAnyVarClient
+):
+    """Test that each query gets its own response or error, in order"""
+    response = client_with_indexed_variant.post(
+        ENDPOINT,
+        json={
+            "queries": [
+                _query("GRCh38", "14"),
+                _query("GRCh38", "14", start=100),
+                _query("GRCh37", "chr14"),
+                _query("hg38", "chr14"),
+            ]
+        },
+    )
+    assert response.status_code == HTTPStatus.OK
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [
+        HTTPStatus.OK,
+        HTTPStatus.OK,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.OK,
+    ]
+    assert results[0]["response"]["responseSummary"] == {
+        "exists": True,
+        "numTotalResults": 1,
+    }
+    assert results[0]["response"]["meta"]["returnedSchemas"][0]["schema"]
+    assert results[1]["response"]["responseSummary"] == {
+        "exists": False,
+        "numTotalResults": 0,
+    }
+    assert results[2]["response"] is None
+    assert results[2]["detail"] == "Unable to establish AnyVar connection"
+    assert results[3] == results[0]
+    # the indexed variant needs no AnyVar lookup
+    assert sorted(anyvar_client.lookups) == [
+        ["14-100-C-A"],
+        ["14-18223529-C-A"],
+    ]
+
+
+def test_variant_counts_batch_endpoint_invalid(
+    monkeypatch, client_with_indexed_variant: TestClient
+):
+    """Test that invalid and oversized batches are rejected"""
+    response = client_with_indexed_variant.post(ENDPOINT, json={"queries": []})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    monkeypatch.setattr(get_config(), "variant_counts_max_batch_size", 1)
+    response = client_with_indexed_variant.post(
+        ENDPOINT, json={"queries": [_query("GRCh38", "14")] * 2}
+    )
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert response.json() == {"detail": "Batch of 2 queries exceeds the maximum of 1"}
+
+
+def test_variant_counts_batch_endpoint_invalid_query(
+    client_with_indexed_variant: TestClient,
+):
+    """Test that an invalid query fails alone, without failing the batch"""
+    response = client_with_indexed_variant.post(
+        ENDPOINT,
+        json={
+            "queries": [
+                _query("GRCh38", "chr99"),
+                _query("GRCh38", "14"),
+                {"assemblyId": "GRCh38"},
+            ]
+        },
+    )
+    assert response.status_code == HTTPStatus.OK
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == [
+        HTTPStatus.BAD_REQUEST,
+        HTTPStatus.OK,
+        HTTPStatus.BAD_REQUEST,
+    ]
+    assert results[0]["detail"].startswith("Invalid query: referenceName: ")
+    assert results[0]["response"] is None
+    assert results[1]["response"]["responseSummary"]["exists"]
+    assert "start: Field required" in results[2]["detail"]
+
+
+@pytest.mark.parametrize(
+    ("error", "status"),
+    [
+        (AnyVarClientConnectionError(), HTTPStatus.SERVICE_UNAVAILABLE),
+        (AnyVarClientError(), HTTPStatus.BAD_GATEWAY),
+        (LiftoverError(), HTTPStatus.INTERNAL_SERVER_ERROR),
+    ],
+)
+def test_batch_result_error_status(error: Exception, status: HTTPStatus):
+    """Test that failed queries get the status they would have received on their own"""
+    result = _batch_result(error)
+    assert result.status == status
+    assert result.response is None
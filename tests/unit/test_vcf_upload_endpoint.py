@@ -8,6 +8,7 @@ import pytest
 from anyvar.mapping.liftover import ReferenceAssembly
 from fastapi.testclient import TestClient
 
+from anyvlm.functions.ingest_jobs import IngestJobManager
 from anyvlm.functions.ingest_vcf import VcfAfColumnsError
 from anyvlm.main import app
 
@@ -15,6 +16,7 @@ from anyvlm.main import app
 MAX_FILE_SIZE = 5 * 1024 * 1024 * 1024  # 5GB
 UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
 ENDPOINT = "/anyvlm/ingest_vcf"
+JOBS_ENDPOINT = "/anyvlm/ingest_jobs"
 
 
 @pytest.fixture(scope="module")
@@ -25,7 +27,16 @@ def client():
     mock_anyvlm_storage = MagicMock()
     app.state.anyvar_client = mock_anyvar_client
     app.state.anyvlm_storage = mock_anyvlm_storage
-    return TestClient(app=app)
+    app.state.ingest_jobs = IngestJobManager()
+    yield TestClient(app=app)
+    app.state.ingest_jobs.shutdown()
+
+
+def wait_for_job(response) -> dict:
+    """Wait for the ingestion job accepted in ``response`` and return its final status"""
+    job_id = response.json()["job_id"]
+    app.state.ingest_jobs.wait(job_id, timeout=30)
+    return app.state.ingest_jobs.get(job_id)
 
 
 @pytest.fixture(scope="module")
@@ -281,10 +292,12 @@ class TestIngestVcfEndpoint:
                 files=files,
             )
 
-        assert response.status_code == 200
+        assert response.status_code == 202
         json_response = response.json()
-        assert json_response["status"] == "success"
+        assert json_response["status"] == "accepted"
         assert "message" in json_response
+        assert json_response["job_id"]
+        assert wait_for_job(response).status == "succeeded"
 
         # Verify ingest_vcf was called
         assert mock_ingest.called
@@ -318,10 +331,14 @@ class TestIngestVcfEndpoint:
                 files=files,
             )
 
-        assert response.status_code == 422
-        json_response = response.json()
-        assert "detail" in json_response
-        assert "AC_Het" in json_response["detail"]
+        assert response.status_code == 202
+        wait_for_job(response)
+
+        job_response = client.get(f"{JOBS_ENDPOINT}/{response.json()['job_id']}")
+        assert job_response.status_code == 200
+        job = job_response.json()
+        assert job["status"] == "failed"
+        assert "AC_Het" in job["error"]
 
     def test_temp_file_cleanup_on_success(self, client: TestClient, valid_vcf_gz: Path):
         """Test that temporary files are cleaned up after successful ingestion."""
@@ -336,7 +353,8 @@ class TestIngestVcfEndpoint:
                     files=files,
                 )
 
-            assert response.status_code == 200
+            assert response.status_code == 202
+            wait_for_job(response)
 
             # Verify the temp file path that was passed to ingest_vcf no longer exists
             if mock_ingest.called:
@@ -356,7 +374,8 @@ class TestIngestVcfEndpoint:
                     files=files,
                 )
 
-            assert response.status_code == 500
+            assert response.status_code == 202
+            assert wait_for_job(response).status == "failed"
 
             # Verify cleanup happened
             if mock_ingest.called:
@@ -378,13 +397,72 @@ class TestIngestVcfEndpoint:
                     files=files,
                 )
 
-            assert response.status_code == 200
+            assert response.status_code == 202
+            wait_for_job(response)
 
             # Verify GRCh37 was passed (4th positional argument)
             call_args = mock_ingest.call_args
             assert call_args[0][3] == ReferenceAssembly.GRCH37
 
 
+# ====================
+# Ingestion Job Tests
+# ====================
+
+
+class TestIngestJobsEndpoint:
+    """Test the /ingest_jobs HTTP endpoint."""
+
+    def test_unknown_job(self, client: TestClient):
+        """Test that unknown job IDs return 404."""
+        response = client.get(f"{JOBS_ENDPOINT}/not-a-job")
+        assert response.status_code == 404
+
+    def test_job_progress_reported(self, client: TestClient, valid_vcf_gz: Path):
+        """Test that a finished job reports records processed and throughput."""
+
+        def fake_ingest(*args, stats, **kwargs):
+            stats.records_processed = 42
+            return stats
+
+        with patch("anyvlm.restapi.vlm.ingest_vcf_function", side_effect=fake_ingest):
+            with valid_vcf_gz.open("rb") as f:
+                files = {"file": ("test.vcf.gz", f, "application/gzip")}
+                response = client.post(
+                    ENDPOINT,
+                    params={"assembly": "GRCh38"},
+                    files=files,
+                )
+            assert response.status_code == 202
+            wait_for_job(response)
+
+        job_response = client.get(f"{JOBS_ENDPOINT}/{response.json()['job_id']}")
+        assert job_response.status_code == 200
+        job = job_response.json()
+        assert job["status"] == "succeeded"
+        assert job["filename"] == "test.vcf.gz"
+        assert job["records_processed"] == 42
+        assert "records_per_second" in job
+        assert job["finished_at"] is not None
+
+    def test_finished_jobs_pruned(self):
+        """Test that finished jobs are forgotten after the retention period."""
+        cleanup = MagicMock()
+        retained = IngestJobManager(retention=3600)
+        expired = IngestJobManager(retention=0)
+        try:
+            retained_job = retained.submit(lambda stats: stats, "a.vcf.gz", cleanup)
+            expired_job = expired.submit(lambda stats: stats, "b.vcf.gz", cleanup)
+            retained.wait(retained_job.job_id, timeout=30)
+            expired.wait(expired_job.job_id, timeout=30)
+            assert retained.get(retained_job.job_id) is retained_job
+            assert expired.get(expired_job.job_id) is None
+            assert cleanup.call_count == 2
+        finally:
+            retained.shutdown()
+            expired.shutdown()
+
+
 # ====================
 # File Size Limit Tests
 # ====================